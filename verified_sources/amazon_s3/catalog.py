@@ -35,5 +35,66 @@ class TxtDatStream(DatDocumentStream):
     )
     dir_prefix: List[str]
 
+
+class ParquetDatStream(DatDocumentStream):
+    name: Optional[str] = Field(
+        'parquet',
+        description='The name of the document stream.',
+        json_schema_extra={
+            'ui-opts': {
+                'hidden': True,
+            }
+        }
+    )
+    dir_prefix: List[str]
+
+class JsonLinesDatStream(DatDocumentStream):
+    name: Optional[str] = Field(
+        'jsonl',
+        description='The name of the document stream.',
+        json_schema_extra={
+            'ui-opts': {
+                'hidden': True,
+            }
+        }
+    )
+    dir_prefix: List[str]
+    content_fields: Optional[List[str]] = Field(
+        None,
+        description='Fields, as dotted paths such as user.name, rendered into the text of each record. Defaults to all top level fields',
+        title='Content fields',
+    )
+    metadata_fields: Optional[List[str]] = Field(
+        None,
+        description='Fields, as dotted paths such as user.id, emitted in the metadata of the records of each line',
+        title='Metadata fields',
+    )
+
+class ArchiveDatStream(DatDocumentStream):
+    name: Optional[str] = Field(
+        'archive',
+        description='The name of the document stream.',
+        json_schema_extra={
+            'ui-opts': {
+                'hidden': True,
+            }
+        }
+    )
+    dir_prefix: List[str]
+
+class XlsxDatStream(DatDocumentStream):
+    name: Optional[str] = Field(
+        'xlsx',
+        description='The name of the document stream.',
+        json_schema_extra={
+            'ui-opts': {
+                'hidden': True,
+            }
+        }
+    )
+    dir_prefix: List[str]
+
 class AmazonS3Catalog(DatCatalog):
-    document_streams: List[Union[TxtDatStream, PdfDatStream]]
+    document_streams: List[Union[
+        TxtDatStream, PdfDatStream, ParquetDatStream, JsonLinesDatStream, ArchiveDatStream, XlsxDatStream
+    ]]
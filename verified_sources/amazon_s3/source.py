@@ -7,7 +7,7 @@ from dat_core.pydantic_models import DatMessage, DatLogMessage, Type, Level
 from dat_core.connectors.sources.base import SourceBase
 from dat_core.connectors.sources.stream import Stream
 from verified_sources.common.doc_splitters.factory import doc_splitter_factory, DocLoaderType, TextSplitterType
-from verified_sources.amazon_s3.streams import S3TxtStream, S3PdfStream
+from verified_sources.amazon_s3.streams import S3TxtStream, S3PdfStream, S3ParquetStream, S3JsonLinesStream, S3ArchiveStream, S3XlsxStream
 from verified_sources.amazon_s3.specs import AmazonS3Specification
 from verified_sources.amazon_s3.catalog import AmazonS3Catalog
 from dat_core.loggers import logger
@@ -41,5 +41,9 @@ class AmazonS3(SourceBase):
     def streams(self, config: Mapping[str, Any]) -> List[Stream]:
         return [
             S3TxtStream(config),
-            S3PdfStream(config)
+            S3PdfStream(config),
+            S3ParquetStream(config),
+            S3JsonLinesStream(config),
+            S3ArchiveStream(config),
+            S3XlsxStream(config)
         ]
\ No newline at end of file
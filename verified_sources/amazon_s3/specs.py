@@ -32,6 +32,16 @@ class ConnectionSpecificationModel(ConnectionSpecification):
     region_name: str = Field(
         ..., description='Region name for the project', title='Region name'
     )
+    parallel_workers: Optional[int] = Field(
+        0,
+        description='Number of worker processes used to load and split files in parallel. 0 or 1 disables parallel loading',
+        title='Parallel workers',
+    )
+    max_in_flight_files: Optional[int] = Field(
+        None,
+        description='Maximum number of downloaded files queued for the worker processes. Defaults to twice the number of workers. Each of them holds at most 1280 chunks in memory at a time',
+        title='Max in-flight files',
+    )
 
 
 class AmazonS3Specification(BaseModel):
@@ -1,11 +1,17 @@
 import datetime
 import tempfile
 import os
-from typing import Any, Generator, Iterable
+from typing import Any, Generator, Iterable, Tuple
 import boto3
 from dat_core.connectors.sources.stream import Stream
 from dat_core.pydantic_models import DatCatalog, DatDocumentStream, DatMessage
-from verified_sources.common.doc_splitters.factory import doc_splitter_factory, DocLoaderType, TextSplitterType
+from verified_sources.common.doc_splitters.factory import (
+    doc_splitter_factory, get_pdf_loader_key, DocLoaderType, TextSplitterType, DEFAULT_STREAM_WINDOW_SIZE
+)
+from verified_sources.common.doc_splitters.parallel import SplitJob, parallel_load_and_chunk
+from verified_sources.common.doc_splitters.chunks import chunk_text_and_metadata, chunk_views_enabled
+from verified_sources.common.doc_splitters.dedup import get_near_duplicate_filter
+from verified_sources.common.doc_splitters.loaders.compression import strip_compression_extension
 from verified_sources.amazon_s3.specs import AmazonS3Specification
 
 
@@ -21,6 +27,8 @@ class S3BaseStream(Stream):
         read_records: Reads records from the configured stream and yields DatMessage objects.
     """
     _default_cursor = 'dat_last_modified'
+    # Whether the stream's loader decompresses gzip/bz2/zstd objects, such as app.log.gz.
+    _reads_compressed = False
 
     def __init__(self, config: AmazonS3Specification) -> None:
         """
@@ -62,34 +70,79 @@ class S3BaseStream(Stream):
         objects = sorted(objects, key=lambda obj: obj['LastModified'].timestamp())
 
         with tempfile.TemporaryDirectory() as temp_dir:
-            for obj in self._filter_objects_to_process(objects, cursor_value):
-                file_path = f"{temp_dir}/{obj['Key']}"
-                os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                self.s3_client.download_file(
-                    self._config.connection_specification.bucket_name, obj['Key'], file_path)
-
-                splitter_settings = configured_stream.advanced.splitter_settings
-                _doc_loader_and_splitter = doc_splitter_factory.create(
-                        loader_key=self._doc_loader,
-                        splitter_key=splitter_settings.splitter_settings,
-                        loader_config=dict(
-                            file_path=file_path,
-                        ),
-                        splitter_config=splitter_settings.get_splitter_config(splitter_settings.model_dump())
-                )
-                for _doc_chunk in _doc_loader_and_splitter.load_and_chunk():
+            split_jobs = self._download_split_jobs(
+                self._filter_objects_to_process(objects, cursor_value), configured_stream, temp_dir)
+            for obj, doc_chunks in parallel_load_and_chunk(
+                    split_jobs,
+                    max_workers=self._config.connection_specification.parallel_workers,
+                    max_in_flight=self._config.connection_specification.max_in_flight_files,
+                    near_duplicate_filter=get_near_duplicate_filter()):
+                for _doc_chunk in doc_chunks:
+                    _doc_chunk, extra_metadata = chunk_text_and_metadata(
+                        _doc_chunk, {"dat_record_id": obj['Key']})
                     yield self.as_record_message(
                         configured_stream=configured_stream,
                         doc_chunk=_doc_chunk,
                         data_entity=obj['Key'],
                         dat_last_modified=obj['LastModified'].timestamp(),
-                        extra_metadata={"dat_record_id": obj['Key']}
+                        extra_metadata=extra_metadata
                     )
+
+    def _download_split_jobs(self,
+        objects: Iterable[dict],
+        configured_stream: DatDocumentStream,
+        temp_dir: str
+        ) -> Generator[Tuple[dict, SplitJob], Any, Any]:
+        """
+        Downloads objects one at a time, as they are needed, and describes how each
+        downloaded file should be loaded and split.
+
+        Args:
+            objects (Iterable[dict]): Objects to download.
+            configured_stream (DatDocumentStream): The configured DatDocumentStream object.
+            temp_dir (str): Directory to download the objects to.
+
+        Yields:
+            Generator[Tuple[dict, SplitJob], Any, Any]: (object, split job) pairs.
+        """
+        splitter_settings = configured_stream.advanced.splitter_settings
+        splitter_config = splitter_settings.get_splitter_config(splitter_settings.model_dump())
+        for obj in objects:
+            file_path = f"{temp_dir}/{obj['Key']}"
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            self.s3_client.download_file(
+                self._config.connection_specification.bucket_name, obj['Key'], file_path)
+
+            yield obj, SplitJob(
+                loader_key=self._doc_loader,
+                splitter_key=splitter_settings.splitter_settings,
+                loader_config=dict(
+                    file_path=file_path,
+                    **self._loader_config(configured_stream)
+                ),
+                splitter_config=splitter_config,
+                stream_window_size=DEFAULT_STREAM_WINDOW_SIZE,
+                use_chunk_cache=True,
+                chunk_views=chunk_views_enabled()
+            )
     
+    def _loader_config(self, configured_stream: DatDocumentStream) -> dict:
+        """
+        Returns the stream specific settings passed to the loader of each object.
+
+        Args:
+            configured_stream (DatDocumentStream): The configured DatDocumentStream object.
+
+        Returns:
+            dict: Keyword arguments for the loader, besides file_path.
+        """
+        return {}
+
     def _filter_objects_to_process(self,
         objects: Iterable[dict], cursor_value: int) -> Generator[dict, Any, Any]:
         """
         Filters objects based on their last modification timestamp and supported file types.
+        Compressed objects match by their inner extension if the stream reads them.
 
         Args:
             self: The current object instance.
@@ -105,19 +158,51 @@ class S3BaseStream(Stream):
         for obj in objects:
             if cursor_value and obj['LastModified'].timestamp() < cursor_value:
                 continue
+            key = strip_compression_extension(obj['Key']) if self._reads_compressed else obj['Key']
             for _doc_type in self._supported_file_types:
-                if obj['Key'].endswith(_doc_type):
+                if key.endswith(_doc_type):
                     yield obj
 
 
 
 class S3TxtStream(S3BaseStream):
     _name = 'txt'
-    _doc_loader = DocLoaderType.TEXT
+    _doc_loader = DocLoaderType.MMAP_TEXT
     _supported_file_types = ('.txt', '.log', '.csv')
+    _reads_compressed = True
 
 class S3PdfStream(S3BaseStream):
     _name = 'pdf'
-    _doc_loader = DocLoaderType.PYPDF
     _supported_file_types = ('.pdf',)
 
+    @property
+    def _doc_loader(self) -> DocLoaderType:
+        return get_pdf_loader_key()
+
+class S3ParquetStream(S3BaseStream):
+    _name = 'parquet'
+    _doc_loader = DocLoaderType.PARQUET
+    _supported_file_types = ('.parquet',)
+
+class S3JsonLinesStream(S3BaseStream):
+    _name = 'jsonl'
+    _doc_loader = DocLoaderType.JSONL
+    _supported_file_types = ('.jsonl', '.ndjson')
+    _reads_compressed = True
+
+    def _loader_config(self, configured_stream: DatDocumentStream) -> dict:
+        return dict(
+            content_fields=getattr(configured_stream, 'content_fields', None),
+            metadata_fields=getattr(configured_stream, 'metadata_fields', None) or (),
+        )
+
+class S3ArchiveStream(S3BaseStream):
+    _name = 'archive'
+    _doc_loader = DocLoaderType.ARCHIVE
+    _supported_file_types = ('.zip', '.tar', '.tgz', '.tar.gz', '.tar.bz2', '.tar.zst')
+
+class S3XlsxStream(S3BaseStream):
+    _name = 'xlsx'
+    _doc_loader = DocLoaderType.XLSX
+    _supported_file_types = ('.xlsx',)
+
@@ -1,7 +1,12 @@
 import datetime
+from typing import TYPE_CHECKING, Optional
 from pydantic import BaseModel, Field
-from langchain_core.documents import Document as LCDocument
-from llama_index.core.schema import Document as LIDocument
+
+if TYPE_CHECKING:
+    # Only needed for type hints; importing these eagerly costs every
+    # connector the full langchain/llama_index startup time.
+    from langchain_core.documents import Document as LCDocument
+    from llama_index.core.schema import Document as LIDocument
 
 class Document(BaseModel):
 
@@ -11,12 +16,53 @@ class Document(BaseModel):
     updated_at: datetime.datetime = None # TODO: Figure out how to populate this
 
     @classmethod
-    def from_langchain_document(cls, doc: LCDocument) -> "Document":
+    def from_langchain_document(cls, doc: "LCDocument") -> "Document":
         return cls(filepath=doc.metadata['source'], page_content=doc.page_content, metadata=doc.metadata)
     
     @classmethod
-    def from_llama_index_document(cls, doc: LIDocument) -> "Document":
+    def from_llama_index_document(cls, doc: "LIDocument") -> "Document":
         if 'file_path' in doc.metadata:
             return cls(filepath=doc.metadata['file_path'], page_content=doc.text, metadata=doc.metadata)
         elif 'URL' in doc.metadata:
             return cls(filepath=doc.metadata['URL'], page_content=doc.text, metadata=doc.metadata)
+
+
+class RawDocument:
+    """
+    Unvalidated document used between loaders and splitters.
+
+    Loaders can produce one of these per page, so pydantic validation and the
+    metadata copy it makes are too expensive there. Documents are validated by
+    to_document() only when they are handed out of BaseSplitter.load().
+    """
+    __slots__ = ('filepath', 'page_content', 'metadata')
+
+    def __init__(self, filepath: str, page_content: str, metadata: Optional[dict] = None) -> None:
+        self.filepath = filepath
+        self.page_content = page_content
+        self.metadata = {} if metadata is None else metadata
+
+    def __repr__(self) -> str:
+        return f'RawDocument(filepath={self.filepath!r}, page_content={self.page_content[:40]!r}, metadata={self.metadata!r})'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RawDocument):
+            return NotImplemented
+        return (self.filepath, self.page_content, self.metadata) == (other.filepath, other.page_content, other.metadata)
+
+    def to_document(self) -> Document:
+        return Document(filepath=self.filepath, page_content=self.page_content, metadata=self.metadata)
+
+    def to_dict(self) -> dict:
+        return {'filepath': self.filepath, 'page_content': self.page_content, 'metadata': self.metadata}
+
+    @classmethod
+    def from_langchain_document(cls, doc: "LCDocument") -> "RawDocument":
+        return cls(doc.metadata['source'], doc.page_content, doc.metadata)
+
+    @classmethod
+    def from_llama_index_document(cls, doc: "LIDocument") -> Optional["RawDocument"]:
+        if 'file_path' in doc.metadata:
+            return cls(doc.metadata['file_path'], doc.text, doc.metadata)
+        elif 'URL' in doc.metadata:
+            return cls(doc.metadata['URL'], doc.text, doc.metadata)
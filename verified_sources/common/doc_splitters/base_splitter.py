@@ -14,8 +14,26 @@ Dependencies:
     - langchain_community.document_loaders.base.BaseLoader: A base document loader class from the langchain_community.document_loaders.base module.
 """
 
-from typing import Generator, Any, Optional
-from verified_sources.common.doc_splitters import Document
+import os
+import logging
+from typing import Generator, Any, Iterable, List, Optional, Tuple
+from verified_sources.common.doc_splitters import Document, RawDocument
+from verified_sources.common.doc_splitters.loader_adapters import (
+    LoaderAdapter, detect_loader_protocol, get_loader_adapter
+)
+from verified_sources.common.doc_splitters.splitters.streaming import StreamingTextSplitter
+from verified_sources.common.doc_splitters.splitters.spans import SpanTextSplitter
+from verified_sources.common.doc_splitters.cache import ChunkCache
+from verified_sources.common.doc_splitters.chunks import ChunkView, DocumentChunk, iter_chunk_views
+from verified_sources.common.doc_splitters.dedup import NearDuplicateFilter
+from verified_sources.common.doc_splitters.instrumentation import (
+    STAGE_LOAD, STAGE_OTHER, STAGE_SPLIT, InstrumentationCallback, RunInstrumentation
+)
+
+logger = logging.getLogger(__name__)
+
+# Splitter types already warned about not producing chunk views.
+_views_unsupported_warned = set()
 
 class BaseSplitter:
     """
@@ -24,30 +42,66 @@ class BaseSplitter:
     Attributes:
         _default_splitter (Any): The default splitter object.
         _default_loader (Any): The default loader object.
+        _loader_adapter (LoaderAdapter): Adapter that loads and converts documents from _default_loader.
+        _stream_window_size (Optional[int]): Window size for streaming splits, None to disable.
+        _chunk_cache (Optional[ChunkCache]): Cache of extracted documents and chunks, None to disable.
+        _chunk_views (bool): Whether load_and_chunk() yields ChunkView objects instead of strings.
+        _near_duplicate_filter (Optional[NearDuplicateFilter]): Filter applied to the chunks, None to disable.
+        _instrumentation (List[InstrumentationCallback]): Callbacks receiving the per-stage statistics of each run.
 
     Methods:
         register_document_loader: Registers a document loader object.
         register_document_splitter: Registers a document splitter object.
+        register_chunk_cache: Registers a cache for the loader's documents and chunks.
+        register_near_duplicate_filter: Registers a filter for near-duplicate chunks.
+        register_instrumentation: Registers a callback receiving per-stage statistics.
         load: Loads documents using the registered loader.
         load_and_chunk: Loads and chunks documents using the registered loader and splitter.
         split_text: Splits text using the registered splitter.
+        split_many: Splits a batch of texts using the registered splitter.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, stream_window_size: Optional[int] = None, chunk_views: bool = False) -> None:
         """
         Initializes a new BaseSplitter object.
+
+        Parameters:
+            stream_window_size (Optional[int]): If set, load_and_chunk() reads the source in
+                windows of about this size and splits it incrementally whenever the loader
+                and splitter support it, instead of loading whole documents. The size is in
+                bytes of the file for native loaders such as MmapTextLoader, and in
+                characters for langchain's TextLoader.
+            chunk_views (bool): If set, load_and_chunk() yields ChunkView objects carrying
+                each chunk's offsets in its document. Chunks are located in whole
+                documents, so this disables streaming splits and the chunks cache.
         """
         self._default_splitter = None
         self._default_loader = None
+        self._loader_adapter = None
+        self._stream_window_size = stream_window_size
+        self._chunk_cache = None
+        self._documents_cache_key = None
+        self._chunks_cache_key = None
+        self._chunk_views = chunk_views
+        self._near_duplicate_filter = None
+        self._instrumentation = []
     
-    def register_document_loader(self, loader_object: Any) -> None:
+    def register_document_loader(self, loader_object: Any, adapter: Optional[LoaderAdapter] = None) -> None:
         """
         Registers a document loader object.
 
         Parameters:
             loader_object (Any): The document loader object to register.
+            adapter (Optional[LoaderAdapter]): The adapter for the loader's protocol. Detected
+                from the loader's class if not given.
         """
+        if adapter is None:
+            protocol = detect_loader_protocol(type(loader_object))
+            if protocol is None:
+                raise Exception(f'Unable to work out the protocol of loader {type(loader_object).__name__}')
+            adapter = get_loader_adapter(protocol)
         self._default_loader = loader_object
+        self._loader_adapter = adapter
     
     def register_document_splitter(self, splitter_object: Any) -> None:
         """
@@ -58,6 +112,57 @@ class BaseSplitter:
         """
         self._default_splitter = splitter_object
     
+    def register_chunk_cache(self, cache: ChunkCache, documents_key: str, chunks_key: str) -> None:
+        """
+        Registers a cache for the documents and chunks produced from the loader's source.
+
+        Parameters:
+            cache (ChunkCache): The cache.
+            documents_key (str): Cache key of the loader's documents.
+            chunks_key (str): Cache key of the chunks produced by the registered splitter.
+        """
+        self._chunk_cache = cache
+        self._documents_cache_key = documents_key
+        self._chunks_cache_key = chunks_key
+
+    def register_near_duplicate_filter(self, near_duplicate_filter: NearDuplicateFilter) -> None:
+        """
+        Registers a filter that drops or flags chunks which are near-duplicates of
+        chunks seen before. Share one filter between the splitters of a sync to
+        suppress boilerplate repeated across files.
+
+        Parameters:
+            near_duplicate_filter (NearDuplicateFilter): The filter.
+        """
+        self._near_duplicate_filter = near_duplicate_filter
+
+    def register_instrumentation(self, callback: InstrumentationCallback) -> None:
+        """
+        Registers a callback that receives, once each run of load(), load_and_chunk(),
+        split_text() or split_many() finishes, the wall and CPU time, bytes in,
+        documents out and chunks out of its stages as a list of StageStats.
+
+        Parameters:
+            callback (InstrumentationCallback): The callback.
+        """
+        self._instrumentation.append(callback)
+
+    def _start_run(self) -> Optional[RunInstrumentation]:
+        """
+        Returns the instrumentation of a new run, or None when no callback is
+        registered, in which case nothing is timed.
+        """
+        if not self._instrumentation:
+            return None
+        source = getattr(self._default_loader, 'file_path', None) or getattr(self._default_loader, 'web_path', None)
+        return RunInstrumentation(self._instrumentation, str(source) if source else None)
+
+    def _source_size(self) -> int:
+        file_path = getattr(self._default_loader, 'file_path', None)
+        if file_path and os.path.isfile(file_path):
+            return os.path.getsize(file_path)
+        return 0
+
     def load(self, **kwargs) -> Generator[Document, Any, Any]:
         """
         Loads documents using the registered loader.
@@ -67,44 +172,259 @@ class BaseSplitter:
         """
         if not self._default_loader:
             raise Exception('Please register a document loader first using register_document_loader()')
-        
-        try:
-            docs = self._default_loader.lazy_load(**kwargs) # langchain loaders lazy_load
-        except NotImplementedError:
-            docs = self._default_loader.load(**kwargs) # langchain loaders default load
-        except AttributeError:
-            try:
-                docs = self._default_loader.lazy_load_data(**kwargs) # llama index loaders lazy_load
-            except NotImplementedError:
-                docs = self._default_loader.load_data(**kwargs) # llama index default load method
-            
-        
-        for doc in docs:
-            try:
-                yield Document.from_langchain_document(doc)
-            except (AttributeError, KeyError):
-                yield Document.from_llama_index_document(doc)
 
-    def load_and_chunk(self, **kwargs) -> Generator[Document, Any, Any]:
+        run = self._start_run()
+        if run is None:
+            for doc in self._iter_raw_documents(None, **kwargs):
+                yield doc.to_document()
+            return
+        docs = (doc.to_document() for doc in self._iter_raw_documents(run, **kwargs))
+        yield from run.emitted(docs, counts='documents_out')
+
+    def _iter_raw_documents(self, run: Optional[RunInstrumentation], **kwargs) -> Generator[RawDocument, Any, Any]:
+        """
+        Loads documents without validating them, going through the documents cache
+        when one is registered.
+        """
+        if self._chunk_cache is None:
+            yield from self._loader_documents(run, **kwargs)
+            return
+
+        cached = self._chunk_cache.get_documents(self._documents_cache_key)
+        if cached is not None:
+            yield from cached
+            return
+        yield from self._collect_into_cache(
+            self._loader_documents(run, **kwargs),
+            self._chunk_cache.put_documents, self._documents_cache_key,
+            size=lambda doc: len(doc.page_content))
+
+    def _loader_documents(self, run: Optional[RunInstrumentation], **kwargs) -> Iterable[RawDocument]:
+        """
+        Returns the documents of the loader, charged to the 'load' stage of run.
+        """
+        docs = self._loader_adapter.iter_documents(self._default_loader, **kwargs)
+        if run is None:
+            return docs
+        run.bytes_in[STAGE_LOAD] += self._source_size()
+        return run.timed(docs, STAGE_LOAD, counts='documents_out')
+
+    def _split(self, run: Optional[RunInstrumentation], text: str) -> Iterable[Any]:
+        """
+        Splits text with the registered splitter, charged to the 'split' stage of run.
+        """
+        if run is None:
+            return self._default_splitter.split_text(text)
+        return run.split_documents(self._default_splitter.split_text, text)
+
+    def load_and_chunk(self, **kwargs) -> Generator[Any, Any, Any]:
         """
-        Loads and chunks documents using the registered loader and splitter.
+        Loads and chunks documents using the registered loader and splitter, streaming
+        the source in windows when stream_window_size is set and the loader and
+        splitter support it.
 
         Parameters:
-            doc_loader (Optional[Any]): An optional document loader object.
-            text_splitter (Optional[Any]): An optional text splitter object.
+            **kwargs: Passed through to the loader's load method.
 
         Yields:
-            Generator[Document, Any, Any]: A generator yielding chunks of Document.
+            Generator[Any, Any, Any]: The chunks, as text, or as ChunkView objects when
+                chunk_views is set. Splitters producing langchain Documents (e.g. the HTML
+                and JSON splitters) yield those. Chunks of loaders with record_metadata_keys
+                are wrapped in DocumentChunk, and near-duplicates flagged by a registered
+                filter in DuplicateChunk; chunk_text_and_metadata() unwraps all of them.
         """
         if not self._default_loader:
             raise Exception('Please register a document loader first using register_document_loader()')
         if not self._default_splitter:
             raise Exception('Please register a document splitter first using register_document_splitter()')
 
-        docs = self.load(**kwargs)
+        run = self._start_run()
+        chunks = self._iter_chunks(run, **kwargs)
+        if self._near_duplicate_filter is not None:
+            chunks = self._near_duplicate_filter.filter(chunks)
+        if run is not None:
+            chunks = run.emitted(chunks)
+        yield from chunks
+
+    def _iter_chunks(self, run: Optional[RunInstrumentation], **kwargs) -> Iterable[Any]:
+        """
+        Produces the chunks, or views, from the chunks cache or by loading and splitting.
+        """
+        if self._chunk_views:
+            return self._iter_chunk_views(run, **kwargs)
+        return self._iter_plain_chunks(run, **kwargs)
+
+    def _iter_plain_chunks(self, run: Optional[RunInstrumentation], **kwargs) -> Generator[Any, Any, Any]:
+        """
+        Produces the chunks from the chunks cache or by loading and splitting.
+        """
+        if self._chunk_cache is None or self._record_metadata_keys():
+            yield from self._load_and_chunk(run, **kwargs)
+            return
+
+        cached = self._chunk_cache.get_chunks(self._chunks_cache_key)
+        if cached is not None:
+            yield from cached
+            return
+        yield from self._collect_into_cache(
+            self._load_and_chunk(run, **kwargs), self._chunk_cache.put_chunks, self._chunks_cache_key,
+            size=lambda chunk: len(chunk) if isinstance(chunk, str) else None)
 
+    def _load_and_chunk(self, run: Optional[RunInstrumentation], **kwargs) -> Generator[Any, Any, Any]:
+        """
+        Loads and chunks documents, streaming the source when possible.
+        """
+        open_windows = self._open_stream_windows()
+        if open_windows:
+            stream_splitter = self._get_stream_splitter()
+            if stream_splitter:
+                if run is None:
+                    yield from stream_splitter.split_stream(open_windows)
+                    return
+                run.bytes_in[STAGE_LOAD] += self._source_size()
+                yield from run.timed(stream_splitter.split_stream(run.text_windows(open_windows)), STAGE_SPLIT)
+                return
+
+        docs = self._iter_raw_documents(run, **kwargs)
+
+        record_metadata_keys = self._record_metadata_keys()
         for doc in docs:
-            yield from self.split_text(doc.page_content)
+            yield from self._with_record_metadata(self._split(run, doc.page_content), doc, record_metadata_keys)
+
+    def _record_metadata_keys(self) -> Tuple[str, ...]:
+        """
+        Returns the keys of the document metadata the loader emits with the records
+        of their chunks. Chunks are then wrapped in DocumentChunk, and are not cached
+        as the cache does not keep the documents they were split from.
+        """
+        return getattr(self._default_loader, 'record_metadata_keys', ())
+
+    def _with_record_metadata(self, chunks: Iterable[Any], doc: RawDocument,
+                              record_metadata_keys: Tuple[str, ...]) -> Iterable[Any]:
+        """
+        Wraps the chunks of doc in DocumentChunk with the metadata of doc under
+        record_metadata_keys, if any.
+        """
+        metadata = {key: doc.metadata[key] for key in record_metadata_keys if key in doc.metadata}
+        if not metadata:
+            return chunks
+        return (DocumentChunk(chunk, metadata) for chunk in chunks)
+
+    def _iter_chunk_views(self, run: Optional[RunInstrumentation], **kwargs) -> Generator[Any, Any, Any]:
+        """
+        Produces the chunks as views, from the chunks cache or by loading and splitting.
+        Falls back to plain chunks for splitters that cannot produce offsets.
+        """
+        span_splitter = SpanTextSplitter.from_splitter(self._default_splitter)
+        if span_splitter is None:
+            splitter_type = type(self._default_splitter).__name__
+            if splitter_type not in _views_unsupported_warned:
+                _views_unsupported_warned.add(splitter_type)
+                logger.warning(f'{splitter_type} does not produce chunk offsets, emitting chunks without them')
+            yield from self._iter_plain_chunks(run, **kwargs)
+            return
+
+        open_windows = self._open_stream_windows()
+        stream_splitter = StreamingTextSplitter.from_splitter(self._default_splitter) if open_windows else None
+        if stream_splitter is not None:
+            # The views of a streamed source hold their own text, the whole text is never loaded.
+            views = self._stream_views(run, stream_splitter, open_windows)
+        else:
+            views = self._load_and_chunk_views(run, span_splitter, **kwargs)
+        if self._chunk_cache is None or self._record_metadata_keys():
+            yield from views
+            return
+
+        key = f'{self._chunks_cache_key}:views'
+        cached = self._chunk_cache.get_chunks(key)
+        if cached is not None:
+            yield from self._cached_views(run, cached, **kwargs)
+            return
+        with_text = stream_splitter is not None
+        yield from self._collect_into_cache(
+            views, lambda key, views: self._chunk_cache.put_chunks(key, [view.cache_entry(with_text) for view in views]),
+            key, size=lambda view: len(view) + 32 if with_text or view.start is None else 32)
+
+    def _stream_views(self, run: Optional[RunInstrumentation], stream_splitter: StreamingTextSplitter,
+                      open_windows: Any) -> Generator[ChunkView, Any, Any]:
+        if run is None:
+            yield from stream_splitter.split_stream_views(open_windows)
+            return
+        run.bytes_in[STAGE_LOAD] += self._source_size()
+        yield from run.timed(stream_splitter.split_stream_views(run.text_windows(open_windows)), STAGE_SPLIT)
+
+    def _load_and_chunk_views(self, run: Optional[RunInstrumentation], span_splitter: SpanTextSplitter,
+                              **kwargs) -> Generator[ChunkView, Any, Any]:
+        """
+        Loads and splits documents into spans, yielding each chunk as a view into its
+        document. No chunk text is allocated.
+        """
+        record_metadata_keys = self._record_metadata_keys()
+        for doc_index, doc in enumerate(self._iter_raw_documents(run, **kwargs)):
+            text = doc.page_content
+            if run is None:
+                spans = span_splitter.split_spans(text)
+            else:
+                spans = run.split_documents(span_splitter.split_spans, text)
+            yield from self._with_record_metadata(iter_chunk_views(text, spans, doc_index), doc, record_metadata_keys)
+
+    def _cached_views(self, run: Optional[RunInstrumentation], entries: List[Any], **kwargs) -> Generator[ChunkView, Any, Any]:
+        """
+        Rebuilds views from the chunks cache, loading the documents (usually from the
+        documents cache) only for entries without text of their own.
+        """
+        docs = None
+        doc_index, text = -1, None
+        for entry in entries:
+            if len(entry) == 3:
+                if docs is None:
+                    docs = enumerate(self._iter_raw_documents(run, **kwargs))
+                while doc_index < entry[0]:
+                    doc_index, doc = next(docs)
+                    text = doc.page_content
+            yield ChunkView.from_cache_entry(entry, text)
+
+    def _collect_into_cache(self, items, put, key: str, size) -> Generator[Any, Any, Any]:
+        """
+        Passes items through while collecting them, and stores the collected items
+        with put(key, items) once all of them have been consumed. Gives up collecting
+        when an item cannot be cached (size returns None) or the output grows beyond
+        the cache's max_entry_bytes, so large documents do not pile up in memory.
+        """
+        collected, total = [], 0
+        for item in items:
+            if collected is not None:
+                item_size = size(item)
+                if item_size is None or total + item_size > self._chunk_cache.max_entry_bytes:
+                    collected = None
+                else:
+                    collected.append(item)
+                    total += item_size
+            yield item
+        if collected is not None:
+            try:
+                put(key, collected)
+            except (TypeError, ValueError):
+                # Metadata that cannot be serialized is simply not cached.
+                pass
+
+    def _open_stream_windows(self) -> Optional[Any]:
+        """
+        Returns the loader's open_windows callable when streaming is enabled and the
+        loader can stream its source, None otherwise.
+        """
+        if not self._stream_window_size:
+            return None
+        return self._loader_adapter.text_windows(self._default_loader, self._stream_window_size)
+
+    def _get_stream_splitter(self) -> Optional[Any]:
+        """
+        Returns an object with a split_stream() method for the registered splitter,
+        or None if it cannot split a stream of text windows.
+        """
+        if hasattr(self._default_splitter, 'split_stream'):
+            return self._default_splitter
+        return StreamingTextSplitter.from_splitter(self._default_splitter)
     
     def split_text(self, text: str) -> Generator[str, Any, Any]:
         """
@@ -116,5 +436,70 @@ class BaseSplitter:
         Yields:
             Generator[str, Any, Any]: A generator yielding split text fragments.
         """
-        for txt in self._default_splitter.split_text(text):
-            yield txt
+        run = self._start_run()
+        if run is None:
+            yield from self._default_splitter.split_text(text)
+            return
+        yield from run.emitted(run.split_documents(self._default_splitter.split_text, text))
+
+    def split_many(self, texts: Iterable[str]) -> List[List[str]]:
+        """
+        Splits a batch of texts, such as database or CSV rows, using the registered
+        splitter. Gives the same chunks as calling split_text() on every text, but
+        texts that fit in a single chunk are passed through without calling the
+        splitter when that provably gives the same result.
+
+        Parameters:
+            texts (Iterable[str]): The texts to be split.
+
+        Returns:
+            List[List[str]]: The chunks of each text, in the order of texts.
+        """
+        run = self._start_run()
+        if run is None:
+            return self._split_many(texts)
+        texts = list(texts)
+        for text in texts:
+            run.count_text(STAGE_SPLIT, text)
+        run.switch(STAGE_SPLIT)
+        try:
+            results = self._split_many(texts)
+            run.chunks_out[STAGE_SPLIT] += sum(map(len, results))
+            return results
+        finally:
+            run.switch(STAGE_OTHER)
+            run.finish()
+
+    def _split_many(self, texts: Iterable[str]) -> List[List[str]]:
+        splitter = self._default_splitter
+        if hasattr(splitter, 'split_many'):
+            return splitter.split_many(texts)
+
+        split_text = splitter.split_text
+        max_unsplit_len = self._max_unsplit_len()
+        strip_whitespace = getattr(splitter, '_strip_whitespace', True)
+        results = []
+        for text in texts:
+            if len(text) < max_unsplit_len:
+                text = text.strip() if strip_whitespace else text
+                results.append([text] if text else [])
+            else:
+                results.append(split_text(text))
+        return results
+
+    def _max_unsplit_len(self) -> int:
+        """
+        Returns the length below which the registered splitter returns a text as a
+        single chunk, 0 if that cannot be known without splitting.
+
+        That holds for a RecursiveCharacterTextSplitter measuring characters and
+        keeping its separators: every piece is shorter than chunk_size, so they are
+        merged back into the original text.
+        """
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        splitter = self._default_splitter
+        if (type(splitter) is not RecursiveCharacterTextSplitter
+                or splitter._length_function is not len
+                or not splitter._keep_separator):
+            return 0
+        return splitter._chunk_size
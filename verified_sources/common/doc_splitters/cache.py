@@ -0,0 +1,194 @@
+"""
+Module: cache
+
+This module contains a persistent, content addressed cache for extracted documents
+and chunks, so unchanged files do not have to be parsed and split again on every
+full refresh.
+
+Entries are keyed by the SHA-256 of the file's bytes together with the loader key
+(extracted documents) or the loader key, splitter key and splitter config (chunks).
+They are stored in a SQLite database and evicted least recently used first once the
+configured size budget is exceeded.
+
+Classes:
+    ChunkCache: Disk backed LRU cache of extracted documents and chunks.
+    ChunkCacheInfo: Statistics of a ChunkCache.
+
+Functions:
+    get_default_chunk_cache: Returns the process wide cache configured through the environment.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import List, NamedTuple, Optional
+from verified_sources.common.doc_splitters import RawDocument
+
+DEFAULT_CACHE_MAX_BYTES = 1024 ** 3
+
+
+class ChunkCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    max_bytes: int
+    curr_bytes: int
+    entries: int
+
+
+class ChunkCache:
+    """
+    Disk backed LRU cache of extracted documents and chunks.
+
+    Methods:
+        hash_file: Returns the SHA-256 of a file's contents.
+        get_documents / put_documents: Cached loader output for a file.
+        get_chunks / put_chunks: Cached splitter output for a file.
+        cache_info: Returns hit/miss and size statistics.
+    """
+
+    def __init__(self,
+        directory: str,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        max_entry_bytes: Optional[int] = None
+    ) -> None:
+        """
+        Initializes a new ChunkCache object.
+
+        Parameters:
+            directory (str): Directory holding the cache database. Created if missing.
+            max_bytes (int): Size budget for cached entries. Least recently used
+                entries are evicted once it is exceeded.
+            max_entry_bytes (Optional[int]): Largest single entry worth caching
+                (default: max_bytes / 16). Bigger outputs are not collected at all.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes or max_bytes // 16
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._db = sqlite3.connect(
+            os.path.join(directory, 'chunk_cache.sqlite3'), timeout=30, check_same_thread=False)
+        with self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)')
+
+    @staticmethod
+    def hash_file(file_path: str, block_size: int = 1024 * 1024) -> str:
+        """
+        Returns the hex SHA-256 of the contents of file_path.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def documents_key(content_hash: str, loader_key: str) -> str:
+        return f'documents:{content_hash}:{loader_key}'
+
+    @staticmethod
+    def chunks_key(content_hash: str, loader_key: str, splitter_key: str, splitter_config_hash: str) -> str:
+        return f'chunks:{content_hash}:{loader_key}:{splitter_key}:{splitter_config_hash}'
+
+    def get_documents(self, key: str) -> Optional[List[RawDocument]]:
+        value = self._get(key)
+        if value is None:
+            return None
+        return [RawDocument(**doc) for doc in value]
+
+    def put_documents(self, key: str, documents: List[RawDocument]) -> None:
+        self._put(key, [doc.to_dict() for doc in documents])
+
+    def get_chunks(self, key: str) -> Optional[List[str]]:
+        return self._get(key)
+
+    def put_chunks(self, key: str, chunks: List[str]) -> None:
+        self._put(key, chunks)
+
+    def cache_info(self) -> ChunkCacheInfo:
+        """
+        Returns hit/miss statistics of this process and the current size of the cache.
+        """
+        with self._lock:
+            entries, curr_bytes = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+            return ChunkCacheInfo(self._hits, self._misses, self.max_bytes, curr_bytes, entries)
+
+    def clear(self) -> None:
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM entries')
+
+    def _get(self, key: str):
+        with self._lock:
+            row = self._db.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            with self._db:
+                self._db.execute('UPDATE entries SET last_access = ? WHERE key = ?', (time.time(), key))
+        return json.loads(row[0])
+
+    def _put(self, key: str, value) -> None:
+        serialized = json.dumps(value)
+        size = len(serialized)
+        if size > self.max_entry_bytes:
+            return
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)',
+                (key, serialized, size, time.time()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Deletes least recently used entries until the cache fits its size budget.
+        Must be called with the lock held, inside a transaction.
+        """
+        total, = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()
+        if total <= self.max_bytes:
+            return
+        evict = []
+        for key, size in self._db.execute('SELECT key, size FROM entries ORDER BY last_access'):
+            if total <= self.max_bytes:
+                break
+            evict.append((key,))
+            total -= size
+        self._db.executemany('DELETE FROM entries WHERE key = ?', evict)
+
+
+_default_chunk_cache = None
+_default_chunk_cache_pid = None
+_default_chunk_cache_lock = threading.Lock()
+
+
+def get_default_chunk_cache() -> Optional[ChunkCache]:
+    """
+    Returns the process wide ChunkCache, or None when caching is not configured.
+
+    The cache is enabled by setting DAT_CHUNK_CACHE_DIR; DAT_CHUNK_CACHE_MAX_BYTES
+    overrides the size budget (default 1 GiB).
+    """
+    global _default_chunk_cache, _default_chunk_cache_pid
+    directory = os.getenv('DAT_CHUNK_CACHE_DIR')
+    if not directory:
+        return None
+    with _default_chunk_cache_lock:
+        # SQLite connections must not be shared with forked worker processes.
+        if _default_chunk_cache is None or _default_chunk_cache_pid != os.getpid():
+            _default_chunk_cache_pid = os.getpid()
+            _default_chunk_cache = ChunkCache(
+                directory,
+                max_bytes=int(os.getenv('DAT_CHUNK_CACHE_MAX_BYTES', DEFAULT_CACHE_MAX_BYTES)),
+            )
+    return _default_chunk_cache
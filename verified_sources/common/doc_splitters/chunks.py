@@ -0,0 +1,202 @@
+"""
+Module: chunks
+
+This module contains ChunkView, a chunk represented by its character offsets in
+the text of the document it was split from. Views share the document's text
+instead of each holding a copy of their slice (overlapping regions included), and
+the text of a chunk is only materialized when it is emitted.
+
+Classes:
+    ChunkView: A chunk as a (document text, start, end) view.
+    DocumentChunk: A chunk with the metadata of its document emitted in its record.
+
+Functions:
+    iter_chunk_views: Yields the spans split from a text as views.
+    chunk_views_enabled: Whether connectors should request chunk views.
+    chunk_text_and_metadata: Returns the text of a chunk and the record metadata to emit with it.
+"""
+
+import os
+from typing import Any, Generator, Iterable, List, Optional, Tuple
+from verified_sources.common.doc_splitters.dedup import DuplicateChunk
+
+# Metadata of langchain Document chunks that is emitted with their records.
+RECORD_METADATA_KEYS = ('json_paths',)
+
+
+class ChunkView:
+    """
+    A chunk of a document, represented by its character offsets in the document's text.
+
+    Attributes:
+        start (Optional[int]): Offset of the first character of the chunk in the
+            document, or None if the chunk could not be located.
+        end (Optional[int]): Offset just past the last character of the chunk.
+        doc_index (int): Position of the document in the loader's output, e.g. the
+            page number for page level PDF loaders.
+    """
+    __slots__ = ('_source', '_base', 'start', 'end', 'doc_index')
+
+    def __init__(self, source: str, start: Optional[int], end: Optional[int], doc_index: int = 0, _base: int = 0) -> None:
+        self._source = source
+        self._base = _base
+        self.start = start
+        self.end = end
+        self.doc_index = doc_index
+
+    @classmethod
+    def unlocated(cls, text: str, doc_index: int = 0) -> "ChunkView":
+        """
+        Returns a view holding text itself, for chunks that do not occur verbatim
+        in their document (e.g. after a regex separator was replaced).
+        """
+        view = cls(text, None, None, doc_index)
+        view._base = None
+        return view
+
+    @property
+    def text(self) -> str:
+        if self._base is None:
+            return self._source
+        return self._source[self.start - self._base:self.end - self._base]
+
+    def offset_metadata(self) -> dict:
+        """
+        Returns the chunk's position, for the metadata of the record it is emitted in.
+        """
+        if self.start is None:
+            return {'chunk_doc_index': self.doc_index}
+        return {'chunk_doc_index': self.doc_index, 'chunk_start': self.start, 'chunk_end': self.end}
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __len__(self) -> int:
+        if self.start is None:
+            return len(self._source)
+        return self.end - self.start
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ChunkView):
+            return NotImplemented
+        return (self.text, self.start, self.end, self.doc_index) == (other.text, other.start, other.end, other.doc_index)
+
+    def __repr__(self) -> str:
+        return f'ChunkView(doc_index={self.doc_index}, start={self.start}, end={self.end}, text={self.text[:40]!r})'
+
+    def __reduce__(self):
+        # Pickle only the chunk's own text, not the whole document it points into.
+        if self.start is None:
+            return (ChunkView.unlocated, (self._source, self.doc_index))
+        return (ChunkView, (self.text, self.start, self.end, self.doc_index, self.start))
+
+    def cache_entry(self, with_text: bool) -> List[Any]:
+        """
+        Returns the view as a JSON serializable list for the chunks cache. The text is
+        left out, unless with_text is set, for views that can be rebuilt from their
+        cached document.
+        """
+        if self.start is None:
+            return [self.doc_index, None, None, self._source]
+        if with_text:
+            return [self.doc_index, self.start, self.end, self.text]
+        return [self.doc_index, self.start, self.end]
+
+    @classmethod
+    def from_cache_entry(cls, entry: List[Any], document_text: Optional[str] = None) -> "ChunkView":
+        """
+        Rebuilds a view from cache_entry(), into document_text for entries without text.
+        """
+        doc_index, start, end = entry[:3]
+        if start is None:
+            return cls.unlocated(entry[3], doc_index)
+        if len(entry) > 3:
+            return cls(entry[3], start, end, doc_index, start)
+        return cls(document_text, start, end, doc_index)
+
+
+class DocumentChunk:
+    """
+    A chunk, as a string or ChunkView, together with the metadata of the document
+    it was split from that is emitted with its record, e.g. the line of a JSON Lines
+    record or the member of an archive.
+
+    Attributes:
+        chunk (Any): The chunk.
+        metadata (dict): The document metadata emitted with the chunk.
+    """
+    __slots__ = ('chunk', 'metadata')
+
+    def __init__(self, chunk: Any, metadata: dict) -> None:
+        self.chunk = chunk
+        self.metadata = metadata
+
+    def __str__(self) -> str:
+        return str(self.chunk)
+
+    def __len__(self) -> int:
+        return len(self.chunk)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DocumentChunk):
+            return NotImplemented
+        return (self.chunk, self.metadata) == (other.chunk, other.metadata)
+
+    def __repr__(self) -> str:
+        return f'DocumentChunk(metadata={self.metadata!r}, chunk={self.chunk!r})'
+
+
+def iter_chunk_views(text: str, spans: Iterable[Any], doc_index: int = 0) -> Generator[ChunkView, Any, Any]:
+    """
+    Yields the chunks split from text by SpanTextSplitter.split_spans() as views
+    into text.
+
+    Parameters:
+        text (str): The text the spans were split from.
+        spans (Iterable[Any]): (start, end) spans of text, or strings for chunks that
+            are not a slice of text.
+        doc_index (int): Position of the document in the loader's output.
+
+    Yields:
+        Generator[ChunkView, Any, Any]: A generator yielding ChunkView objects.
+    """
+    for span in spans:
+        if isinstance(span, str):
+            yield ChunkView.unlocated(span, doc_index)
+        else:
+            yield ChunkView(text, span[0], span[1], doc_index)
+
+
+def chunk_views_enabled() -> bool:
+    """
+    Returns whether connectors should request chunk views, which is enabled by
+    setting DAT_CHUNK_OFFSETS=1.
+    """
+    return os.getenv('DAT_CHUNK_OFFSETS', '').lower() in ('1', 'true', 'yes')
+
+
+def chunk_text_and_metadata(chunk: Any, extra_metadata: Optional[dict] = None) -> Tuple[Any, dict]:
+    """
+    Returns the text of a chunk produced by BaseSplitter.load_and_chunk() and the
+    extra metadata to emit with it, including the chunk's offsets for a ChunkView
+    a near-duplicate flag for a DuplicateChunk and the document metadata of a
+    DocumentChunk. Splitters returning langchain
+    Documents (e.g. the HTML and JSON splitters) get their page_content emitted,
+    along with the JSON paths of a JSON chunk.
+    """
+    extra_metadata = extra_metadata or {}
+    if isinstance(chunk, DuplicateChunk):
+        extra_metadata = {**extra_metadata, 'chunk_near_duplicate': True}
+        chunk = chunk.chunk
+    if isinstance(chunk, DocumentChunk):
+        extra_metadata = {**extra_metadata, **chunk.metadata}
+        chunk = chunk.chunk
+    if hasattr(chunk, 'page_content'):
+        metadata = getattr(chunk, 'metadata', None) or {}
+        record_metadata = {key: metadata[key] for key in RECORD_METADATA_KEYS if key in metadata}
+        if record_metadata:
+            extra_metadata = {**extra_metadata, **record_metadata}
+        return chunk.page_content, extra_metadata
+    if not isinstance(chunk, ChunkView):
+        return chunk, extra_metadata
+    return chunk.text, {**extra_metadata, **chunk.offset_metadata()}
@@ -0,0 +1,220 @@
+"""
+Module: dedup
+
+This module contains a SimHash based filter that suppresses near-duplicate chunks,
+such as repeated headers, footers, navigation and license text, across all the
+files of a sync.
+
+Each chunk is fingerprinted with a 64 bit SimHash of its word shingles. Two chunks
+are near-duplicates when their fingerprints differ in at most max_distance bits.
+Chunks without words, e.g. made only of punctuation or rules like '-----', have no
+features to compare and are never treated as near-duplicates.
+Fingerprints are kept in an LRU index of bounded size, split into max_distance + 1
+bands so that candidates are found by exact band lookups instead of a scan.
+
+Classes:
+    NearDuplicateFilter: Drops or flags chunks that are near-duplicates of earlier ones.
+    DuplicateChunk: A chunk flagged as a near-duplicate.
+
+Functions:
+    simhash: Returns the 64 bit SimHash of a text.
+    get_near_duplicate_filter: Returns a new filter configured through the environment.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Any, Generator, Iterable, Optional
+from verified_sources.common.doc_splitters.hashing import split_words, word_hash
+
+FINGERPRINT_BITS = 64
+
+
+def simhash(text: str, shingle_size: int = 3) -> Optional[int]:
+    """
+    Returns the 64 bit SimHash of the word shingles of text.
+
+    Parameters:
+        text (str): The text to fingerprint.
+        shingle_size (int): Number of consecutive words per feature.
+
+    Returns:
+        Optional[int]: The fingerprint, None for text without words.
+    """
+    import numpy as np
+
+    words = split_words(text)
+    if not words:
+        return None
+    word_hashes = np.fromiter(map(word_hash, words), dtype=np.uint64, count=len(words))
+    # Each shingle hashes to the XOR of its (cached) word hashes, rotated by their
+    # position in the shingle, which avoids hashing every shingle string.
+    shingle_size = min(shingle_size, len(words))
+    num_shingles = len(words) - shingle_size + 1
+    features = word_hashes[:num_shingles].copy()
+    for position in range(1, shingle_size):
+        shift = np.uint64(position * 21 % FINGERPRINT_BITS)
+        shifted = word_hashes[position:position + num_shingles]
+        features ^= (shifted << shift) | (shifted >> (np.uint64(FINGERPRINT_BITS) - shift))
+    bits = np.unpackbits(features.astype('>u8').view(np.uint8).reshape(-1, 8), axis=1)
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > num_shingles
+    return int.from_bytes(np.packbits(majority).tobytes(), 'big')
+
+
+class DuplicateChunk:
+    """
+    A chunk flagged as a near-duplicate of an earlier chunk of the sync.
+
+    Attributes:
+        chunk (Any): The chunk, as produced by BaseSplitter.load_and_chunk().
+        fingerprint (int): SimHash of the chunk.
+        distance (int): Number of bits in which it differs from the earlier chunk.
+    """
+    __slots__ = ('chunk', 'fingerprint', 'distance')
+
+    def __init__(self, chunk: Any, fingerprint: int, distance: int) -> None:
+        self.chunk = chunk
+        self.fingerprint = fingerprint
+        self.distance = distance
+
+    def __str__(self) -> str:
+        return str(self.chunk)
+
+    def __repr__(self) -> str:
+        return f'DuplicateChunk(distance={self.distance}, chunk={self.chunk!r})'
+
+
+class NearDuplicateFilter:
+    """
+    Drops or flags chunks whose SimHash is within max_distance bits of a chunk seen
+    before by the same filter.
+
+    Methods:
+        filter: Filters a stream of chunks.
+        check: Fingerprints a single text and remembers it.
+    """
+
+    def __init__(self,
+        max_distance: int = 3,
+        max_entries: int = 100_000,
+        action: str = 'drop',
+        shingle_size: int = 3,
+    ) -> None:
+        """
+        Initializes a new NearDuplicateFilter object.
+
+        Parameters:
+            max_distance (int): Largest number of differing fingerprint bits for two chunks
+                to count as near-duplicates, i.e. a similarity of at least
+                1 - max_distance / 64 (default: 3).
+            max_entries (int): Number of fingerprints remembered. The least recently
+                matched ones are forgotten first (default: 100000).
+            action (str): 'drop' to suppress near-duplicates, 'flag' to pass them on wrapped
+                in DuplicateChunk (default: 'drop').
+            shingle_size (int): Number of consecutive words per SimHash feature (default: 3).
+        """
+        if action not in ('drop', 'flag'):
+            raise ValueError(f"Unknown near-duplicate action '{action}', expected 'drop' or 'flag'")
+        if not 0 <= max_distance < FINGERPRINT_BITS // 2:
+            raise ValueError(f'max_distance must be between 0 and {FINGERPRINT_BITS // 2 - 1}')
+        self.max_distance = max_distance
+        self.max_entries = max(max_entries, 1)
+        self.action = action
+        self.shingle_size = shingle_size
+        num_bands = max_distance + 1
+        band_bits = FINGERPRINT_BITS // num_bands
+        # By the pigeonhole principle, fingerprints within max_distance bits of each
+        # other agree exactly on at least one of max_distance + 1 bands.
+        self._bands = [
+            (band * band_bits, FINGERPRINT_BITS - band * band_bits if band == num_bands - 1 else band_bits)
+            for band in range(num_bands)
+        ]
+        self._fingerprints = OrderedDict()
+        self._band_index = [{} for _ in self._bands]
+        self.dropped = 0
+        self.flagged = 0
+
+    def check(self, text: str) -> Optional[DuplicateChunk]:
+        """
+        Fingerprints text and remembers it. Text without words is neither
+        fingerprinted nor remembered.
+
+        Returns:
+            Optional[DuplicateChunk]: A DuplicateChunk for text if it is a near-duplicate
+                of a remembered text, otherwise None.
+        """
+        fingerprint = simhash(text, self.shingle_size)
+        if fingerprint is None:
+            return None
+        match = self._find(fingerprint)
+        if match is not None:
+            self._fingerprints.move_to_end(match)
+            return DuplicateChunk(text, fingerprint, (match ^ fingerprint).bit_count())
+        self._add(fingerprint)
+        return None
+
+    def filter(self, chunks: Iterable[Any]) -> Generator[Any, Any, Any]:
+        """
+        Filters a stream of chunks.
+
+        Parameters:
+            chunks (Iterable[Any]): Chunks as produced by BaseSplitter.load_and_chunk().
+
+        Yields:
+            Generator[Any, Any, Any]: The chunks that are not near-duplicates, and with
+                action 'flag' the near-duplicates wrapped in DuplicateChunk.
+        """
+        for chunk in chunks:
+            text = chunk.page_content if hasattr(chunk, 'page_content') else str(chunk)
+            duplicate = self.check(text)
+            if duplicate is None:
+                yield chunk
+            elif self.action == 'flag':
+                self.flagged += 1
+                duplicate.chunk = chunk
+                yield duplicate
+            else:
+                self.dropped += 1
+
+    def _band_keys(self, fingerprint: int):
+        for shift, width in self._bands:
+            yield (fingerprint >> shift) & ((1 << width) - 1)
+
+    def _find(self, fingerprint: int) -> Optional[int]:
+        if fingerprint in self._fingerprints:
+            return fingerprint
+        for band_index, key in zip(self._band_index, self._band_keys(fingerprint)):
+            for candidate in band_index.get(key, ()):
+                if (candidate ^ fingerprint).bit_count() <= self.max_distance:
+                    return candidate
+        return None
+
+    def _add(self, fingerprint: int) -> None:
+        self._fingerprints[fingerprint] = None
+        for band_index, key in zip(self._band_index, self._band_keys(fingerprint)):
+            band_index.setdefault(key, set()).add(fingerprint)
+        while len(self._fingerprints) > self.max_entries:
+            evicted, _ = self._fingerprints.popitem(last=False)
+            for band_index, key in zip(self._band_index, self._band_keys(evicted)):
+                bucket = band_index[key]
+                bucket.discard(evicted)
+                if not bucket:
+                    del band_index[key]
+
+
+def get_near_duplicate_filter() -> Optional[NearDuplicateFilter]:
+    """
+    Returns a new NearDuplicateFilter for one sync, or None when near-duplicate
+    suppression is not configured.
+
+    Suppression is enabled by setting DAT_CHUNK_DEDUP to 'drop' or 'flag';
+    DAT_CHUNK_DEDUP_MAX_DISTANCE and DAT_CHUNK_DEDUP_MAX_ENTRIES override the
+    threshold and the size of the index.
+    """
+    action = os.getenv('DAT_CHUNK_DEDUP')
+    if not action:
+        return None
+    return NearDuplicateFilter(
+        max_distance=int(os.getenv('DAT_CHUNK_DEDUP_MAX_DISTANCE', 3)),
+        max_entries=int(os.getenv('DAT_CHUNK_DEDUP_MAX_ENTRIES', 100_000)),
+        action=action,
+    )
@@ -1,34 +1,22 @@
-from typing import Any, Optional, Union
+import os
+import json
+import logging
+import hashlib
+import importlib
+import threading
+from collections import OrderedDict
+from typing import Any, List, NamedTuple, Optional, Union
 from enum import Enum
 from pydantic import BaseModel
-from langchain_text_splitters import (
-    HTMLHeaderTextSplitter,
-    # HTMLSectionSplitter,
-    CharacterTextSplitter,
-    RecursiveCharacterTextSplitter,
-    MarkdownHeaderTextSplitter,
-    MarkdownTextSplitter,
-    RecursiveJsonSplitter,
-    # SemanticChunker,
+from verified_sources.common.doc_splitters.base_splitter import BaseSplitter
+from verified_sources.common.doc_splitters.cache import ChunkCache
+from verified_sources.common.doc_splitters.dedup import NearDuplicateFilter
+from verified_sources.common.doc_splitters.instrumentation import InstrumentationCallback, get_default_instrumentation
+from verified_sources.common.doc_splitters.loader_adapters import (
+    LoaderAdapter, LoaderProtocol, detect_loader_protocol, get_loader_adapter
 )
-from langchain_community.document_loaders import (
-    PyPDFLoader,
-    OnlinePDFLoader,
-    PDFMinerLoader,
-    TextLoader,
-    S3FileLoader,
-    UnstructuredHTMLLoader,
-    UnstructuredURLLoader,
-    CSVLoader,
-    GoogleDriveLoader,
-    UnstructuredURLLoader,
-    S3DirectoryLoader,
-    UnstructuredMarkdownLoader,
 
-)
-from llama_index.readers.s3 import S3Reader
-from llama_index.readers.web import WholeSiteReader, BeautifulSoupWebReader
-from verified_sources.common.doc_splitters.base_splitter import BaseSplitter
+logger = logging.getLogger(__name__)
 
 
 class DocLoaderType(Enum):
@@ -45,54 +33,285 @@ class DocLoaderType(Enum):
     S3_DIR_LOADER = 'S3_DIR_LOADER'
     MARKDOWN = 'MARKDOWN_LOADER'
     BEAUTIFUL_SOUP = 'BEAUTIFUL_SOUP'
+    MMAP_TEXT = 'MMAP_TEXT'
+    PYPDF_PARALLEL = 'PYPDF_PARALLEL'
+    PDF_LAZY = 'PDF_LAZY'
+    CSV_COLUMNAR = 'CSV_COLUMNAR'
+    PARQUET = 'PARQUET'
+    JSONL = 'JSONL'
+    ARCHIVE = 'ARCHIVE'
+    XLSX = 'XLSX'
 
 class TextSplitterType(Enum):
     SPLIT_BY_HTML_HEADER = 'SPLIT_BY_HTML_HEADER'
+    SPLIT_BY_HTML_SECTION = 'SPLIT_BY_HTML_SECTION'
     SPLIT_BY_CHARACTER = 'SPLIT_BY_CHARACTER'
     SPLIT_CODE = 'SPLIT_CODE'
     SPLIT_BY_MARKDOWN = 'SPLIT_BY_MARKDOWN'
     SPLIT_JSON_RECURSIVELY = 'SPLIT_JSON_RECURSIVELY'
     SPLIT_BY_CHARACTER_RECURSIVELY = 'SPLIT_BY_CHARACTER_RECURSIVELY'
     SPLIT_BY_TOKENS = 'SPLIT_BY_TOKENS'
+    SPLIT_SEMANTICALLY = 'SPLIT_SEMANTICALLY'
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return [type(value).__qualname__, value.value]
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def config_hash(config: dict) -> Optional[str]:
+    """
+    Returns a stable hash of a loader or splitter configuration, or None when the
+    configuration holds values such as functions that have no stable identity.
+    Those must not be keyed on their repr, which embeds a memory address that can
+    be reused by another object once they are garbage collected.
+    """
+    try:
+        dumped = json.dumps(config, sort_keys=True, default=_json_default)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(dumped.encode('utf-8')).hexdigest()
+
+
+# Window size used by the file streams for streaming splits, in bytes of the file
+# read by their native loaders (MMAP_TEXT); windows are cut at line boundaries.
+DEFAULT_STREAM_WINDOW_SIZE = 1024 * 1024
+
+
+def get_pdf_loader_key() -> DocLoaderType:
+    """
+    Returns the loader the PDF streams use. PYPDF unless DAT_PDF_LOADER opts in to
+    PDF_LAZY, which reads one page at a time so memory stays flat for very large
+    PDFs, or PYPDF_PARALLEL, which extracts the pages of large PDFs in a small
+    process pool. Unknown values are ignored with a warning.
+    """
+    name = os.getenv('DAT_PDF_LOADER')
+    if not name:
+        return DocLoaderType.PYPDF
+    allowed = (DocLoaderType.PYPDF, DocLoaderType.PDF_LAZY, DocLoaderType.PYPDF_PARALLEL)
+    for loader_key in allowed:
+        if loader_key.value == name.upper():
+            return loader_key
+    logger.warning(f"Ignoring unknown DAT_PDF_LOADER '{name}', expected one of {[key.value for key in allowed]}")
+    return DocLoaderType.PYPDF
+
+
+class SplitterCacheInfo(NamedTuple):
+    """
+    Statistics of the splitter instance cache, in the spirit of functools' CacheInfo.
+    """
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
 
 
 class DocumentSplitterFactory:
     """
     A factory class for creating document splitters using different loaders and splitters based on configuration keys.
+
+    Splitter instances are stateless once configured, so create() keeps a bounded LRU
+    cache of them keyed by (splitter_key, normalized splitter_config); only the loader,
+    which is bound to a specific file, is built on every call.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, splitter_cache_size: int = 32) -> None:
         """
         Initializes a new DocumentSplitterFactory object.
+
+        Parameters:
+            splitter_cache_size (int): Maximum number of configured splitter instances
+                to keep around. 0 disables the cache.
         """
         self._splitters = {}
         self._loaders = {}
+        self._loader_protocols = {}
+        self._splitter_cache = OrderedDict()
+        self._splitter_cache_size = splitter_cache_size
+        self._splitter_cache_lock = threading.Lock()
+        self._splitter_cache_hits = 0
+        self._splitter_cache_misses = 0
+        # Guards the replacement of lazy import references in the registries.
+        self._registry_lock = threading.RLock()
+        self._instrumentation: List[InstrumentationCallback] = []
+
+    def add_instrumentation(self, callback: InstrumentationCallback) -> None:
+        """
+        Registers an instrumentation callback on every splitter created from now on,
+        so it receives the per-stage statistics of every stream using this factory.
+
+        Parameters:
+            callback (InstrumentationCallback): The callback, see BaseSplitter.register_instrumentation().
+        """
+        self._instrumentation.append(callback)
 
-    def register_loader(self, key: Enum, loader_cls: Any) -> None:
+    def remove_instrumentation(self, callback: InstrumentationCallback) -> None:
+        """
+        Stops registering callback on the splitters created from now on.
+
+        Parameters:
+            callback (InstrumentationCallback): A callback passed to add_instrumentation().
+        """
+        self._instrumentation.remove(callback)
+
+    def register_loader(self,
+        key: Enum,
+        loader_cls: Union[str, Any],
+        protocol: Optional[LoaderProtocol] = None
+    ) -> None:
         """
         Registers a document loader class with a specified key.
 
         Parameters:
             key (str): The key to identify the loader.
-            loader_cls (Any): The loader class to register.
+            loader_cls (Union[str, Any]): The loader class to register, or a lazy
+                import reference of the form 'package.module:ClassName' which is
+                only imported on the first create() for this key.
+            protocol (Optional[LoaderProtocol]): The protocol the loader speaks. If not
+                given it is detected from loader_cls, once, when the class is available.
         """
+        if protocol is None and not isinstance(loader_cls, str):
+            protocol = detect_loader_protocol(loader_cls)
         self._loaders[key.value] = loader_cls
+        self._loader_protocols[key.value] = protocol
 
-    def register_splitter(self, key: Enum, splitter_cls: Any) -> None:
+    def register_splitter(self, key: Enum, splitter_cls: Union[str, Any]) -> None:
         """
         Registers a document splitter class with a specified key.
 
         Parameters:
             key (str): The key to identify the splitter.
-            splitter_cls (Any): The splitter class to register.
+            splitter_cls (Union[str, Any]): The splitter class to register, or a lazy
+                import reference of the form 'package.module:ClassName'.
         """
         self._splitters[key.value] = splitter_cls
 
+    def get_loader_cls(self, key: Union[str, Enum]) -> Optional[Any]:
+        """
+        Returns the loader class registered under key, importing it if it was
+        registered lazily.
+
+        Parameters:
+            key (Union[str, Enum]): The key or enum representing the registered loader.
+
+        Returns:
+            Optional[Any]: The loader class, or None if nothing is registered for key.
+        """
+        return self._resolve(self._loaders, key)
+
+    def get_splitter_cls(self, key: Union[str, Enum]) -> Optional[Any]:
+        """
+        Returns the splitter class registered under key, importing it if it was
+        registered lazily.
+
+        Parameters:
+            key (Union[str, Enum]): The key or enum representing the registered splitter.
+
+        Returns:
+            Optional[Any]: The splitter class, or None if nothing is registered for key.
+        """
+        return self._resolve(self._splitters, key)
+
+    def get_loader_adapter(self, key: Union[str, Enum]) -> Optional[LoaderAdapter]:
+        """
+        Returns the adapter for the protocol of the loader registered under key.
+
+        Parameters:
+            key (Union[str, Enum]): The key or enum representing the registered loader.
+
+        Returns:
+            Optional[LoaderAdapter]: The adapter, or None if the protocol is unknown.
+        """
+        if isinstance(key, Enum):
+            key = key.value
+        protocol = self._loader_protocols.get(key)
+        if protocol is None:
+            loader_cls = self.get_loader_cls(key)
+            if loader_cls is None:
+                return None
+            protocol = self._loader_protocols[key] = detect_loader_protocol(loader_cls)
+        return get_loader_adapter(protocol) if protocol else None
+
+    def _resolve(self, registry: dict, key: Union[str, Enum]) -> Optional[Any]:
+        """
+        Looks up key in registry and replaces a lazy import reference with the
+        imported class, so the import only happens once per key.
+        """
+        if isinstance(key, Enum):
+            key = key.value
+        entry = registry.get(key)
+        if not isinstance(entry, str):
+            return entry
+        with self._registry_lock:
+            entry = registry.get(key)
+            if isinstance(entry, str):
+                module_name, _, attr_name = entry.partition(':')
+                entry = getattr(importlib.import_module(module_name), attr_name)
+                registry[key] = entry
+        return entry
+
+    def splitter_cache_info(self) -> SplitterCacheInfo:
+        """
+        Returns hit/miss statistics for the splitter instance cache.
+        """
+        with self._splitter_cache_lock:
+            return SplitterCacheInfo(
+                hits=self._splitter_cache_hits,
+                misses=self._splitter_cache_misses,
+                maxsize=self._splitter_cache_size,
+                currsize=len(self._splitter_cache),
+            )
+
+    def clear_splitter_cache(self) -> None:
+        """
+        Drops all cached splitter instances and resets the statistics.
+        """
+        with self._splitter_cache_lock:
+            self._splitter_cache.clear()
+            self._splitter_cache_hits = 0
+            self._splitter_cache_misses = 0
+
+    def _get_splitter(self, splitter_key: str, splitter_config: dict) -> Any:
+        """
+        Returns a splitter configured with splitter_config, reusing a cached instance
+        when one was already built for an identical configuration. Configurations
+        without a stable hash are never cached.
+        """
+        splitter_config_hash = config_hash(splitter_config) if self._splitter_cache_size else None
+        if splitter_config_hash is None:
+            return self.get_splitter_cls(splitter_key)(**splitter_config)
+
+        cache_key = (splitter_key, splitter_config_hash)
+        with self._splitter_cache_lock:
+            _splitter = self._splitter_cache.get(cache_key)
+            if _splitter is not None:
+                self._splitter_cache.move_to_end(cache_key)
+                self._splitter_cache_hits += 1
+                return _splitter
+            self._splitter_cache_misses += 1
+
+        _splitter = self.get_splitter_cls(splitter_key)(**splitter_config)
+        with self._splitter_cache_lock:
+            self._splitter_cache[cache_key] = _splitter
+            while len(self._splitter_cache) > self._splitter_cache_size:
+                self._splitter_cache.popitem(last=False)
+        return _splitter
+
     def create(self,
         loader_key: Union[str, Enum],
         splitter_key: Union[str, Enum],
         loader_config: Union[dict, BaseModel] = None,
-        splitter_config: Union[dict, BaseModel] = None
+        splitter_config: Union[dict, BaseModel] = None,
+        stream_window_size: Optional[int] = None,
+        chunk_cache: Optional[ChunkCache] = None,
+        chunk_views: bool = False,
+        near_duplicate_filter: Optional[NearDuplicateFilter] = None
     ) -> BaseSplitter:
         """
         Creates a new BaseSplitter instance for document splitting.
@@ -102,6 +321,17 @@ class DocumentSplitterFactory:
             splitter_key (Union[str, Enum]): The key or enum representing the registered splitter.
             loader_config (Union[dict, BaseModel], optional): Configuration parameters for the loader (default: None).
             splitter_config (Union[dict, BaseModel], optional): Configuration parameters for the splitter (default: None).
+            stream_window_size (Optional[int], optional): Enables streaming splits with windows of about
+                this size where the loader and splitter support it: bytes of the file for native loaders
+                such as MMAP_TEXT, characters for langchain's TextLoader (default: None).
+            chunk_cache (Optional[ChunkCache], optional): Cache for the documents and chunks produced
+                from loader_config['file_path']. Ignored for loaders without a local file and for
+                configurations holding values without a stable hash, such as functions (default: None).
+            chunk_views (bool, optional): Makes load_and_chunk() yield ChunkView objects carrying each
+                chunk's offsets in its document instead of strings. Only the character and recursive
+                character splitters produce offsets; other splitters yield plain chunks (default: False).
+            near_duplicate_filter (Optional[NearDuplicateFilter], optional): Filter dropping or flagging
+                chunks that are near-duplicates of chunks seen before (default: None).
 
         Returns:
             BaseSplitter: An instance of BaseSplitter configured with the specified loader and splitter.
@@ -121,43 +351,71 @@ class DocumentSplitterFactory:
         if isinstance(splitter_config, BaseModel):
             splitter_config = splitter_config.model_dump()
 
-        _loader = self._loaders.get(loader_key)(**loader_config)
-        _splitter = self._splitters.get(splitter_key)(**splitter_config)
-        doc_splitter = BaseSplitter()
-        doc_splitter.register_document_loader(_loader)
+        _loader = self.get_loader_cls(loader_key)(**loader_config)
+        _splitter = self._get_splitter(splitter_key, splitter_config)
+        doc_splitter = BaseSplitter(stream_window_size=stream_window_size, chunk_views=chunk_views)
+        doc_splitter.register_document_loader(_loader, adapter=self.get_loader_adapter(loader_key))
         doc_splitter.register_document_splitter(_splitter)
+        if near_duplicate_filter is not None:
+            doc_splitter.register_near_duplicate_filter(near_duplicate_filter)
+        for callback in self._instrumentation:
+            doc_splitter.register_instrumentation(callback)
+
+        file_path = loader_config.get('file_path')
+        loader_config_hash = config_hash({k: v for k, v in loader_config.items() if k != 'file_path'})
+        splitter_config_hash = config_hash(splitter_config)
+        if (chunk_cache is not None and file_path and os.path.isfile(file_path)
+                and loader_config_hash is not None and splitter_config_hash is not None):
+            content_hash = chunk_cache.hash_file(file_path)
+            loader_id = f'{loader_key}:{loader_config_hash}'
+            doc_splitter.register_chunk_cache(
+                chunk_cache,
+                documents_key=chunk_cache.documents_key(content_hash, loader_id),
+                chunks_key=chunk_cache.chunks_key(content_hash, loader_id, splitter_key, splitter_config_hash),
+            )
         return doc_splitter
 
 
 
 doc_splitter_factory = DocumentSplitterFactory()
+for _callback in get_default_instrumentation():
+    doc_splitter_factory.add_instrumentation(_callback)
 
 # Register doc loaders
-doc_splitter_factory.register_loader(DocLoaderType.PYPDF, PyPDFLoader)
-doc_splitter_factory.register_loader(DocLoaderType.ONLINE_PDF, OnlinePDFLoader)
-doc_splitter_factory.register_loader(DocLoaderType.PDF_MINER, PDFMinerLoader)
-doc_splitter_factory.register_loader(DocLoaderType.TEXT, TextLoader)
-doc_splitter_factory.register_loader(DocLoaderType.S3, S3FileLoader)
-doc_splitter_factory.register_loader(DocLoaderType.HTML, UnstructuredHTMLLoader)
-doc_splitter_factory.register_loader(DocLoaderType.URL, UnstructuredURLLoader)
-doc_splitter_factory.register_loader(DocLoaderType.CSV, CSVLoader)
-doc_splitter_factory.register_loader(DocLoaderType.GOOGLE_DRIVE, GoogleDriveLoader)
-doc_splitter_factory.register_loader(DocLoaderType.WHOLE_SITE_READER, WholeSiteReader)
-doc_splitter_factory.register_loader(DocLoaderType.S3_DIR_LOADER, S3Reader)
-doc_splitter_factory.register_loader(DocLoaderType.MARKDOWN, UnstructuredMarkdownLoader)
-doc_splitter_factory.register_loader(DocLoaderType.BEAUTIFUL_SOUP, BeautifulSoupWebReader)
+# Loaders and splitters are registered as lazy import references so that importing
+# this module does not pull in langchain_community / llama_index until a stream
+# actually creates a splitter for that key.
+doc_splitter_factory.register_loader(DocLoaderType.PYPDF, 'langchain_community.document_loaders:PyPDFLoader', LoaderProtocol.LANGCHAIN)
+doc_splitter_factory.register_loader(DocLoaderType.ONLINE_PDF, 'langchain_community.document_loaders:OnlinePDFLoader', LoaderProtocol.LANGCHAIN)
+doc_splitter_factory.register_loader(DocLoaderType.PDF_MINER, 'langchain_community.document_loaders:PDFMinerLoader', LoaderProtocol.LANGCHAIN)
+doc_splitter_factory.register_loader(DocLoaderType.TEXT, 'langchain_community.document_loaders:TextLoader', LoaderProtocol.LANGCHAIN)
+doc_splitter_factory.register_loader(DocLoaderType.S3, 'langchain_community.document_loaders:S3FileLoader', LoaderProtocol.LANGCHAIN)
+doc_splitter_factory.register_loader(DocLoaderType.HTML, 'langchain_community.document_loaders:UnstructuredHTMLLoader', LoaderProtocol.LANGCHAIN)
+doc_splitter_factory.register_loader(DocLoaderType.URL, 'langchain_community.document_loaders:UnstructuredURLLoader', LoaderProtocol.LANGCHAIN)
+doc_splitter_factory.register_loader(DocLoaderType.CSV, 'langchain_community.document_loaders:CSVLoader', LoaderProtocol.LANGCHAIN)
+doc_splitter_factory.register_loader(DocLoaderType.GOOGLE_DRIVE, 'langchain_community.document_loaders:GoogleDriveLoader', LoaderProtocol.LANGCHAIN)
+doc_splitter_factory.register_loader(DocLoaderType.WHOLE_SITE_READER, 'llama_index.readers.web:WholeSiteReader', LoaderProtocol.LLAMA_INDEX)
+doc_splitter_factory.register_loader(DocLoaderType.S3_DIR_LOADER, 'llama_index.readers.s3:S3Reader', LoaderProtocol.LLAMA_INDEX)
+doc_splitter_factory.register_loader(DocLoaderType.MARKDOWN, 'langchain_community.document_loaders:UnstructuredMarkdownLoader', LoaderProtocol.LANGCHAIN)
+doc_splitter_factory.register_loader(DocLoaderType.BEAUTIFUL_SOUP, 'llama_index.readers.web:BeautifulSoupWebReader', LoaderProtocol.LLAMA_INDEX)
+doc_splitter_factory.register_loader(DocLoaderType.MMAP_TEXT, 'verified_sources.common.doc_splitters.loaders.text:MmapTextLoader', LoaderProtocol.NATIVE)
+doc_splitter_factory.register_loader(DocLoaderType.PYPDF_PARALLEL, 'verified_sources.common.doc_splitters.loaders.pdf:ParallelPyPDFLoader', LoaderProtocol.NATIVE)
+doc_splitter_factory.register_loader(DocLoaderType.PDF_LAZY, 'verified_sources.common.doc_splitters.loaders.pdf:LazyPDFLoader', LoaderProtocol.NATIVE)
+doc_splitter_factory.register_loader(DocLoaderType.CSV_COLUMNAR, 'verified_sources.common.doc_splitters.loaders.tabular:ColumnarCSVLoader', LoaderProtocol.NATIVE)
+doc_splitter_factory.register_loader(DocLoaderType.PARQUET, 'verified_sources.common.doc_splitters.loaders.tabular:ParquetLoader', LoaderProtocol.NATIVE)
+doc_splitter_factory.register_loader(DocLoaderType.JSONL, 'verified_sources.common.doc_splitters.loaders.jsonl:JsonLinesLoader', LoaderProtocol.NATIVE)
+doc_splitter_factory.register_loader(DocLoaderType.ARCHIVE, 'verified_sources.common.doc_splitters.loaders.archive:ArchiveLoader', LoaderProtocol.NATIVE)
+doc_splitter_factory.register_loader(DocLoaderType.XLSX, 'verified_sources.common.doc_splitters.loaders.tabular:XlsxLoader', LoaderProtocol.NATIVE)
 
 
 
 # Register text splitters
-doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_BY_HTML_HEADER, HTMLHeaderTextSplitter)
-# doc_splitter_factory.register_splitter('split_by_html_section', HTMLSectionSplitter)
-doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_BY_CHARACTER, CharacterTextSplitter)
-doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_CODE, RecursiveCharacterTextSplitter)
-doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_BY_MARKDOWN, MarkdownTextSplitter)
-doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_JSON_RECURSIVELY, RecursiveJsonSplitter)
-doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY, RecursiveCharacterTextSplitter)
-# doc_splitter_factory.register_splitter('semantic_chunking', SemanticChunker)
-doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_BY_TOKENS, RecursiveCharacterTextSplitter)
-
-
+doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_BY_HTML_HEADER, 'langchain_text_splitters:HTMLHeaderTextSplitter')
+doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_BY_HTML_SECTION, 'verified_sources.common.doc_splitters.splitters.html:HTMLSectionStreamSplitter')
+doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_BY_CHARACTER, 'langchain_text_splitters:CharacterTextSplitter')
+doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_CODE, 'langchain_text_splitters:RecursiveCharacterTextSplitter')
+doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_BY_MARKDOWN, 'langchain_text_splitters:MarkdownTextSplitter')
+doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_JSON_RECURSIVELY, 'verified_sources.common.doc_splitters.splitters.json_stream:StreamingJsonSplitter')
+doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY, 'langchain_text_splitters:RecursiveCharacterTextSplitter')
+doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_BY_TOKENS, 'verified_sources.common.doc_splitters.splitters.tokens:RecursiveTokenTextSplitter')
+doc_splitter_factory.register_splitter(TextSplitterType.SPLIT_SEMANTICALLY, 'verified_sources.common.doc_splitters.splitters.semantic:SemanticTextSplitter')
@@ -0,0 +1,33 @@
+"""
+Module: hashing
+
+This module contains the word hashing shared by the SimHash near-duplicate filter
+and the HashingEmbedder of the semantic splitter. Hashes are computed with
+blake2b rather than hash(), so they are the same in every process.
+
+Functions:
+    split_words: Returns the lowercased words of a text.
+    word_hash: Returns the 64 bit hash of a word.
+"""
+
+import re
+import hashlib
+from functools import lru_cache
+from typing import List
+
+_WORD = re.compile(r'\w+')
+
+
+def split_words(text: str) -> List[str]:
+    """
+    Returns the lowercased words of text, as hashed by word_hash().
+    """
+    return _WORD.findall(text.lower())
+
+
+@lru_cache(maxsize=1 << 16)
+def word_hash(word: str) -> int:
+    """
+    Returns the 64 bit hash of a word, cached for the most frequent words.
+    """
+    return int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), 'big')
@@ -0,0 +1,274 @@
+"""
+Module: instrumentation
+
+This module contains per-stage instrumentation for BaseSplitter. A run of load(),
+load_and_chunk(), split_text() or split_many() is broken down into stages:
+
+    load:  time spent in the loader, bytes of the source and documents produced.
+    split: time spent in the splitter, bytes of text split and chunks produced.
+    emit:  time spent by the caller between two chunks, e.g. emitting records.
+    other: everything else, such as cache lookups and near-duplicate filtering.
+
+Stages are timed with a single clock that is switched between them, so the times
+of nested stages (the splitter pulling documents from the loader) are exclusive
+and add up to the duration of the run. Once a run finishes, the statistics of its
+stages are handed to the registered callbacks. Nothing is timed when no callback
+is registered.
+
+Classes:
+    StageStats: Time and volumes of one stage of a run.
+    RunInstrumentation: Times the stages of one run.
+    StageStatsCollector: Callback summing up the statistics of all runs by stage.
+    LoggingInstrumentation: Callback logging the statistics of every run.
+
+Functions:
+    get_default_instrumentation: Returns the callbacks configured through the environment.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Generator, Iterable, List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+STAGE_LOAD = 'load'
+STAGE_SPLIT = 'split'
+STAGE_EMIT = 'emit'
+STAGE_OTHER = 'other'
+STAGES = (STAGE_LOAD, STAGE_SPLIT, STAGE_EMIT, STAGE_OTHER)
+
+
+class StageStats(NamedTuple):
+    """
+    Time and volumes of one stage of a run, in the spirit of the cache info tuples.
+    """
+    stage: str
+    source: Optional[str]
+    wall_time: float
+    cpu_time: float
+    bytes_in: int
+    documents_out: int
+    chunks_out: int
+
+
+InstrumentationCallback = Callable[[List[StageStats]], None]
+
+
+class RunInstrumentation:
+    """
+    Times the stages of one run. Iterables are wrapped with timed(), which charges
+    the time spent producing each item to a stage; time between the items handed
+    to the caller is charged to 'emit' by emitted(). CPU time is the thread's, so
+    runs in concurrent threads do not count each other's work.
+    """
+
+    def __init__(self, callbacks: Sequence[InstrumentationCallback], source: Optional[str] = None) -> None:
+        """
+        Initializes a new RunInstrumentation object and starts its clock in 'other'.
+
+        Parameters:
+            callbacks (Sequence[InstrumentationCallback]): Called with the statistics of
+                the stages once the run finishes.
+            source (Optional[str]): The source of the run, usually a file path or URL.
+        """
+        self.callbacks = callbacks
+        self.source = source
+        self.wall_time = dict.fromkeys(STAGES, 0.0)
+        self.cpu_time = dict.fromkeys(STAGES, 0.0)
+        self.bytes_in = dict.fromkeys(STAGES, 0)
+        self.documents_out = dict.fromkeys(STAGES, 0)
+        self.chunks_out = dict.fromkeys(STAGES, 0)
+        self._stage = STAGE_OTHER
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+
+    def switch(self, stage: Optional[str]) -> Optional[str]:
+        """
+        Charges the time since the last switch to the current stage and makes stage
+        the current one. Returns the previous stage.
+        """
+        wall, cpu = time.perf_counter(), time.thread_time()
+        previous = self._stage
+        if previous is not None:
+            self.wall_time[previous] += wall - self._wall
+            self.cpu_time[previous] += cpu - self._cpu
+        self._stage, self._wall, self._cpu = stage, wall, cpu
+        return previous
+
+    def timed(self, items: Iterable[Any], stage: str, counts: Optional[str] = 'chunks_out') -> Generator[Any, Any, Any]:
+        """
+        Yields the items of items, charging the time spent producing them to stage
+        and counting them in its documents_out or chunks_out, unless counts is None.
+        """
+        iterator = iter(items)
+        count = getattr(self, counts) if counts else None
+        while True:
+            previous = self.switch(stage)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.switch(previous)
+            if count is not None:
+                count[stage] += 1
+            yield item
+
+    def count_text(self, stage: str, text: Any) -> None:
+        """
+        Adds the UTF-8 size of text to the bytes_in of stage.
+        """
+        if isinstance(text, str):
+            self.bytes_in[stage] += len(text) if text.isascii() else len(text.encode('utf-8', 'surrogatepass'))
+
+    def split_documents(self, split_text: Callable[[str], Iterable[Any]], text: str) -> Generator[Any, Any, Any]:
+        """
+        Yields the chunks of text split with split_text, charged to 'split'.
+        """
+        self.count_text(STAGE_SPLIT, text)
+        # Most splitters do all the work in split_text() and return a list.
+        previous = self.switch(STAGE_SPLIT)
+        try:
+            chunks = split_text(text)
+        finally:
+            self.switch(previous)
+        yield from self.timed(chunks, STAGE_SPLIT)
+
+    def text_windows(self, open_windows: Callable[[], Iterable[str]]) -> Callable[[], Iterable[str]]:
+        """
+        Wraps the open_windows callable of a streaming split, so reading the windows
+        is charged to 'load' and their text counts as the bytes_in of 'split'. Text
+        read more than once by the splitter is counted every time.
+        """
+        def open_timed_windows() -> Generator[str, Any, Any]:
+            for window in self.timed(open_windows(), STAGE_LOAD, counts=None):
+                self.count_text(STAGE_SPLIT, window)
+                yield window
+        return open_timed_windows
+
+    def emitted(self, items: Iterable[Any], counts: str = 'chunks_out') -> Generator[Any, Any, Any]:
+        """
+        Yields the items of items to the caller, charging the time until the caller
+        asks for the next one to 'emit', and reports the run once items are exhausted
+        or the caller stops iterating.
+        """
+        count = getattr(self, counts)
+        try:
+            for item in items:
+                count[STAGE_EMIT] += 1
+                previous = self.switch(STAGE_EMIT)
+                yield item
+                self.switch(previous)
+        finally:
+            self.finish()
+
+    def finish(self) -> None:
+        """
+        Stops the clock and hands the statistics of the stages to the callbacks.
+        A callback raising an exception is logged and does not fail the run.
+        """
+        if self._stage is None:
+            return
+        self.switch(None)
+        stats = [
+            StageStats(stage, self.source, self.wall_time[stage], self.cpu_time[stage],
+                       self.bytes_in[stage], self.documents_out[stage], self.chunks_out[stage])
+            for stage in STAGES
+        ]
+        for callback in self.callbacks:
+            try:
+                callback(stats)
+            except Exception:
+                logger.exception(f'Instrumentation callback {callback!r} failed')
+
+
+class StageStatsCollector:
+    """
+    Instrumentation callback summing up the statistics of all the runs it is
+    registered for, by stage. Safe to share between threads.
+
+    Methods:
+        totals: Returns the summed statistics of every stage.
+        clear: Forgets all the statistics.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new StageStatsCollector object.
+        """
+        self._lock = threading.Lock()
+        self._totals: Dict[str, List[float]] = {}
+        self.runs = 0
+
+    def __call__(self, stats: List[StageStats]) -> None:
+        with self._lock:
+            self.runs += 1
+            for stage_stats in stats:
+                totals = self._totals.setdefault(stage_stats.stage, [0.0, 0.0, 0, 0, 0])
+                for index, value in enumerate(stage_stats[2:]):
+                    totals[index] += value
+
+    def totals(self) -> Dict[str, StageStats]:
+        """
+        Returns the summed statistics of every stage, with source set to None.
+
+        Returns:
+            Dict[str, StageStats]: The statistics by stage name.
+        """
+        with self._lock:
+            return {stage: StageStats(stage, None, *totals) for stage, totals in self._totals.items()}
+
+    def clear(self) -> None:
+        """
+        Forgets all the statistics.
+        """
+        with self._lock:
+            self._totals.clear()
+            self.runs = 0
+
+
+class LoggingInstrumentation:
+    """
+    Instrumentation callback logging one line per run with the wall and CPU time of
+    every stage, the source size, and the documents and chunks produced.
+    """
+
+    def __init__(self, level: int = logging.INFO) -> None:
+        """
+        Initializes a new LoggingInstrumentation object.
+
+        Parameters:
+            level (int): Logging level of the lines.
+        """
+        self.level = level
+
+    def __call__(self, stats: List[StageStats]) -> None:
+        if not logger.isEnabledFor(self.level):
+            return
+        by_stage = {stage_stats.stage: stage_stats for stage_stats in stats}
+        times = ', '.join(
+            f'{stage} {stage_stats.wall_time:.3f}s ({stage_stats.cpu_time:.3f}s cpu)'
+            for stage, stage_stats in by_stage.items())
+        load, split = by_stage[STAGE_LOAD], by_stage[STAGE_SPLIT]
+        logger.log(self.level,
+                   f'{stats[0].source}: {times}; {load.bytes_in} bytes in, '
+                   f'{load.documents_out} documents, {split.chunks_out} chunks')
+
+
+def get_default_instrumentation() -> List[InstrumentationCallback]:
+    """
+    Returns the instrumentation callbacks registered on the factory at import time.
+
+    Setting DAT_SPLITTER_INSTRUMENTATION to 'log' logs the statistics of every run
+    of every stream that uses doc_splitter_factory. Other values are ignored with a
+    warning, so a typo does not break importing the factory.
+    """
+    mode = os.getenv('DAT_SPLITTER_INSTRUMENTATION')
+    if not mode:
+        return []
+    if mode != 'log':
+        logger.warning(f"Ignoring unknown DAT_SPLITTER_INSTRUMENTATION '{mode}', expected 'log'")
+        return []
+    return [LoggingInstrumentation()]
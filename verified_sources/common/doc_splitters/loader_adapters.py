@@ -0,0 +1,166 @@
+"""
+Module: loader_adapters
+
+This module contains the adapters BaseSplitter uses to pull documents out of the
+different families of document loaders and convert them to RawDocument objects.
+
+The adapter for a loader is chosen once, when the loader is registered with the
+DocumentSplitterFactory, so no per-document protocol probing is needed.
+
+Classes:
+    LoaderProtocol: The families of loaders known to the factory.
+    LoaderAdapter: Base class for loader adapters.
+    LangchainLoaderAdapter: Adapter for langchain document loaders.
+    LlamaIndexLoaderAdapter: Adapter for llama_index readers.
+    NativeLoaderAdapter: Adapter for the loaders in verified_sources.common.doc_splitters.loaders.
+"""
+
+from enum import Enum
+from typing import Any, Generator, Optional
+from verified_sources.common.doc_splitters import RawDocument
+from verified_sources.common.doc_splitters.splitters.streaming import TextWindows, iter_file_windows
+
+
+class LoaderProtocol(Enum):
+    LANGCHAIN = 'LANGCHAIN'
+    LLAMA_INDEX = 'LLAMA_INDEX'
+    NATIVE = 'NATIVE'
+
+
+class LoaderAdapter:
+    """
+    Pulls documents out of a loader and converts each one with a single, fixed
+    conversion function.
+
+    Attributes:
+        lazy_method (str): Name of the loader's lazy loading method.
+        eager_method (str): Name of the loader's list returning loading method.
+        base_cls_name (str): Name of the interface class whose lazy_method only
+            raises NotImplementedError.
+    """
+    lazy_method: str
+    eager_method: str
+    base_cls_name: str
+
+    def __init__(self) -> None:
+        self._load_methods = {}
+
+    def convert(self, doc: Any) -> RawDocument:
+        """
+        Converts a single loader specific document to a RawDocument.
+        """
+        raise NotImplementedError
+
+    def text_windows(self, loader: Any, window_size: int) -> Optional[TextWindows]:
+        """
+        Returns a callable that reads the loader's source text in windows of
+        window_size characters, or None if the loader's output is not simply the
+        text of its source and therefore cannot be streamed.
+        """
+        return None
+
+    def iter_documents(self, loader: Any, **kwargs) -> Generator[RawDocument, Any, Any]:
+        """
+        Loads documents from loader and yields them as RawDocument objects.
+
+        Parameters:
+            loader (Any): The loader object.
+            **kwargs: Passed through to the loader's load method.
+
+        Yields:
+            Generator[RawDocument, Any, Any]: A generator yielding RawDocument objects.
+        """
+        docs = getattr(loader, self._load_method(type(loader)))(**kwargs)
+        convert = self.convert
+        for doc in docs:
+            yield convert(doc)
+
+    def _load_method(self, loader_cls: type) -> str:
+        """
+        Returns the name of the method to load documents with, preferring the lazy
+        method unless loader_cls only inherits the interface's placeholder.
+        """
+        method = self._load_methods.get(loader_cls)
+        if method is None:
+            owner = next(
+                (klass for klass in loader_cls.__mro__ if self.lazy_method in vars(klass)), None)
+            if owner is None or owner.__name__ == self.base_cls_name:
+                method = self.eager_method
+            else:
+                method = self.lazy_method
+            self._load_methods[loader_cls] = method
+        return method
+
+
+class LangchainLoaderAdapter(LoaderAdapter):
+    lazy_method = 'lazy_load'
+    eager_method = 'load'
+    base_cls_name = 'BaseLoader'
+
+    def convert(self, doc: Any) -> RawDocument:
+        return RawDocument.from_langchain_document(doc)
+
+    def text_windows(self, loader: Any, window_size: int) -> Optional[TextWindows]:
+        from langchain_community.document_loaders import TextLoader
+        if type(loader) is not TextLoader or loader.autodetect_encoding:
+            return None
+        return lambda: iter_file_windows(str(loader.file_path), window_size, encoding=loader.encoding)
+
+
+class LlamaIndexLoaderAdapter(LoaderAdapter):
+    lazy_method = 'lazy_load_data'
+    eager_method = 'load_data'
+    base_cls_name = 'BaseReader'
+
+    def convert(self, doc: Any) -> RawDocument:
+        return RawDocument.from_llama_index_document(doc)
+
+
+class NativeLoaderAdapter(LoaderAdapter):
+    lazy_method = 'lazy_load'
+    eager_method = 'load'
+    base_cls_name = 'BaseDocLoader'
+
+    def convert(self, doc: Any) -> RawDocument:
+        return doc
+
+    def iter_documents(self, loader: Any, **kwargs) -> Generator[RawDocument, Any, Any]:
+        # Native loaders already yield RawDocument objects.
+        return getattr(loader, self._load_method(type(loader)))(**kwargs)
+
+    def text_windows(self, loader: Any, window_size: int) -> Optional[TextWindows]:
+        if not loader.streams_text:
+            return None
+        return lambda: loader.iter_text_windows(window_size)
+
+
+_loader_adapters = {
+    LoaderProtocol.LANGCHAIN: LangchainLoaderAdapter(),
+    LoaderProtocol.LLAMA_INDEX: LlamaIndexLoaderAdapter(),
+    LoaderProtocol.NATIVE: NativeLoaderAdapter(),
+}
+
+
+def get_loader_adapter(protocol: LoaderProtocol) -> LoaderAdapter:
+    """
+    Returns the shared adapter instance for protocol.
+    """
+    return _loader_adapters[protocol]
+
+
+def detect_loader_protocol(loader_cls: type) -> Optional[LoaderProtocol]:
+    """
+    Works out which protocol loader_cls speaks from the methods it exposes.
+    Used only when a loader was registered without an explicit protocol.
+
+    Returns:
+        Optional[LoaderProtocol]: The detected protocol, or None if loader_cls exposes
+            neither the langchain nor the llama_index loading methods.
+    """
+    if hasattr(loader_cls, 'streams_text'):
+        return LoaderProtocol.NATIVE
+    if hasattr(loader_cls, 'load_data'):
+        return LoaderProtocol.LLAMA_INDEX
+    if hasattr(loader_cls, 'lazy_load') or hasattr(loader_cls, 'load'):
+        return LoaderProtocol.LANGCHAIN
+    return None
@@ -0,0 +1,155 @@
+"""
+Module: archive
+
+This module contains a loader for zip and tar bundles of documents. Members are
+read one at a time, in archive order, and handed to the loader registered for
+their extension, so the archive is never extracted as a whole. A single compressed
+file, e.g. app.log.gz, is loaded as an archive of one member.
+
+Classes:
+    ArchiveLoader: Loads the members of a zip or tar archive.
+"""
+
+import os
+import shutil
+import logging
+import tarfile
+import tempfile
+import zipfile
+from typing import Any, BinaryIO, Dict, Generator, Optional, Tuple
+from verified_sources.common.doc_splitters import RawDocument
+from verified_sources.common.doc_splitters.loaders.base import BaseDocLoader
+from verified_sources.common.doc_splitters.loaders.compression import (
+    detect_compression, open_decompressed, strip_compression_extension
+)
+
+logger = logging.getLogger(__name__)
+
+# Loader keys (DocLoaderType values) used for the members of an archive, by extension.
+DEFAULT_MEMBER_LOADERS = {
+    '.txt': 'MMAP_TEXT',
+    '.log': 'MMAP_TEXT',
+    '.md': 'MMAP_TEXT',
+    '.csv': 'CSV_COLUMNAR',
+    '.jsonl': 'JSONL',
+    '.ndjson': 'JSONL',
+    '.parquet': 'PARQUET',
+    '.xlsx': 'XLSX',
+    '.pdf': 'PYPDF_PARALLEL',
+    '.html': 'HTML',
+}
+
+
+class ArchiveLoader(BaseDocLoader):
+    """
+    Loads the members of a zip or tar archive (optionally gzip, bzip2 or zstandard
+    compressed, e.g. .tar.gz), dispatching each member to the loader registered for
+    its extension. Members without a loader are skipped.
+
+    Members are copied to a scratch file one at a time, as loaders such as the PDF
+    and Parquet ones need random access and text members are decoded through a
+    memory map, and the copy is removed as soon as the member has been loaded, so
+    scratch space is bounded by the largest member.
+
+    The documents keep the metadata of the member's loader, with 'source' set to
+    the archive and 'archive_member' to the member's name. The member's name, and
+    the line and offset of the records of JSON Lines members, are emitted with the
+    records of the documents' chunks.
+    """
+    record_metadata_keys = ('archive_member', 'line', 'offset')
+
+    def __init__(self,
+        file_path: str,
+        member_loaders: Optional[Dict[str, str]] = None,
+        encoding: Optional[str] = None,
+        max_member_size: Optional[int] = None,
+    ) -> None:
+        """
+        Initializes a new ArchiveLoader object.
+
+        Parameters:
+            file_path (str): Path of the archive.
+            member_loaders (Optional[Dict[str, str]]): Loader keys by member extension,
+                merged over DEFAULT_MEMBER_LOADERS. Map an extension to None to skip it.
+            encoding (Optional[str]): Encoding of plain text members (default: detected
+                per member from a sample, replacing undecodable bytes).
+            max_member_size (Optional[int]): Members larger than this many bytes, once
+                uncompressed, are skipped. The size of a single compressed file is not
+                known before it is decompressed, so it is never skipped.
+        """
+        self.file_path = str(file_path)
+        self.member_loaders = {**DEFAULT_MEMBER_LOADERS, **(member_loaders or {})}
+        self.encoding = encoding
+        self.max_member_size = max_member_size
+
+    def lazy_load(self) -> Generator[RawDocument, Any, Any]:
+        """
+        Yields the documents of each member, one member at a time.
+        """
+        for name, size, open_member in self._iter_members():
+            loader_key = self._member_loader(name)
+            if loader_key is None:
+                continue
+            if self.max_member_size is not None and size is not None and size > self.max_member_size:
+                logger.warning(f'Skipped {name} of {self.file_path}: {size} bytes is over max_member_size')
+                continue
+            metadata = {'source': self.file_path, 'archive_member': name}
+            with open_member() as member:
+                for doc in self._load_member(loader_key, name, member):
+                    yield RawDocument(self.file_path, doc.page_content, {**doc.metadata, **metadata})
+
+    def _member_loader(self, name: str) -> Optional[str]:
+        _, extension = os.path.splitext(strip_compression_extension(name).lower())
+        return self.member_loaders.get(extension)
+
+    def _load_member(self, loader_key: str, name: str, member: BinaryIO) -> Generator[RawDocument, Any, Any]:
+        """
+        Copies a member to a scratch file and loads it with the loader registered
+        under loader_key.
+        """
+        from verified_sources.common.doc_splitters.factory import doc_splitter_factory
+
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            # Only the base name is used, so member names cannot point outside scratch_dir.
+            member_path = os.path.join(scratch_dir, os.path.basename(name))
+            with open(member_path, 'wb') as f:
+                shutil.copyfileobj(member, f, 1024 * 1024)
+            loader_config = {'encoding': self.encoding} if loader_key == 'MMAP_TEXT' else {}
+            loader = doc_splitter_factory.get_loader_cls(loader_key)(file_path=member_path, **loader_config)
+            adapter = doc_splitter_factory.get_loader_adapter(loader_key)
+            yield from adapter.iter_documents(loader)
+
+    def _iter_members(self) -> Generator[Tuple[str, int, Any], Any, Any]:
+        """
+        Yields (name, uncompressed size, open) for every regular file in the archive,
+        where open() returns a binary stream of the member. Tar archives are read
+        sequentially, so each stream must be consumed before the next member. A
+        compressed file that is not a tar archive is its only member, named after
+        the file without its compression extension and of unknown size.
+        """
+        if zipfile.is_zipfile(self.file_path):
+            with zipfile.ZipFile(self.file_path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        yield info.filename, info.file_size, lambda info=info: archive.open(info)
+            return
+        compression = detect_compression(self.file_path)
+        if compression and not self._is_tar(compression):
+            name = strip_compression_extension(os.path.basename(self.file_path))
+            yield name, None, lambda: open_decompressed(self.file_path, compression)
+            return
+        with open_decompressed(self.file_path) as source, tarfile.open(fileobj=source, mode='r|') as archive:
+            for info in archive:
+                if info.isfile():
+                    yield info.name, info.size, lambda info=info: archive.extractfile(info)
+
+    def _is_tar(self, compression: str) -> bool:
+        """
+        Returns whether a compressed file holds a tar archive, from its name or the
+        magic of the first tar header.
+        """
+        name = self.file_path.lower()
+        if name.endswith('.tgz') or strip_compression_extension(name).endswith('.tar'):
+            return True
+        with open_decompressed(self.file_path, compression) as f:
+            return f.read(512)[257:262] == b'ustar'
@@ -0,0 +1,51 @@
+"""
+Module: base
+
+This module contains the base class for the document loaders that ship with
+verified_sources. Unlike langchain and llama_index loaders they yield RawDocument
+objects directly, so BaseSplitter does not need to convert them.
+
+Classes:
+    BaseDocLoader: Base class for native document loaders.
+"""
+
+from typing import Any, Generator, Iterable, List, Tuple
+from verified_sources.common.doc_splitters import RawDocument
+
+
+class BaseDocLoader:
+    """
+    Base class for native document loaders.
+
+    Attributes:
+        streams_text (bool): Whether iter_text_windows() yields the exact text of the
+            documents this loader produces, which allows streaming splits.
+        record_metadata_keys (Tuple[str, ...]): Keys of the documents' metadata that are
+            emitted with the records of their chunks, e.g. to locate a chunk in its source.
+
+    Methods:
+        lazy_load: Yields documents one at a time.
+        load: Loads all documents into a list.
+        iter_text_windows: Yields the source text in windows.
+    """
+    streams_text = False
+    record_metadata_keys: Tuple[str, ...] = ()
+
+    def lazy_load(self) -> Generator[RawDocument, Any, Any]:
+        """
+        Yields documents one at a time.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not implement lazy_load()')
+
+    def load(self) -> List[RawDocument]:
+        """
+        Loads all documents into a list.
+        """
+        return list(self.lazy_load())
+
+    def iter_text_windows(self, window_size: int) -> Iterable[str]:
+        """
+        Yields the source text in windows of roughly window_size. Only available
+        when streams_text is True.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not implement iter_text_windows()')
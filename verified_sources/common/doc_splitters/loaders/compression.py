@@ -0,0 +1,104 @@
+"""
+Module: compression
+
+This module contains helpers that let the file loaders read gzip, bzip2 and
+zstandard compressed files directly. Compression is detected from the file
+extension, or from the magic bytes at the start of the file for files downloaded
+without an extension, and files are decompressed as a stream while they are read, without
+writing a decompressed copy to disk.
+
+Functions:
+    detect_compression: Returns the compression of a file, or None.
+    strip_compression_extension: Removes a compression extension from a file name.
+    open_decompressed: Opens a file for binary reading, decompressing it on the fly.
+"""
+
+import io
+import os
+from typing import BinaryIO, Optional
+
+COMPRESSION_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.gzip': 'gzip',
+    '.tgz': 'gzip',
+    '.bz2': 'bz2',
+    '.zst': 'zstd',
+    '.zstd': 'zstd',
+}
+
+_MAGIC_BYTES = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+)
+
+# A bzip2 stream is 'BZh', the block size as a digit from 1 to 9, then the magic of
+# its first block, or of the end of the stream for empty data.
+_BZ2_BLOCK_MAGICS = (b'1AY&SY', b'\x17rE8P\x90')
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    """
+    Returns the compression of a file, detected from its extension or, for files
+    without an extension, from its magic bytes. A file with any other extension,
+    e.g. a .txt that happens to start with 'BZh', is never sniffed.
+
+    Parameters:
+        file_path (str): Path of the file.
+
+    Returns:
+        Optional[str]: 'gzip', 'bz2' or 'zstd', or None for uncompressed files.
+    """
+    _, extension = os.path.splitext(str(file_path).lower())
+    if extension:
+        return COMPRESSION_EXTENSIONS.get(extension)
+    with open(file_path, 'rb') as f:
+        head = f.read(10)
+    for magic, compression in _MAGIC_BYTES:
+        if head.startswith(magic):
+            return compression
+    if head[:3] == b'BZh' and len(head) == 10 and head[3:4] in b'123456789' and head[4:] in _BZ2_BLOCK_MAGICS:
+        return 'bz2'
+    return None
+
+
+def strip_compression_extension(file_name: str) -> str:
+    """
+    Removes a compression extension, so that 'app.log.gz' can be matched as '.log'.
+    """
+    root, extension = os.path.splitext(file_name)
+    if extension.lower() in COMPRESSION_EXTENSIONS:
+        return root
+    return file_name
+
+
+def open_decompressed(file_path: str, compression: Optional[str] = None) -> BinaryIO:
+    """
+    Opens a file for binary reading, decompressing it on the fly.
+
+    Parameters:
+        file_path (str): Path of the file.
+        compression (Optional[str]): 'gzip', 'bz2' or 'zstd'. Detected when None;
+            uncompressed files are opened as they are.
+
+    Returns:
+        BinaryIO: A buffered binary file object, to be closed by the caller.
+    """
+    compression = compression or detect_compression(file_path)
+    if compression is None:
+        return open(file_path, 'rb')
+    if compression == 'gzip':
+        import gzip
+        return gzip.open(file_path, 'rb')
+    if compression == 'bz2':
+        import bz2
+        return bz2.open(file_path, 'rb')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                'Reading zstandard compressed files requires the zstandard package, '
+                'install it with `pip install zstandard`')
+        reader = zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+        return io.BufferedReader(reader)
+    raise ValueError(f"Unknown compression '{compression}'")
@@ -0,0 +1,192 @@
+"""
+Module: encoding
+
+This module contains encoding detection for the text loaders. Instead of running a
+detector over the whole file, it looks at a bounded sample of bytes: byte order
+marks first, then whether the sample is valid UTF-8, which covers nearly every file
+cheaply, and only then charset_normalizer. Results are cached per file, keyed by
+its size and modification time.
+
+Classes:
+    Utf8Recoder: Reads a binary stream in any encoding as UTF-8.
+
+Functions:
+    detect_encoding: Returns the encoding of a file, detected from a sample of its bytes.
+    detect_sample_encoding: Returns the encoding of a sample of bytes.
+    resolve_encoding: Returns the encoding and error handling a loader should decode a file with.
+    open_utf8: Opens a file in any encoding for reading as UTF-8 bytes.
+"""
+
+import codecs
+import io
+import os
+from functools import lru_cache
+from typing import BinaryIO, List, Optional, Sequence, Tuple
+from verified_sources.common.doc_splitters.loaders.compression import detect_compression, open_decompressed
+
+# Number of bytes sampled from a file, split between its start, middle and end.
+DEFAULT_SAMPLE_SIZE = 64 * 1024
+
+# Encoding used when no other encoding fits the sample. It decodes any byte sequence.
+FALLBACK_ENCODING = 'latin-1'
+
+# Encoding preferred among single byte code pages that fit a sample equally well.
+PREFERRED_ENCODING = 'cp1252'
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def detect_encoding(file_path: str, sample_size: int = DEFAULT_SAMPLE_SIZE) -> str:
+    """
+    Returns the encoding of a file, detected from at most sample_size bytes of it.
+    Compressed files are sampled after decompression.
+
+    Parameters:
+        file_path (str): Path of the file.
+        sample_size (int): Number of bytes to sample.
+
+    Returns:
+        str: A Python codec name.
+    """
+    stat = os.stat(file_path)
+    return _detect_encoding(os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns, sample_size)
+
+
+def resolve_encoding(file_path: str, encoding: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Returns the encoding and the error handling to decode a file with. An encoding
+    given explicitly is used strictly; a detected one replaces undecodable bytes, as
+    the sample it was detected from may not be representative of the whole file.
+
+    Returns:
+        Tuple[str, str]: (encoding, errors), e.g. ('cp1252', 'replace').
+    """
+    if encoding:
+        return encoding, 'strict'
+    return detect_encoding(file_path), 'replace'
+
+
+@lru_cache(maxsize=4096)
+def _detect_encoding(file_path: str, size: int, mtime_ns: int, sample_size: int) -> str:
+    return detect_sample_encoding(_read_samples(file_path, size, sample_size))
+
+
+def detect_sample_encoding(samples: Sequence[bytes]) -> str:
+    """
+    Returns the encoding of samples of bytes, the first one taken from the start
+    of the data and the others from anywhere in it.
+
+    Parameters:
+        samples (Sequence[bytes]): The samples, e.g. [data[:DEFAULT_SAMPLE_SIZE]].
+
+    Returns:
+        str: A Python codec name.
+    """
+    head = samples[0]
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    if all(_is_utf8(sample, first=index == 0) for index, sample in enumerate(samples)):
+        return 'utf-8'
+    from charset_normalizer import from_bytes
+    matches = from_bytes(b''.join(samples))
+    match = matches.best()
+    if match is None:
+        return FALLBACK_ENCODING
+    # Samples often fit several single byte code pages equally well. Prefer the
+    # most widespread one, cp1252, among those tied with the best match.
+    tied = set(match.could_be_from_charset)
+    tied.update(m.encoding for m in matches if (m.chaos, m.coherence) == (match.chaos, match.coherence))
+    if PREFERRED_ENCODING in tied:
+        return PREFERRED_ENCODING
+    return codecs.lookup(match.encoding).name
+
+
+def _read_samples(file_path: str, size: int, sample_size: int) -> List[bytes]:
+    """
+    Reads the start of the file and, for large uncompressed files, windows from the
+    middle and the end, where non-ASCII text first shows up in many logs.
+    """
+    if detect_compression(file_path) or size <= sample_size:
+        with open_decompressed(file_path) as f:
+            return [f.read(sample_size)]
+    window = sample_size // 3
+    with open(file_path, 'rb') as f:
+        samples = []
+        for offset in (0, (size - window) // 2, size - window):
+            f.seek(offset)
+            samples.append(f.read(window))
+        return samples
+
+
+def _is_utf8(sample: bytes, first: bool) -> bool:
+    """
+    Whether sample is valid UTF-8, ignoring a character cut at either end of it.
+    """
+    if not first:
+        # Skip continuation bytes of a character starting before the sample.
+        start = 0
+        while start < min(len(sample), 3) and 0x80 <= sample[start] <= 0xBF:
+            start += 1
+        sample = sample[start:]
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+class Utf8Recoder(io.RawIOBase):
+    """
+    Reads a binary stream in any encoding as UTF-8 bytes, decoding it block by block.
+    """
+
+    def __init__(self, raw: BinaryIO, encoding: str, errors: str = 'strict', block_size: int = 1024 * 1024) -> None:
+        self._raw = raw
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+        self._block_size = block_size
+        self._pending = b''
+        self._position = 0
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while self._position == len(self._pending) and not self._eof:
+            block = self._raw.read(self._block_size)
+            self._eof = not block
+            self._pending = self._decoder.decode(block, final=self._eof).encode('utf-8')
+            self._position = 0
+        size = min(len(buffer), len(self._pending) - self._position)
+        buffer[:size] = self._pending[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def close(self) -> None:
+        self._raw.close()
+        super().close()
+
+
+def open_utf8(file_path: str, encoding: str, errors: str = 'strict') -> BinaryIO:
+    """
+    Opens a file, compressed or not, for reading as UTF-8 bytes.
+
+    Parameters:
+        file_path (str): Path of the file.
+        encoding (str): Encoding of the file.
+        errors (str): How decoding errors are handled, e.g. 'strict' or 'replace'.
+
+    Returns:
+        BinaryIO: A buffered binary file object, to be closed by the caller.
+    """
+    source = open_decompressed(file_path)
+    if codecs.lookup(encoding).name == 'utf-8' and errors == 'strict':
+        return source
+    return io.BufferedReader(Utf8Recoder(source, encoding, errors))
@@ -0,0 +1,149 @@
+"""
+Module: jsonl
+
+This module contains a loader for JSON Lines (NDJSON) files such as event and log
+exports. The file is read in batches of lines and every line is parsed on its own,
+with orjson when it is installed, so memory stays constant however large the file.
+Compressed files are decompressed as they are read.
+
+Classes:
+    JsonLinesLoader: Loads a JSON Lines file, one document per record.
+"""
+
+import codecs
+import json
+import logging
+from typing import Any, Generator, List, Optional, Sequence
+from verified_sources.common.doc_splitters import RawDocument
+from verified_sources.common.doc_splitters.loaders.base import BaseDocLoader
+from verified_sources.common.doc_splitters.loaders.compression import open_decompressed
+from verified_sources.common.doc_splitters.loaders.encoding import resolve_encoding
+
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(value: Any) -> str:
+        return orjson.dumps(value, default=str).decode()
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str)
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _get_field(record: Any, path: str) -> Any:
+    """
+    Returns the value at a dotted path such as 'user.id', or _MISSING.
+    """
+    value = record
+    for key in path.split('.'):
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+
+def _to_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return ''
+    if type(value) in (int, float):
+        return repr(value)
+    return _dumps(value)
+
+
+def _to_metadata(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return _to_text(value)
+
+
+class JsonLinesLoader(BaseDocLoader):
+    """
+    Loads a JSON Lines file, one document per record.
+
+    The content of a document is made of "field: value" lines for content_fields
+    (all top level fields by default); nested values are rendered as JSON. The
+    values of metadata_fields are copied into the document's metadata, together
+    with the record's line number and byte offset in the (decompressed) file; all of
+    them are emitted with the records of the document's chunks.
+    Blank lines are ignored and malformed lines are skipped with a warning.
+    """
+
+    def __init__(self,
+        file_path: str,
+        content_fields: Optional[Sequence[str]] = None,
+        metadata_fields: Sequence[str] = (),
+        encoding: Optional[str] = None,
+        batch_size: int = 1024 * 1024,
+    ) -> None:
+        """
+        Initializes a new JsonLinesLoader object.
+
+        Parameters:
+            file_path (str): Path of the JSON Lines file to load.
+            content_fields (Optional[Sequence[str]]): Fields, as dotted paths, rendered into
+                the content of each document, in order (default: all top level fields).
+            metadata_fields (Sequence[str]): Fields, as dotted paths, copied into the
+                metadata of each document.
+            encoding (Optional[str]): Encoding of the file (default: detected from a sample,
+                skipping lines that are not valid in it). Must be ASCII compatible, as
+                lines are split on b'\\n'.
+            batch_size (int): Approximate number of bytes of lines read at a time.
+        """
+        self.file_path = str(file_path)
+        self.content_fields = list(content_fields) if content_fields else None
+        self.metadata_fields = list(metadata_fields)
+        self.record_metadata_keys = ('line', 'offset', *self.metadata_fields)
+        self.encoding = encoding
+        self.batch_size = batch_size
+
+    def lazy_load(self) -> Generator[RawDocument, Any, Any]:
+        """
+        Yields one document per record, in file order.
+        """
+        encoding, errors = resolve_encoding(self.file_path, self.encoding)
+        # UTF-8 lines are handed to the parser as bytes, without decoding them first.
+        utf8 = codecs.lookup(encoding).name in ('utf-8', 'utf-8-sig')
+        skipped: List[int] = []
+        offset = 0
+        line_number = 0
+        with open_decompressed(self.file_path) as f:
+            for lines in iter(lambda: f.readlines(self.batch_size), []):
+                for line in lines:
+                    line_number += 1
+                    line_offset, offset = offset, offset + len(line)
+                    if line_offset == 0 and line.startswith(b'\xef\xbb\xbf'):
+                        line = line[3:]
+                    if not line.strip():
+                        continue
+                    try:
+                        record = _loads(line if utf8 else line.decode(encoding, errors))
+                    except (ValueError, UnicodeDecodeError):
+                        skipped.append(line_number)
+                        continue
+                    yield self._document(record, line_number, line_offset)
+        if skipped:
+            logger.warning(
+                f'Skipped {len(skipped)} malformed lines of {self.file_path}, starting at line {skipped[0]}')
+
+    def _document(self, record: Any, line_number: int, offset: int) -> RawDocument:
+        metadata = {'source': self.file_path, 'line': line_number, 'offset': offset}
+        if not isinstance(record, dict):
+            return RawDocument(self.file_path, _to_text(record), metadata)
+        for path in self.metadata_fields:
+            value = _get_field(record, path)
+            if value is not _MISSING:
+                metadata[path] = _to_metadata(value)
+        if self.content_fields is None:
+            fields = record.items()
+        else:
+            fields = ((path, _get_field(record, path)) for path in self.content_fields)
+        content = '\n'.join(f'{path}: {_to_text(value)}' for path, value in fields if value is not _MISSING)
+        return RawDocument(self.file_path, content, metadata)
@@ -0,0 +1,159 @@
+"""
+Module: pdf
+
+This module contains loaders for PDF files.
+
+Classes:
+    LazyPDFLoader: Yields the pages of a PDF one at a time without reading the whole file.
+    ParallelPyPDFLoader: Extracts the pages of a single PDF in parallel worker processes.
+"""
+
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Generator, List, Optional, Union
+from verified_sources.common.doc_splitters import RawDocument
+from verified_sources.common.doc_splitters.loaders.base import BaseDocLoader
+
+# Worker processes of ParallelPyPDFLoader when max_workers is not given. Kept small,
+# as a pool is started for every large PDF.
+DEFAULT_PDF_WORKERS = 4
+
+
+def _extract_page_range(file_path: str, password: Optional[Union[str, bytes]], start: int, stop: int) -> List[str]:
+    """
+    Worker entry point: extracts the text of pages [start, stop) of a PDF.
+    """
+    import pypdf
+    with open(file_path, 'rb') as f:
+        reader = pypdf.PdfReader(f, password=password)
+        return [reader.pages[page_number].extract_text() for page_number in range(start, stop)]
+
+
+class LazyPDFLoader(BaseDocLoader):
+    """
+    Loads a PDF into one document per page, yielding each page as soon as it is
+    extracted.
+
+    pypdf reads the whole file into memory when given a path and langchain's PDF
+    parsers build every page before returning the first one. This loader hands pypdf
+    the open file instead, so objects are read from disk on demand, and drops pypdf's
+    cache of parsed objects after every page, which keeps memory flat regardless of
+    the number of pages.
+    """
+
+    def __init__(self,
+        file_path: str,
+        password: Optional[Union[str, bytes]] = None,
+        backend: str = 'pypdf',
+    ) -> None:
+        """
+        Initializes a new LazyPDFLoader object.
+
+        Parameters:
+            file_path (str): Path of the PDF to load.
+            password (Optional[Union[str, bytes]]): Password of an encrypted PDF (pypdf only).
+            backend (str): 'pypdf' or 'pdfminer' (default: 'pypdf').
+        """
+        if backend not in ('pypdf', 'pdfminer'):
+            raise ValueError(f"Unknown PDF backend '{backend}', expected 'pypdf' or 'pdfminer'")
+        self.file_path = str(file_path)
+        self.password = password
+        self.backend = backend
+
+    def _page_document(self, page_number: int, text: str) -> RawDocument:
+        return RawDocument(self.file_path, text, {'source': self.file_path, 'page': page_number})
+
+    def lazy_load(self) -> Generator[RawDocument, Any, Any]:
+        """
+        Yields one document per page, in page order.
+        """
+        if self.backend == 'pdfminer':
+            yield from self._lazy_load_pdfminer()
+            return
+
+        import pypdf
+        with open(self.file_path, 'rb') as f:
+            reader = pypdf.PdfReader(f, password=self.password)
+            for page_number in range(len(reader.pages)):
+                text = reader.pages[page_number].extract_text()
+                reader.resolved_objects.clear()
+                yield self._page_document(page_number, text)
+
+    def _lazy_load_pdfminer(self) -> Generator[RawDocument, Any, Any]:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+        with open(self.file_path, 'rb') as f:
+            for page_number, page_layout in enumerate(extract_pages(f)):
+                text = ''.join(
+                    element.get_text() for element in page_layout if isinstance(element, LTTextContainer))
+                yield self._page_document(page_number, text)
+
+
+class ParallelPyPDFLoader(LazyPDFLoader):
+    """
+    Loads a PDF with pypdf into one document per page, like PyPDFLoader, but extracts
+    page ranges in a pool of worker processes.
+
+    Pages are yielded in order as soon as the range they belong to is done, so the
+    leading pages reach the splitter while the rest of the document is still being
+    extracted. Small documents, and documents loaded inside a worker process (see
+    verified_sources.common.doc_splitters.parallel), are extracted serially and
+    lazily by LazyPDFLoader.
+    """
+
+    def __init__(self,
+        file_path: str,
+        password: Optional[Union[str, bytes]] = None,
+        max_workers: Optional[int] = None,
+        pages_per_task: int = 16,
+        min_pages_for_parallel: int = 64,
+    ) -> None:
+        """
+        Initializes a new ParallelPyPDFLoader object.
+
+        Parameters:
+            file_path (str): Path of the PDF to load.
+            password (Optional[Union[str, bytes]]): Password of an encrypted PDF.
+            max_workers (Optional[int]): Number of worker processes (default: DEFAULT_PDF_WORKERS,
+                at most the number of CPUs).
+            pages_per_task (int): Number of consecutive pages extracted by one task.
+            min_pages_for_parallel (int): Documents with fewer pages are extracted serially.
+        """
+        super().__init__(file_path, password=password)
+        self.max_workers = max_workers or min(DEFAULT_PDF_WORKERS, os.cpu_count() or 1)
+        self.pages_per_task = max(pages_per_task, 1)
+        self.min_pages_for_parallel = min_pages_for_parallel
+
+    def lazy_load(self) -> Generator[RawDocument, Any, Any]:
+        """
+        Yields one document per page, in page order.
+        """
+        import pypdf
+        with open(self.file_path, 'rb') as f:
+            num_pages = len(pypdf.PdfReader(f, password=self.password).pages)
+        if (self.max_workers <= 1
+                or num_pages < self.min_pages_for_parallel
+                or multiprocessing.parent_process() is not None):
+            yield from super().lazy_load()
+            return
+
+        page_ranges = (
+            (start, min(start + self.pages_per_task, num_pages))
+            for start in range(0, num_pages, self.pages_per_task)
+        )
+        max_in_flight = 2 * self.max_workers
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for start, stop in page_ranges:
+                in_flight.append((start, executor.submit(
+                    _extract_page_range, self.file_path, self.password, start, stop)))
+                if len(in_flight) >= max_in_flight:
+                    yield from self._range_documents(*in_flight.popleft())
+            while in_flight:
+                yield from self._range_documents(*in_flight.popleft())
+
+    def _range_documents(self, start: int, future) -> Generator[RawDocument, Any, Any]:
+        for offset, text in enumerate(future.result()):
+            yield self._page_document(start + offset, text)
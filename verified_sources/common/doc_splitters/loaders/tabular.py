@@ -0,0 +1,412 @@
+"""
+Module: tabular
+
+This module contains loaders for tabular files. Rows are read in columnar record
+batches with pyarrow and rendered to text a batch at a time with pyarrow compute
+kernels, instead of building a dict and a Document per row.
+
+Classes:
+    ColumnarCSVLoader: Loads a CSV file in record batches, grouping rows into documents.
+    ParquetLoader: Loads a Parquet file one row group at a time, grouping rows into documents.
+    XlsxLoader: Loads the sheets of an XLSX workbook row by row, grouping rows into documents.
+"""
+
+import csv
+import datetime
+import io
+import json
+import logging
+from typing import Any, Generator, Iterable, List, Optional, Sequence
+from verified_sources.common.doc_splitters import RawDocument
+from verified_sources.common.doc_splitters.loaders.base import BaseDocLoader
+from verified_sources.common.doc_splitters.loaders.encoding import open_utf8, resolve_encoding
+
+logger = logging.getLogger(__name__)
+
+ROW_FORMATS = ('key_value', 'table')
+
+
+class BaseTabularLoader(BaseDocLoader):
+    """
+    Renders record batches to text and groups consecutive rows into documents.
+
+    With the 'key_value' row format every row is rendered as "column: value" lines,
+    like langchain's CSVLoader, and rows are separated by blank lines. With the
+    'table' format the column names are rendered once, as the first line of every
+    document, followed by one "value | value" line per row.
+    """
+
+    def __init__(self,
+        file_path: str,
+        columns: Optional[Sequence[str]] = None,
+        row_format: str = 'key_value',
+        rows_per_document: Optional[int] = None,
+        max_document_chars: Optional[int] = 4096,
+    ) -> None:
+        """
+        Parameters:
+            file_path (str): Path of the file to load.
+            columns (Optional[Sequence[str]]): Columns to load, in order (default: all).
+            row_format (str): 'key_value' or 'table' (default: 'key_value').
+            rows_per_document (Optional[int]): Maximum number of rows per document.
+            max_document_chars (Optional[int]): Rows are grouped into documents of at most
+                this many characters, the header line of the 'table' format included. A
+                single longer row gets a document of its own.
+                Set both limits to None, or rows_per_document to 1, for one document per row.
+        """
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"Unknown row format '{row_format}', expected one of {ROW_FORMATS}")
+        self.file_path = str(file_path)
+        self.columns = list(columns) if columns else None
+        self.row_format = row_format
+        self.rows_per_document = rows_per_document
+        self.max_document_chars = max_document_chars
+        self._row_separator = '\n\n' if row_format == 'key_value' else '\n'
+
+    def _iter_batches(self) -> Iterable[Any]:
+        """
+        Yields pyarrow RecordBatches whose columns are all strings.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not implement _iter_batches()')
+
+    def _check_columns(self, names: Sequence[str]) -> None:
+        """
+        Raises a ValueError if a configured column is not one of names.
+        """
+        missing = [name for name in self.columns or () if name not in names]
+        if missing:
+            raise ValueError(f'Unknown columns {missing} in {self.file_path}, available columns are {list(names)}')
+
+    def lazy_load(self) -> Generator[RawDocument, Any, Any]:
+        """
+        Yields documents of consecutive rows, in file order.
+        """
+        yield from self._group_rows(self._iter_batches())
+
+    def _group_rows(self, batches: Iterable[Any], metadata: Optional[dict] = None) -> Generator[RawDocument, Any, Any]:
+        """
+        Renders the rows of a single table, given as record batches with the same
+        columns, and groups them into documents carrying metadata.
+        """
+        import numpy as np
+
+        metadata = metadata or {}
+        pending: List[str] = []
+        pending_chars = 0
+        first_row = 0
+        header = None
+        header_chars = 0
+        for batch in batches:
+            if batch.num_rows == 0:
+                continue
+            if header is None:
+                header = ' | '.join(name.strip() for name in batch.schema.names)
+                if self.row_format == 'table':
+                    header_chars = len(header) + 1
+            rows = self._render(batch)
+            texts = rows.to_pylist()
+            # Offsets just past each row if the whole batch went into one document.
+            ends = np.cumsum(self._row_lengths(rows) + len(self._row_separator))
+            start = 0
+            while start < len(texts):
+                offset = int(ends[start - 1]) if start else 0
+                stop = len(texts)
+                if self.max_document_chars:
+                    budget = offset + self.max_document_chars - header_chars - pending_chars
+                    stop = int(np.searchsorted(ends, budget, side='right'))
+                if self.rows_per_document:
+                    stop = min(stop, start + self.rows_per_document - len(pending))
+                if stop <= start:
+                    # The next row does not fit: close the document, or give the row
+                    # a document of its own if it is too long by itself.
+                    if pending:
+                        yield self._document(pending, header, first_row, metadata)
+                        first_row += len(pending)
+                        pending, pending_chars = [], 0
+                        continue
+                    stop = start + 1
+                pending.extend(texts[start:stop])
+                pending_chars += int(ends[stop - 1]) - offset
+                start = stop
+                if stop < len(texts) or len(pending) == self.rows_per_document:
+                    yield self._document(pending, header, first_row, metadata)
+                    first_row += len(pending)
+                    pending, pending_chars = [], 0
+        if pending:
+            yield self._document(pending, header, first_row, metadata)
+
+    def _render(self, batch: Any) -> Any:
+        """
+        Renders every row of batch to text with vectorized string kernels.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        values = [pc.utf8_trim_whitespace(pc.fill_null(column, '')) for column in batch.columns]
+        if self.row_format == 'key_value':
+            values = [
+                pc.binary_join_element_wise(pa.scalar(f'{name.strip()}: '), value, '')
+                for name, value in zip(batch.schema.names, values)
+            ]
+            return pc.binary_join_element_wise(*values, '\n')
+        return pc.binary_join_element_wise(*values, ' | ')
+
+    @staticmethod
+    def _row_lengths(rows: Any) -> Any:
+        import pyarrow.compute as pc
+        return pc.utf8_length(rows).to_numpy(zero_copy_only=False)
+
+    def _document(self, rows: List[str], header: str, first_row: int, metadata: dict) -> RawDocument:
+        text = self._row_separator.join(rows)
+        if self.row_format == 'table':
+            text = f'{header}\n{text}'
+        return RawDocument(
+            self.file_path, text, {'source': self.file_path, **metadata, 'row': first_row, 'rows': len(rows)})
+
+
+class ColumnarCSVLoader(BaseTabularLoader):
+    """
+    Loads a CSV file with pyarrow's streaming CSV reader, a block of rows at a time.
+    Values are read as strings, exactly as they appear in the file, and the memory
+    used is bounded by block_size rather than by the size of the file. Compressed
+    files are decompressed, and files in other encodings recoded, as they are read.
+    """
+
+    def __init__(self,
+        file_path: str,
+        encoding: Optional[str] = None,
+        delimiter: str = ',',
+        quotechar: str = '"',
+        block_size: int = 4 * 1024 * 1024,
+        **kwargs: Any
+    ) -> None:
+        """
+        Initializes a new ColumnarCSVLoader object.
+
+        Parameters:
+            file_path (str): Path of the CSV file to load.
+            encoding (Optional[str]): Encoding of the file (default: detected from a sample,
+                replacing undecodable bytes).
+            delimiter (str): Field delimiter (default: ',').
+            quotechar (str): Quote character (default: '"').
+            block_size (int): Number of bytes read per record batch.
+            **kwargs: Row rendering and grouping options, see BaseTabularLoader.
+        """
+        super().__init__(file_path, **kwargs)
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self.quotechar = quotechar
+        self.block_size = block_size
+
+    def _read_header(self, encoding: str, errors: str) -> Optional[List[str]]:
+        with io.TextIOWrapper(open_utf8(self.file_path, encoding, errors), encoding='utf-8', newline='') as f:
+            return next(csv.reader(f, delimiter=self.delimiter, quotechar=self.quotechar), None)
+
+    def _iter_batches(self) -> Iterable[Any]:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        encoding, errors = resolve_encoding(self.file_path, self.encoding)
+        header = self._read_header(encoding, errors)
+        if not header:
+            return
+        self._check_columns(header)
+
+        skipped = []
+
+        def skip_invalid_row(row: Any) -> str:
+            skipped.append(row.number)
+            return 'skip'
+
+        # The source is recoded to UTF-8 here, so pyarrow does not need to transcode.
+        with open_utf8(self.file_path, encoding, errors) as source:
+            reader = pa_csv.open_csv(
+                source,
+                read_options=pa_csv.ReadOptions(block_size=self.block_size),
+                parse_options=pa_csv.ParseOptions(
+                    delimiter=self.delimiter, quote_char=self.quotechar, newlines_in_values=True,
+                    invalid_row_handler=skip_invalid_row),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types={name: pa.string() for name in header},
+                    include_columns=self.columns,
+                    strings_can_be_null=False,
+                    quoted_strings_can_be_null=False,
+                ),
+            )
+            with reader:
+                yield from reader
+        if skipped:
+            logger.warning(
+                f'Skipped {len(skipped)} rows of {self.file_path} with the wrong number of fields, '
+                f'starting at line {skipped[0]}')
+
+
+class ParquetLoader(BaseTabularLoader):
+    """
+    Loads a Parquet file one row group at a time, reading only the configured
+    columns, so the memory used is bounded by the size of a row group rather than
+    by the size of the file.
+
+    Columns are converted to strings with pyarrow casts and lists of scalars are
+    rendered as "[a, b]"; other nested values (structs, maps) are rendered as JSON.
+    """
+
+    def __init__(self, file_path: str, batch_size: int = 64 * 1024, **kwargs: Any) -> None:
+        """
+        Initializes a new ParquetLoader object.
+
+        Parameters:
+            file_path (str): Path of the Parquet file to load.
+            batch_size (int): Maximum number of rows rendered at a time.
+            **kwargs: Column selection, row rendering and grouping options, see BaseTabularLoader.
+        """
+        super().__init__(file_path, **kwargs)
+        self.batch_size = batch_size
+
+    def _iter_batches(self) -> Iterable[Any]:
+        import pyarrow.parquet as pq
+
+        with pq.ParquetFile(self.file_path) as parquet_file:
+            self._check_columns(parquet_file.schema_arrow.names)
+            for row_group in range(parquet_file.num_row_groups):
+                table = parquet_file.read_row_group(row_group, columns=self.columns)
+                for batch in table.to_batches(max_chunksize=self.batch_size):
+                    yield self._as_strings(batch)
+                del table
+
+    @classmethod
+    def _as_strings(cls, batch: Any) -> Any:
+        import pyarrow as pa
+
+        columns = []
+        for column in batch.columns:
+            if pa.types.is_string(column.type):
+                columns.append(column)
+            elif pa.types.is_list(column.type) and not pa.types.is_nested(column.type.value_type):
+                columns.append(cls._join_list(column))
+            elif pa.types.is_nested(column.type):
+                columns.append(pa.array(
+                    [None if value is None else json.dumps(value, default=str) for value in column.to_pylist()],
+                    type=pa.string()))
+            else:
+                columns.append(column.cast(pa.string()))
+        return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+    @staticmethod
+    def _join_list(column: Any) -> Any:
+        """
+        Renders a list column of scalars as "[a, b]" strings, without leaving Arrow.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        strings = column.cast(pa.list_(pa.string()))
+        values = pc.fill_null(strings.values, '')
+        joined = pc.binary_join(pa.ListArray.from_arrays(strings.offsets, values), ', ')
+        rendered = pc.binary_join_element_wise(pa.scalar('['), joined, pa.scalar(']'), '')
+        return pc.if_else(pc.is_valid(column), rendered, pa.scalar(None, pa.string()))
+
+
+class XlsxLoader(BaseTabularLoader):
+    """
+    Loads the sheets of an XLSX workbook with openpyxl's read-only mode, which
+    parses the worksheet XML as a stream of rows instead of building the workbook
+    in memory. Rows are collected into record batches of batch_size rows, so the
+    memory used stays flat however many rows a sheet has.
+
+    The first non-empty row of a sheet is its header, and every row below it is
+    padded or truncated to the header's width. Empty rows are skipped and
+    documents never span two sheets; their metadata holds the sheet's name.
+    Formulas are read as their cached values.
+    """
+
+    def __init__(self,
+        file_path: str,
+        sheets: Optional[Sequence[str]] = None,
+        batch_size: int = 10_000,
+        **kwargs: Any
+    ) -> None:
+        """
+        Initializes a new XlsxLoader object.
+
+        Parameters:
+            file_path (str): Path of the XLSX file to load.
+            sheets (Optional[Sequence[str]]): Names of the sheets to load (default: all).
+            batch_size (int): Number of rows rendered at a time.
+            **kwargs: Row rendering and grouping options, see BaseTabularLoader. columns
+                selects columns by their header.
+        """
+        super().__init__(file_path, **kwargs)
+        self.sheets = list(sheets) if sheets else None
+        self.batch_size = batch_size
+
+    def lazy_load(self) -> Generator[RawDocument, Any, Any]:
+        """
+        Yields documents of consecutive rows, sheet by sheet.
+        """
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            for worksheet in workbook.worksheets:
+                if self.sheets is None or worksheet.title in self.sheets:
+                    yield from self._group_rows(self._iter_sheet_batches(worksheet), {'sheet': worksheet.title})
+        finally:
+            workbook.close()
+
+    def _iter_sheet_batches(self, worksheet: Any) -> Generator[Any, Any, Any]:
+        """
+        Yields the rows of a worksheet, below its header, as record batches of strings.
+        """
+        import pyarrow as pa
+
+        header = None
+        rows = []
+        truncated = 0
+        for values in worksheet.iter_rows(values_only=True):
+            if all(value is None or value == '' for value in values):
+                continue
+            if header is None:
+                header = [
+                    str(value).strip() if value not in (None, '') else f'column_{index + 1}'
+                    for index, value in enumerate(values)
+                ]
+                self._check_columns(header)
+                continue
+            if any(value not in (None, '') for value in values[len(header):]):
+                truncated += 1
+            rows.append(values)
+            if len(rows) == self.batch_size:
+                yield self._as_batch(header, rows, pa)
+                rows = []
+        if rows:
+            yield self._as_batch(header, rows, pa)
+        if truncated:
+            logger.warning(
+                f'Dropped the values beyond the header of {truncated} rows of sheet {worksheet.title!r} '
+                f'of {self.file_path}')
+
+    def _as_batch(self, header: List[str], rows: List[tuple], pa: Any) -> Any:
+        """
+        Builds a record batch with the header's columns, padding short rows with
+        empty values and truncating long ones.
+        """
+        columns = [
+            pa.array([_cell_text(row[index]) if index < len(row) else '' for row in rows], type=pa.string())
+            for index in range(len(header))
+        ]
+        batch = pa.RecordBatch.from_arrays(columns, names=header)
+        if self.columns:
+            batch = batch.select(self.columns)
+        return batch
+
+
+def _cell_text(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime.datetime) and value.time() == datetime.time():
+        # Date cells are read as datetimes at midnight.
+        return value.date().isoformat()
+    return str(value)
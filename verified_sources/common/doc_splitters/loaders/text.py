@@ -0,0 +1,153 @@
+"""
+Module: text
+
+This module contains loaders for plain text, log and CSV files, which may be
+gzip, bzip2 or zstandard compressed.
+
+Classes:
+    MmapTextLoader: Loads a text file through a memory map.
+"""
+
+import os
+import mmap
+import codecs
+from contextlib import contextmanager
+from typing import Any, Generator, Iterable, Optional
+from verified_sources.common.doc_splitters import RawDocument
+from verified_sources.common.doc_splitters.loaders.base import BaseDocLoader
+from verified_sources.common.doc_splitters.loaders.compression import detect_compression, open_decompressed
+from verified_sources.common.doc_splitters.loaders.encoding import resolve_encoding
+
+
+# Size in bytes of the windows lazy_load() decodes the file in.
+_LOAD_WINDOW_SIZE = 4 * 1024 * 1024
+
+
+def _normalize_newlines(windows: Iterable[str]) -> Generator[str, Any, Any]:
+    """
+    Translates '\r\n' and '\r' line endings to '\n' in a stream of windows, as
+    files opened in text mode do. A '\r' ending a window is held back until the
+    next window shows whether it is part of a '\r\n'.
+    """
+    pending_cr = False
+    for window in windows:
+        if pending_cr:
+            window = '\r' + window
+        pending_cr = window.endswith('\r')
+        if pending_cr:
+            window = window[:-1]
+        if '\r' in window:
+            window = window.replace('\r\n', '\n').replace('\r', '\n')
+        if window:
+            yield window
+    if pending_cr:
+        yield '\n'
+
+
+class MmapTextLoader(BaseDocLoader):
+    """
+    Loads a text file through a memory map instead of reading it into a Python string.
+
+    iter_text_windows() scans the mapped buffer for line boundaries and decodes one
+    window at a time, which is what streaming splits use. lazy_load() builds the
+    single document from the same windows, so the file is never decoded in one go.
+
+    Compressed files cannot be mapped; they are decompressed as a stream instead,
+    so windows go straight from the compressed file to the splitter.
+
+    Without an explicit encoding, the encoding is detected from a sample of the
+    file and undecodable bytes are replaced rather than failing the file. Line
+    endings are translated to '\n', as when the file is read in text mode.
+    """
+    streams_text = True
+
+    def __init__(self, file_path: str, encoding: Optional[str] = None) -> None:
+        """
+        Initializes a new MmapTextLoader object.
+
+        Parameters:
+            file_path (str): Path of the file to load.
+            encoding (Optional[str]): Encoding of the file (default: detected).
+        """
+        self.file_path = str(file_path)
+        self.encoding = encoding
+        self._compression = detect_compression(self.file_path)
+
+    @contextmanager
+    def _mapped(self) -> Generator[Optional[mmap.mmap], Any, Any]:
+        """
+        Maps the file read-only. Yields None for empty files, which cannot be mapped.
+        """
+        with open(self.file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield None
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+    def lazy_load(self) -> Generator[RawDocument, Any, Any]:
+        """
+        Yields the whole file as a single document.
+        """
+        text = ''.join(self.iter_text_windows(_LOAD_WINDOW_SIZE))
+        yield RawDocument(self.file_path, text, {'source': self.file_path})
+
+    def iter_text_windows(self, window_size: int) -> Generator[str, Any, Any]:
+        """
+        Yields the decoded file in windows of about window_size bytes, cut after the
+        last newline in each window when there is one.
+
+        Parameters:
+            window_size (int): Target size of a window in bytes.
+
+        Yields:
+            Generator[str, Any, Any]: A generator yielding windows of text.
+        """
+        encoding, errors = resolve_encoding(self.file_path, self.encoding)
+        decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+        if self._compression:
+            yield from _normalize_newlines(self._iter_decompressed_windows(decoder, window_size))
+            return
+        yield from _normalize_newlines(self._iter_mapped_windows(decoder, window_size))
+
+    def _iter_mapped_windows(self, decoder: codecs.IncrementalDecoder, window_size: int) -> Generator[str, Any, Any]:
+        with self._mapped() as mm:
+            if mm is None:
+                return
+            size = len(mm)
+            with memoryview(mm) as buffer:
+                start = 0
+                while start < size:
+                    end = min(start + window_size, size)
+                    if end < size:
+                        newline = mm.rfind(b'\n', start, end)
+                        if newline != -1:
+                            end = newline + 1
+                    window = decoder.decode(buffer[start:end], final=end == size)
+                    if window:
+                        yield window
+                    start = end
+
+    def _iter_decompressed_windows(self, decoder: codecs.IncrementalDecoder, window_size: int) -> Generator[str, Any, Any]:
+        """
+        Like iter_text_windows(), for a compressed file read as a stream. The bytes
+        after the last newline of a window are carried over to the next one.
+        """
+        with open_decompressed(self.file_path, self._compression) as f:
+            carry = b''
+            while True:
+                block = f.read(window_size)
+                if not block:
+                    break
+                block = carry + block
+                newline = block.rfind(b'\n')
+                if newline == -1:
+                    carry = b''
+                else:
+                    block, carry = block[:newline + 1], block[newline + 1:]
+                window = decoder.decode(block)
+                if window:
+                    yield window
+            window = decoder.decode(carry, final=True)
+            if window:
+                yield window
@@ -0,0 +1,190 @@
+"""
+Module: parallel
+
+This module fans document loading and splitting out to a pool of worker processes.
+Loading is where the CPU time goes for formats like PDF, so each job loads and
+chunks one source (usually one file) in a worker. Results are handed back in the
+order the jobs were submitted, which keeps cursor based streams correct.
+
+Workers send their chunks back in batches through a bounded queue per job and
+block when it is full, so the chunks held in memory are bounded by
+max_in_flight * (max_queued_batches + 1) * batch_size, however large the files.
+When the caller fails or stops iterating, a shared stop event tells the workers
+blocked on their queues to give up, so the pool can shut down.
+
+Classes:
+    SplitJob: Arguments for DocumentSplitterFactory.create() describing one job.
+
+Functions:
+    parallel_load_and_chunk: Loads and chunks jobs in worker processes, in order.
+"""
+
+import os
+import queue
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Generator, Iterable, NamedTuple, Optional, Tuple
+from verified_sources.common.doc_splitters.dedup import NearDuplicateFilter
+
+
+class SplitJob(NamedTuple):
+    """
+    Arguments for DocumentSplitterFactory.create() describing one source to load and
+    chunk. Everything in it must be picklable, so the chunk cache is referred to by
+    use_chunk_cache and each process opens the default cache itself.
+    """
+    loader_key: Any
+    splitter_key: Any
+    loader_config: Optional[dict] = None
+    splitter_config: Optional[dict] = None
+    stream_window_size: Optional[int] = None
+    use_chunk_cache: bool = False
+    chunk_views: bool = False
+
+
+def _create_doc_splitter(job: SplitJob):
+    from verified_sources.common.doc_splitters.factory import doc_splitter_factory
+    from verified_sources.common.doc_splitters.cache import get_default_chunk_cache
+    return doc_splitter_factory.create(
+        loader_key=job.loader_key,
+        splitter_key=job.splitter_key,
+        loader_config=job.loader_config,
+        splitter_config=job.splitter_config,
+        stream_window_size=job.stream_window_size,
+        chunk_cache=get_default_chunk_cache() if job.use_chunk_cache else None,
+        chunk_views=job.chunk_views,
+    )
+
+
+def _put(chunk_queue: Any, item: Any, stop: Any) -> bool:
+    """
+    Puts item on chunk_queue, waiting for room until stop is set. Returns whether
+    the item was put.
+    """
+    while not stop.is_set():
+        try:
+            chunk_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _run_split_job(job: SplitJob, chunk_queue: Any, batch_size: int, stop: Any) -> None:
+    """
+    Worker entry point: loads and chunks one job and puts its chunks on chunk_queue
+    in batches of batch_size, followed by None once the job is done or has failed.
+    Gives up as soon as stop is set.
+    """
+    try:
+        batch = []
+        for chunk in _create_doc_splitter(job).load_and_chunk():
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                if not _put(chunk_queue, batch, stop):
+                    return
+                batch = []
+        if batch:
+            _put(chunk_queue, batch, stop)
+    finally:
+        _put(chunk_queue, None, stop)
+
+
+def _iter_job_chunks(future: Future, chunk_queue: Any) -> Generator[Any, Any, Any]:
+    """
+    Yields the chunks a worker puts on chunk_queue, and raises the worker's
+    exception if it failed, including when its process died.
+    """
+    while True:
+        try:
+            batch = chunk_queue.get(timeout=1)
+        except queue.Empty:
+            if future.done() and future.exception() is not None:
+                future.result()
+            continue
+        if batch is None:
+            future.result()
+            return
+        yield from batch
+
+
+def _filter_chunks(chunks: Iterable[Any], near_duplicate_filter: Optional[NearDuplicateFilter]) -> Iterable[Any]:
+    if near_duplicate_filter is None:
+        return chunks
+    return near_duplicate_filter.filter(chunks)
+
+
+def parallel_load_and_chunk(
+    jobs: Iterable[Tuple[Any, SplitJob]],
+    max_workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    near_duplicate_filter: Optional[NearDuplicateFilter] = None,
+    batch_size: int = 256,
+    max_queued_batches: int = 4,
+) -> Generator[Tuple[Any, Iterable[Any]], Any, Any]:
+    """
+    Loads and chunks jobs in a pool of worker processes.
+
+    jobs is consumed lazily: at most max_in_flight jobs are submitted but not yet
+    handed back at any time, so callers can download files inside the jobs iterable
+    without fetching the whole bucket up front. The chunks of a job are streamed
+    from its worker and must be consumed before the next pair is requested; the
+    ones left over are discarded.
+
+    Parameters:
+        jobs (Iterable[Tuple[Any, SplitJob]]): Pairs of (tag, job). The tag is passed
+            back untouched with the job's chunks and may be anything.
+        max_workers (Optional[int]): Number of worker processes. With 1 or less the jobs
+            are run lazily in the calling process, without a pool (default: None, which
+            runs serially).
+        max_in_flight (Optional[int]): Maximum number of jobs submitted ahead of the one
+            being handed back (default: 2 * max_workers).
+        near_duplicate_filter (Optional[NearDuplicateFilter]): Filter applied to the chunks of
+            all jobs in the calling process, so near-duplicates are found across jobs
+            (default: None).
+        batch_size (int): Number of chunks a worker sends back at a time (default: 256).
+        max_queued_batches (int): Number of batches a worker may send ahead of the caller
+            before it blocks (default: 4).
+
+    Yields:
+        Generator[Tuple[Any, Iterable[Any]], Any, Any]: (tag, chunks) pairs in the order
+            of jobs.
+    """
+    if not max_workers or max_workers <= 1:
+        for tag, job in jobs:
+            yield tag, _filter_chunks(_create_doc_splitter(job).load_and_chunk(), near_duplicate_filter)
+        return
+
+    max_workers = min(max_workers, os.cpu_count() or 1)
+    max_in_flight = max(max_in_flight or 2 * max_workers, 1)
+    in_flight = deque()
+
+    def hand_back() -> Generator[Tuple[Any, Iterable[Any]], Any, Any]:
+        _tag, future, chunk_queue = in_flight.popleft()
+        chunks = _iter_job_chunks(future, chunk_queue)
+        yield _tag, _filter_chunks(chunks, near_duplicate_filter)
+        # Drain what the caller left, so the worker is not blocked on a full queue.
+        for _ in chunks:
+            pass
+
+    # Jobs run in submission order, so the job being handed back is always running
+    # or done: workers blocked on the queues of later jobs cannot starve it.
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=max_workers) as executor:
+        stop = manager.Event()
+        try:
+            for tag, job in jobs:
+                chunk_queue = manager.Queue(max(max_queued_batches, 1))
+                future = executor.submit(_run_split_job, job, chunk_queue, batch_size, stop)
+                in_flight.append((tag, future, chunk_queue))
+                if len(in_flight) >= max_in_flight:
+                    yield from hand_back()
+            while in_flight:
+                yield from hand_back()
+        except BaseException:
+            # A failed job or a caller that stopped early (GeneratorExit): release the
+            # workers blocked on full queues before the pool waits for them.
+            stop.set()
+            for _, future, _ in in_flight:
+                future.cancel()
+            raise
@@ -0,0 +1,181 @@
+"""
+Module: html
+
+This module contains an HTML splitter that emits one chunk per header scoped
+section while the page is being parsed. It drives lxml's incremental HTML parser
+with a parser target, so no DOM is built and a section is handed out as soon as
+the next header starts, instead of after the whole page has been transformed.
+
+Classes:
+    HTMLSectionStreamSplitter: Splits HTML into header scoped sections.
+"""
+
+import re
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
+
+DEFAULT_HEADERS_TO_SPLIT_ON = [('h1', 'Header 1'), ('h2', 'Header 2'), ('h3', 'Header 3')]
+
+# Elements whose text is never part of a section.
+_SKIPPED_TAGS = frozenset(['head', 'script', 'style', 'noscript', 'template', 'svg'])
+# Elements that start a new line of text.
+_BLOCK_TAGS = frozenset([
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'details', 'div', 'dl', 'dt',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+    'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary', 'table', 'tr', 'ul',
+])
+_SPACES = re.compile(r'[^\S\n]+')
+_NEWLINES = re.compile(r'\s*\n\s*')
+
+
+def _normalize(text: str) -> str:
+    return _NEWLINES.sub('\n', _SPACES.sub(' ', text)).strip()
+
+
+class _SectionTarget:
+    """
+    lxml parser target collecting the text of the current section and the headers
+    in scope. Finished sections are appended to sections as (text, metadata) pairs.
+    """
+
+    def __init__(self, headers_to_split_on: List[Tuple[str, str]]) -> None:
+        self._header_names = dict(headers_to_split_on)
+        self._header_levels = {tag: int(tag[1]) for tag in self._header_names}
+        self._headers: Dict[str, str] = {}
+        self._parts: List[str] = []
+        self._header_tag: Optional[str] = None
+        self._header_parts: List[str] = []
+        self._skip_depth = 0
+        self.sections: List[Tuple[str, dict]] = []
+
+    def start(self, tag: str, attrib: dict) -> None:
+        if self._skip_depth or tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+            return
+        if tag in self._header_names and self._header_tag is None:
+            self._flush()
+            self._header_tag = tag
+            self._header_parts = []
+        elif tag in _BLOCK_TAGS:
+            self._parts.append('\n')
+
+    def end(self, tag: str) -> None:
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        if tag == self._header_tag:
+            header_text = _normalize(''.join(self._header_parts))
+            level = self._header_levels[tag]
+            self._headers = {
+                _tag: text for _tag, text in self._headers.items() if self._header_levels[_tag] < level}
+            if header_text:
+                self._headers[tag] = header_text
+                self._parts.append(header_text + '\n')
+            self._header_tag = None
+        elif tag in _BLOCK_TAGS:
+            self._parts.append('\n')
+
+    def data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        if self._header_tag is not None:
+            self._header_parts.append(data)
+        else:
+            self._parts.append(data)
+
+    def comment(self, text: str) -> None:
+        pass
+
+    def close(self) -> None:
+        self._flush()
+
+    def _flush(self) -> None:
+        text = _normalize(''.join(self._parts))
+        self._parts = []
+        if text:
+            metadata = {self._header_names[tag]: header for tag, header in self._headers.items()}
+            self.sections.append((text, metadata))
+
+
+class HTMLSectionStreamSplitter:
+    """
+    Splits HTML into sections, each made of a header from headers_to_split_on and
+    the text up to the next such header. The section's page_content starts with its
+    header and its metadata maps the names of all headers in scope to their text,
+    like langchain's HTMLSectionSplitter.
+
+    Sections longer than chunk_size are split further with a
+    RecursiveCharacterTextSplitter, keeping their metadata.
+
+    Methods:
+        split_text: Splits an HTML string.
+        split_stream: Splits HTML read as a stream of text windows.
+    """
+
+    def __init__(self,
+        headers_to_split_on: Optional[List[Tuple[str, str]]] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: int = 0,
+        **kwargs: Any
+    ) -> None:
+        """
+        Initializes a new HTMLSectionStreamSplitter object.
+
+        Parameters:
+            headers_to_split_on (Optional[List[Tuple[str, str]]]): Pairs of (tag, metadata key)
+                of the headers that start a section (default: h1 to h3).
+            chunk_size (Optional[int]): Maximum length of a chunk. Longer sections are split
+                further; None keeps whole sections.
+            chunk_overlap (int): Overlap between the chunks of a split section.
+            **kwargs: Passed to RecursiveCharacterTextSplitter.
+        """
+        headers_to_split_on = headers_to_split_on or DEFAULT_HEADERS_TO_SPLIT_ON
+        self.headers_to_split_on = [(tag.lower(), name) for tag, name in headers_to_split_on]
+        for tag, _ in self.headers_to_split_on:
+            if not re.fullmatch(r'h[1-6]', tag):
+                raise ValueError(f"Cannot split HTML on '{tag}', only header tags h1 to h6 are supported")
+        self._section_splitter = None
+        if chunk_size:
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
+            self._section_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size, chunk_overlap=chunk_overlap, **kwargs)
+
+    def split_text(self, text: str) -> List[Any]:
+        """
+        Splits an HTML string.
+
+        Returns:
+            List[Any]: A list of langchain Document objects, one per section or section chunk.
+        """
+        return list(self.split_stream(lambda: [text]))
+
+    def split_stream(self, open_windows: Any) -> Generator[Any, Any, Any]:
+        """
+        Splits HTML read as a stream of text windows, yielding each section as soon
+        as the header of the next one has been parsed.
+
+        Parameters:
+            open_windows (TextWindows): Callable returning an iterable of text windows.
+
+        Yields:
+            Generator[Any, Any, Any]: A generator yielding langchain Document objects.
+        """
+        from lxml import etree
+
+        target = _SectionTarget(self.headers_to_split_on)
+        parser = etree.HTMLParser(target=target, remove_comments=True)
+        for window in open_windows():
+            parser.feed(window)
+            yield from self._drain(target)
+        parser.close()
+        yield from self._drain(target)
+
+    def _drain(self, target: _SectionTarget) -> Iterable[Any]:
+        from langchain_core.documents import Document as LCDocument
+
+        sections, target.sections = target.sections, []
+        for text, metadata in sections:
+            if self._section_splitter is None:
+                yield LCDocument(page_content=text, metadata=metadata)
+                continue
+            for chunk in self._section_splitter.split_text(text):
+                yield LCDocument(page_content=chunk, metadata=dict(metadata))
@@ -0,0 +1,405 @@
+"""
+Module: json_stream
+
+This module contains a JSON splitter that walks a document as a stream of parse
+events and yields size bounded chunks while it reads, so memory stays bounded by
+the chunk size instead of by the size of the document.
+
+Subtrees that fit in a chunk are kept whole, like RecursiveJsonSplitter does.
+Objects and arrays that do not fit are descended into; only the events of the
+outermost subtree that might still fit are buffered at any time.
+
+Classes:
+    StreamingJsonSplitter: Splits JSON into chunks of nested objects with their JSON paths.
+"""
+
+import re
+import json
+from typing import Any, Generator, Iterable, List, Optional, Tuple, Union
+
+_dumps = json.JSONEncoder().encode
+
+_SCALAR_EVENTS = frozenset(['null', 'boolean', 'integer', 'double', 'number', 'string'])
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+Path = Tuple[Union[str, int], ...]
+
+
+def json_path(path: Path) -> str:
+    """
+    Formats a path of object keys and array indexes as a JSONPath expression.
+    """
+    parts = ['$']
+    for key in path:
+        if isinstance(key, int):
+            parts.append(f'[{key}]')
+        elif _IDENTIFIER.fullmatch(key):
+            parts.append(f'.{key}')
+        else:
+            parts.append(f'[{json.dumps(key)}]')
+    return ''.join(parts)
+
+
+def _iter_value_events(value: Any) -> Generator[Tuple[str, Any], Any, Any]:
+    """
+    Yields ijson basic_parse style events for an already parsed value.
+    """
+    if isinstance(value, dict):
+        yield 'start_map', None
+        for key, item in value.items():
+            yield 'map_key', key
+            yield from _iter_value_events(item)
+        yield 'end_map', None
+    elif isinstance(value, (list, tuple)):
+        yield 'start_array', None
+        for item in value:
+            yield from _iter_value_events(item)
+        yield 'end_array', None
+    elif value is None:
+        yield 'null', None
+    elif isinstance(value, bool):
+        yield 'boolean', value
+    elif isinstance(value, str):
+        yield 'string', value
+    else:
+        yield 'number', value
+
+
+def _event_size(event: str, value: Any) -> int:
+    """
+    Approximate number of characters an event adds to the serialized JSON.
+    """
+    if event == 'string' or event == 'map_key':
+        # Quotes and a separator; escapes are left to the exact count in _ChunkPacker.
+        return len(value) + 3
+    if event in _SCALAR_EVENTS:
+        return 5 if value is None or isinstance(value, bool) else len(str(value)) + 1
+    return 1
+
+
+def _build(events: List[Tuple[str, Any]]) -> Any:
+    """
+    Builds the value described by a complete sequence of events.
+    """
+    root = []
+    stack = [root]
+    keys = [None]
+    for event, value in events:
+        container = stack[-1]
+        if event == 'map_key':
+            keys[-1] = value
+            continue
+        if event in ('end_map', 'end_array'):
+            stack.pop()
+            keys.pop()
+            continue
+        if event == 'start_map':
+            item = {}
+        elif event == 'start_array':
+            item = []
+        else:
+            item = value
+        if isinstance(container, dict):
+            container[keys[-1]] = item
+        else:
+            container.append(item)
+        if event in ('start_map', 'start_array'):
+            stack.append(item)
+            keys.append(None)
+    return root[0]
+
+
+class _Frame:
+    """
+    An open object or array.
+    """
+    __slots__ = ('path', 'is_array', 'key', 'start', 'start_size')
+
+    def __init__(self, path: Path, is_array: bool, start: int, start_size: int) -> None:
+        self.path = path
+        self.is_array = is_array
+        # Key or index of the child being read.
+        self.key = 0 if is_array else None
+        # Position of the frame's start event in the buffer, and buffered size before it.
+        self.start = start
+        self.start_size = start_size
+
+
+class _ChunkPacker:
+    """
+    Packs (path, value) units into nested objects of at most max_chunk_size characters.
+    """
+
+    def __init__(self, max_chunk_size: int, convert_lists: bool) -> None:
+        self._max_chunk_size = max_chunk_size
+        self._convert_lists = convert_lists
+        self._chunk = {}
+        self._paths = []
+        self._size = 2
+        self.chunks: List[Tuple[Any, List[str]]] = []
+
+    def add(self, path: Path, value: Any) -> None:
+        if not path:
+            # The whole document fits in one chunk.
+            self.flush()
+            self.chunks.append((value, [json_path(path)]))
+            return
+        if self._convert_lists:
+            value = self._lists_to_dicts(value)
+        size = self._added_size(path, value)
+        if self._paths and self._size + size > self._max_chunk_size:
+            self.flush()
+            size = self._added_size(path, value)
+        node = self._chunk
+        for key in path[:-1]:
+            node = node.setdefault(str(key), {})
+        node[str(path[-1])] = value
+        self._paths.append(json_path(path))
+        self._size += size
+
+    def _added_size(self, path: Path, value: Any) -> int:
+        """
+        Number of characters adding value at path adds to the serialized chunk.
+        """
+        size = len(_dumps(value)) + len(_dumps(str(path[-1]))) + 4
+        node = self._chunk
+        for key in path[:-1]:
+            node = node.get(str(key)) if node is not None else None
+            if node is None:
+                size += len(_dumps(str(key))) + 6
+        return size
+
+    def flush(self) -> None:
+        if self._paths:
+            self.chunks.append((self._chunk, self._paths))
+        self._chunk = {}
+        self._paths = []
+        self._size = 2
+
+    def _lists_to_dicts(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: self._lists_to_dicts(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return {str(i): self._lists_to_dicts(item) for i, item in enumerate(value)}
+        return value
+
+
+class _EventSplitter:
+    """
+    Consumes parse events of one document and packs its subtrees into chunks.
+
+    frames holds every open container. The first cut of them have been found to be
+    too large for a chunk and are descended into; frames[cut], if any, is the
+    outermost open subtree that may still fit, and buffer holds its events.
+    """
+
+    def __init__(self, packer: _ChunkPacker, max_chunk_size: int) -> None:
+        self._packer = packer
+        self._max_chunk_size = max_chunk_size
+        self._frames: List[_Frame] = []
+        self._cut = 0
+        self._buffer: List[Tuple[str, Any]] = []
+        self._buffer_size = 0
+
+    def feed(self, events: Iterable[Tuple[str, Any]]) -> None:
+        for event, value in events:
+            if event == 'map_key':
+                self._frames[-1].key = value
+                if len(self._frames) > self._cut:
+                    self._append(event, value)
+                continue
+
+            if event in ('start_map', 'start_array'):
+                frame = _Frame(self._child_path(), event == 'start_array', len(self._buffer), self._buffer_size)
+                self._frames.append(frame)
+                self._append(event, value)
+                continue
+
+            if event in ('end_map', 'end_array'):
+                frame = self._frames.pop()
+                if len(self._frames) < self._cut:
+                    # A container that was descended into is done.
+                    self._cut -= 1
+                elif len(self._frames) > self._cut:
+                    self._append(event, value)
+                else:
+                    # The outermost buffered subtree is complete and fits.
+                    self._buffer.append((event, value))
+                    self._buffer_size += _event_size(event, value)
+                    self._packer.add(frame.path, _build(self._buffer))
+                    self._buffer = []
+                    self._buffer_size = 0
+                self._next_child()
+                continue
+
+            if len(self._frames) == self._cut:
+                self._packer.add(self._child_path(), value)
+            else:
+                self._append(event, value)
+            self._next_child()
+
+    def _child_path(self) -> Path:
+        if not self._frames:
+            return ()
+        parent = self._frames[-1]
+        return parent.path + (parent.key,)
+
+    def _next_child(self) -> None:
+        if self._frames and self._frames[-1].is_array:
+            self._frames[-1].key += 1
+
+    def _append(self, event: str, value: Any) -> None:
+        self._buffer.append((event, value))
+        self._buffer_size += _event_size(event, value)
+        while self._cut < len(self._frames) and self._buffer_size > self._max_chunk_size:
+            self._descend()
+
+    def _descend(self) -> None:
+        """
+        Marks the outermost buffered subtree as too large: its complete children are
+        packed and its open child, if any, becomes the outermost buffered subtree.
+        """
+        frame = self._frames[self._cut]
+        self._cut += 1
+        buffer = self._buffer
+        depth = 0
+        key = 0 if frame.is_array else None
+        child_start = None
+        i = 1
+        while i < len(buffer):
+            event, value = buffer[i]
+            if depth == 0:
+                if event == 'map_key':
+                    key = value
+                elif event in _SCALAR_EVENTS:
+                    self._packer.add(frame.path + (key,), value)
+                    key = key + 1 if frame.is_array else key
+                elif event in ('start_map', 'start_array'):
+                    child_start = i
+                    depth = 1
+            elif event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+                if depth == 0:
+                    child = buffer[child_start:i + 1]
+                    self._packer.add(frame.path + (key,), _build(child))
+                    key = key + 1 if frame.is_array else key
+                    child_start = None
+            i += 1
+
+        if child_start is None:
+            self._buffer = []
+            self._buffer_size = 0
+            return
+        # The open child keeps its events; rebase the buffered frames on the new buffer.
+        child = self._frames[self._cut]
+        offset, size_offset = child.start - frame.start, child.start_size - frame.start_size
+        self._buffer = buffer[child_start:]
+        self._buffer_size -= size_offset
+        for open_frame in self._frames[self._cut:]:
+            open_frame.start -= offset
+            open_frame.start_size -= size_offset
+
+    def close(self) -> None:
+        self._packer.flush()
+
+
+class StreamingJsonSplitter:
+    """
+    Splits JSON into chunks of about max_chunk_size characters, each a nested object
+    holding some of the document's subtrees at their original location. Chunks are
+    returned as langchain Documents with the JSON paths of their subtrees in their
+    metadata as json_paths; chunk_text_and_metadata() turns them into record text
+    and metadata.
+
+    Methods:
+        split_json: Splits a parsed JSON value into objects.
+        split_text: Splits a JSON string or parsed value.
+        split_stream: Splits JSON read as a stream of text windows.
+    """
+
+    def __init__(self,
+        max_chunk_size: int = 2000,
+        min_chunk_size: Optional[int] = None,
+        convert_lists: bool = False,
+    ) -> None:
+        """
+        Initializes a new StreamingJsonSplitter object.
+
+        Parameters:
+            max_chunk_size (int): Maximum size of a chunk in characters, exceeded only by
+                single values that are larger on their own. Subtrees are kept whole, so a
+                chunk is closed whenever the next subtree does not fit, whatever its size.
+            min_chunk_size (Optional[int]): Accepted so RecursiveJsonSplitter configurations keep
+                working, and ignored: honoring it would let chunks grow past max_chunk_size.
+            convert_lists (bool): Store the arrays inside chunks as objects keyed by index.
+        """
+        self.max_chunk_size = max_chunk_size
+        self.convert_lists = convert_lists
+
+    def split_json(self, json_data: Any) -> List[Any]:
+        """
+        Splits a parsed JSON value into a list of JSON values.
+        """
+        return [chunk for chunk, _ in self._split_events([_iter_value_events(json_data)])]
+
+    def split_text(self, json_data: Union[str, Any]) -> List[Any]:
+        """
+        Splits a JSON string, or an already parsed value.
+
+        Returns:
+            List[Any]: A list of langchain Document objects.
+        """
+        if isinstance(json_data, str):
+            json_data = json.loads(json_data)
+        return list(self._documents(self._split_events([_iter_value_events(json_data)])))
+
+    def split_stream(self, open_windows: Any) -> Generator[Any, Any, Any]:
+        """
+        Splits JSON read as a stream of text windows with ijson, yielding chunks as
+        soon as they are complete.
+
+        Parameters:
+            open_windows (TextWindows): Callable returning an iterable of text windows.
+
+        Yields:
+            Generator[Any, Any, Any]: A generator yielding langchain Document objects.
+        """
+        try:
+            import ijson
+        except ImportError:
+            raise ImportError(
+                'Could not import ijson python package. '
+                'Please install it with `pip install ijson`.'
+            )
+        yield from self._documents(self._split_events(self._iter_stream_events(ijson, open_windows())))
+
+    @staticmethod
+    def _iter_stream_events(ijson: Any, windows: Iterable[str]) -> Generator[List[Tuple[str, Any]], Any, Any]:
+        events = ijson.sendable_list()
+        coro = ijson.basic_parse_coro(events, use_float=True)
+        for window in windows:
+            coro.send(window.encode('utf-8'))
+            if events:
+                yield events[:]
+                del events[:]
+        coro.close()
+        if events:
+            yield events[:]
+
+    def _split_events(self, event_batches: Iterable[Iterable[Tuple[str, Any]]]) -> Generator[Tuple[Any, List[str]], Any, Any]:
+        packer = _ChunkPacker(self.max_chunk_size, self.convert_lists)
+        splitter = _EventSplitter(packer, self.max_chunk_size)
+        for events in event_batches:
+            splitter.feed(events)
+            yield from packer.chunks
+            packer.chunks = []
+        splitter.close()
+        yield from packer.chunks
+
+    @staticmethod
+    def _documents(chunks: Iterable[Tuple[Any, List[str]]]) -> Generator[Any, Any, Any]:
+        from langchain_core.documents import Document as LCDocument
+        for chunk, paths in chunks:
+            yield LCDocument(page_content=json.dumps(chunk), metadata={'json_paths': paths})
@@ -0,0 +1,292 @@
+"""
+Module: semantic
+
+This module contains a splitter that cuts text where the meaning shifts, in the
+spirit of langchain_experimental's SemanticChunker. Sentences are embedded in
+batches by a local embedder, the distances between neighbouring sentences are
+computed with vectorized NumPy cosine similarity, and the text is cut where the
+distance stands out. Embeddings are cached by sentence hash, so splitting
+unchanged documents again does not call the embedder.
+
+Classes:
+    HashingEmbedder: Deterministic bag of words embedder based on feature hashing.
+    SemanticTextSplitter: Splits text at semantic breakpoints.
+
+Functions:
+    load_embedder: Loads an embedder once per process.
+"""
+
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from verified_sources.common.doc_splitters.hashing import split_words, word_hash
+
+BatchEmbedder = Callable[[Sequence[str]], np.ndarray]
+
+# Default breakpoint_threshold_amount of each breakpoint_threshold_type.
+BREAKPOINT_DEFAULTS = {
+    'percentile': 95,
+    'standard_deviation': 3,
+    'interquartile': 1.5,
+    'gradient': 95,
+}
+
+
+class HashingEmbedder:
+    """
+    Embeds texts as L2 normalized bags of words, hashing every lowercased word to one
+    of dimensions signed buckets. It needs no model and is deterministic across
+    processes, which makes it suitable for tests and as a cheap lexical baseline.
+    """
+
+    def __init__(self, dimensions: int = 512) -> None:
+        """
+        Initializes a new HashingEmbedder object.
+
+        Parameters:
+            dimensions (int): Size of the embeddings.
+        """
+        self.dimensions = dimensions
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        rows, features = [], []
+        for row, text in enumerate(texts):
+            words = split_words(text)
+            rows.extend([row] * len(words))
+            features.extend(map(word_hash, words))
+        embeddings = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        if features:
+            features = np.fromiter(features, dtype=np.uint64, count=len(features))
+            columns = (features % np.uint64(self.dimensions)).astype(np.intp)
+            signs = np.where(features >> np.uint64(63), -1.0, 1.0).astype(np.float32)
+            np.add.at(embeddings, (np.asarray(rows, dtype=np.intp), columns), signs)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.where(norms == 0, 1, norms)
+
+
+@lru_cache(maxsize=4)
+def load_embedder(model_name: Optional[str] = None, dimensions: int = 512, device: str = 'cpu') -> BatchEmbedder:
+    """
+    Loads an embedder and returns a function embedding a batch of texts. Embedders
+    are cached, so each model is loaded only once per process.
+
+    Parameters:
+        model_name (Optional[str]): Name or local path of a sentence-transformers model,
+            e.g. 'all-MiniLM-L6-v2'. A HashingEmbedder is used when not given.
+        dimensions (int): Size of the embeddings of the HashingEmbedder.
+        device (str): Device the model runs on.
+
+    Returns:
+        BatchEmbedder: A function mapping a batch of texts to a (texts, dimensions) array.
+    """
+    if model_name is None:
+        return HashingEmbedder(dimensions)
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        raise ImportError(
+            'Could not import sentence_transformers python package. '
+            'Please install it with `pip install sentence-transformers` or `poetry install -E semantic`.'
+        )
+    model = SentenceTransformer(model_name, device=device)
+
+    def embed(texts: Sequence[str]) -> np.ndarray:
+        return model.encode(list(texts), convert_to_numpy=True, normalize_embeddings=True)
+    return embed
+
+
+class SemanticTextSplitter:
+    """
+    Splits text into sentences and groups consecutive sentences into chunks, cutting
+    where the cosine distance between neighbouring sentences is above a threshold
+    derived from all the distances of the text, as SemanticChunker does.
+
+    Every sentence is embedded once; the embedding of a sentence with its buffer_size
+    neighbours on each side is the mean of their embeddings, computed for all
+    sentences at once from shifted copies of the embedding matrix. Chunks are
+    slices of the original text.
+
+    Instances are cached and shared by the factory, so the embedding cache and its
+    counters are guarded by a lock; the embedder itself is called outside of it.
+    """
+
+    def __init__(self,
+        model_name: Optional[str] = None,
+        embedder: Optional[BatchEmbedder] = None,
+        dimensions: int = 512,
+        breakpoint_threshold_type: str = 'percentile',
+        breakpoint_threshold_amount: Optional[float] = None,
+        buffer_size: int = 1,
+        sentence_split_regex: str = r'(?<=[.?!])\s+',
+        min_chunk_size: Optional[int] = None,
+        batch_size: int = 256,
+        embedding_cache_size: int = 100_000,
+    ) -> None:
+        """
+        Initializes a new SemanticTextSplitter object.
+
+        Parameters:
+            model_name (Optional[str]): sentence-transformers model to embed sentences with
+                (default: a HashingEmbedder).
+            embedder (Optional[BatchEmbedder]): Function embedding a batch of texts, used
+                instead of model_name.
+            dimensions (int): Size of the embeddings of the HashingEmbedder.
+            breakpoint_threshold_type (str): 'percentile', 'standard_deviation',
+                'interquartile' or 'gradient'.
+            breakpoint_threshold_amount (Optional[float]): Parameter of the threshold type,
+                see BREAKPOINT_DEFAULTS.
+            buffer_size (int): Number of neighbouring sentences on each side embedded
+                together with a sentence.
+            sentence_split_regex (str): Regular expression matching the gaps between sentences.
+            min_chunk_size (Optional[int]): Breakpoints leaving a chunk shorter than this many
+                characters are ignored.
+            batch_size (int): Number of sentences embedded per call to the embedder.
+            embedding_cache_size (int): Number of sentence embeddings kept in the cache.
+        """
+        if breakpoint_threshold_type not in BREAKPOINT_DEFAULTS:
+            raise ValueError(
+                f"Unknown breakpoint_threshold_type '{breakpoint_threshold_type}', "
+                f"expected one of {', '.join(BREAKPOINT_DEFAULTS)}")
+        self._embed = embedder or load_embedder(model_name, dimensions)
+        self.breakpoint_threshold_type = breakpoint_threshold_type
+        self.breakpoint_threshold_amount = (
+            BREAKPOINT_DEFAULTS[breakpoint_threshold_type]
+            if breakpoint_threshold_amount is None else breakpoint_threshold_amount)
+        self.buffer_size = buffer_size
+        self._sentence_gap = re.compile(sentence_split_regex)
+        self.min_chunk_size = min_chunk_size
+        self.batch_size = batch_size
+        self.embedding_cache_size = embedding_cache_size
+        self._embeddings: 'OrderedDict[bytes, np.ndarray]' = OrderedDict()
+        self._embeddings_lock = threading.Lock()
+        self.embedding_cache_hits = 0
+        self.embedding_cache_misses = 0
+
+    def split_text(self, text: str) -> List[str]:
+        """
+        Splits text at semantic breakpoints.
+
+        Parameters:
+            text (str): The text to split.
+
+        Returns:
+            List[str]: The chunks.
+        """
+        return self.split_many([text])[0]
+
+    def split_many(self, texts: Sequence[str]) -> List[List[str]]:
+        """
+        Splits a batch of texts. The sentences of all the texts are embedded together,
+        in batches of batch_size.
+
+        Parameters:
+            texts (Sequence[str]): The texts to split.
+
+        Returns:
+            List[List[str]]: The chunks of each text, in the order of texts.
+        """
+        spans = [self._sentence_spans(text) for text in texts]
+        embeddings = self._embed_sentences([text[start:end] for text, text_spans in zip(texts, spans)
+                                            for start, end in text_spans])
+        results = []
+        offset = 0
+        for text, text_spans in zip(texts, spans):
+            text_embeddings = embeddings[offset:offset + len(text_spans)]
+            offset += len(text_spans)
+            results.append(self._chunks(text, text_spans, text_embeddings))
+        return results
+
+    def _sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Returns the (start, end) offsets of the non-blank sentences of text.
+        """
+        spans = []
+        start = 0
+        for gap in self._sentence_gap.finditer(text):
+            if gap.start() > start:
+                spans.append((start, gap.start()))
+            start = max(start, gap.end())
+        if start < len(text):
+            spans.append((start, len(text)))
+        return [(start, end) for start, end in spans if not text[start:end].isspace()]
+
+    def _embed_sentences(self, sentences: Sequence[str]) -> np.ndarray:
+        """
+        Returns the embeddings of sentences, embedding the ones missing from the cache
+        in batches.
+        """
+        keys = [hashlib.blake2b(sentence.encode(), digest_size=16).digest() for sentence in sentences]
+        missing: Dict[bytes, str] = {}
+        with self._embeddings_lock:
+            found = {key: self._embeddings[key] for key in keys if key in self._embeddings}
+            for key, sentence in zip(keys, sentences):
+                if key not in found:
+                    missing[key] = sentence
+            self.embedding_cache_misses += len(missing)
+            self.embedding_cache_hits += len(keys) - len(missing)
+
+        missing_keys = list(missing)
+        for start in range(0, len(missing_keys), self.batch_size):
+            batch = missing_keys[start:start + self.batch_size]
+            vectors = np.asarray(self._embed([missing[key] for key in batch]), dtype=np.float32)
+            found.update(zip(batch, vectors))
+
+        with self._embeddings_lock:
+            for key in keys:
+                self._embeddings[key] = found[key]
+                self._embeddings.move_to_end(key)
+            while len(self._embeddings) > self.embedding_cache_size:
+                self._embeddings.popitem(last=False)
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def _distances(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Returns the cosine distances between the buffered embeddings of consecutive
+        sentences.
+        """
+        count, buffer_size = len(embeddings), self.buffer_size
+        padded = np.zeros((count + 2 * buffer_size, embeddings.shape[1]), dtype=np.float32)
+        padded[buffer_size:buffer_size + count] = embeddings
+        # The mean only rescales a window's sum, which cosine similarity ignores.
+        windows = padded[:count].copy()
+        for shift in range(1, 2 * buffer_size + 1):
+            windows += padded[shift:shift + count]
+        norms = np.linalg.norm(windows, axis=1)
+        windows /= np.where(norms == 0, 1, norms)[:, None]
+        return 1.0 - np.einsum('ij,ij->i', windows[:-1], windows[1:])
+
+    def _threshold(self, distances: np.ndarray) -> Tuple[float, np.ndarray]:
+        """
+        Returns the breakpoint threshold and the values compared against it.
+        """
+        amount = self.breakpoint_threshold_amount
+        if self.breakpoint_threshold_type == 'percentile':
+            return np.percentile(distances, amount), distances
+        if self.breakpoint_threshold_type == 'standard_deviation':
+            return np.mean(distances) + amount * np.std(distances), distances
+        if self.breakpoint_threshold_type == 'interquartile':
+            q1, q3 = np.percentile(distances, [25, 75])
+            return np.mean(distances) + amount * (q3 - q1), distances
+        gradient = np.gradient(distances) if len(distances) > 1 else distances
+        return np.percentile(gradient, amount), gradient
+
+    def _chunks(self, text: str, spans: List[Tuple[int, int]], embeddings: np.ndarray) -> List[str]:
+        if len(spans) < 2:
+            return [text[start:end] for start, end in spans]
+        threshold, values = self._threshold(self._distances(embeddings))
+        chunks = []
+        start = spans[0][0]
+        for breakpoint in np.flatnonzero(values > threshold):
+            end = spans[breakpoint][1]
+            if self.min_chunk_size and end - start < self.min_chunk_size:
+                continue
+            chunks.append(text[start:end])
+            start = spans[breakpoint + 1][0]
+        chunks.append(text[start:spans[-1][1]])
+        return chunks
@@ -0,0 +1,216 @@
+"""
+Module: spans
+
+This module contains a span based version of the langchain character and recursive
+character text splitters. It runs the same algorithm over (start, end) offsets in
+the text instead of over substrings, so the chunks come out as offsets without
+being copied, and produces exactly the chunks the wrapped splitter's split_text()
+returns.
+
+Classes:
+    SpanTextSplitter: Splits text into chunk offsets like the wrapped splitter.
+"""
+
+import re
+from typing import Any, List, Optional, Pattern, Tuple, Union
+
+# A chunk is an (start, end) span of the text, or a string for the rare chunk that
+# is not a slice of the text, e.g. pieces joined with a separator that was not the
+# text between them.
+Span = Union[Tuple[int, int], str]
+
+
+class SpanTextSplitter:
+    """
+    Splits text like a langchain CharacterTextSplitter or RecursiveCharacterTextSplitter,
+    returning spans of the text instead of chunk strings.
+
+    Pieces are only sliced out of the text when the splitter measures length with a
+    function other than len, or when a regular expression separator has to be
+    searched for in a piece of the text.
+
+    Methods:
+        from_splitter: Wraps a splitter if its chunks can be produced as spans.
+        split_spans: Splits text, or a part of it, into spans.
+    """
+
+    def __init__(self, splitter: Any) -> None:
+        """
+        Initializes a new SpanTextSplitter object.
+
+        Parameters:
+            splitter (Any): A langchain CharacterTextSplitter or RecursiveCharacterTextSplitter.
+        """
+        self._splitter = splitter
+        self._recursive = hasattr(splitter, '_separators')
+        self._measure_len = splitter._length_function is len
+        self._patterns = {}
+
+    @classmethod
+    def from_splitter(cls, splitter: Any) -> Optional["SpanTextSplitter"]:
+        """
+        Returns a SpanTextSplitter for splitter, or None if splitter is not a langchain
+        character based splitter.
+        """
+        from langchain_text_splitters import CharacterTextSplitter, RecursiveCharacterTextSplitter
+        if type(splitter) not in (CharacterTextSplitter, RecursiveCharacterTextSplitter):
+            return None
+        return cls(splitter)
+
+    def split_spans(self, text: str, start: int = 0, end: Optional[int] = None,
+                    separators: Optional[List[str]] = None) -> List[Span]:
+        """
+        Splits text[start:end] like the wrapped splitter's split_text() would.
+
+        Parameters:
+            text (str): The text.
+            start (int): Offset of the part of text to split.
+            end (Optional[int]): Offset just past the part of text to split (default: its end).
+            separators (Optional[List[str]]): Separators a recursive splitter tries, in
+                order (default: all of its separators).
+
+        Returns:
+            List[Span]: The chunks, as spans of text.
+        """
+        end = len(text) if end is None else end
+        splitter = self._splitter
+        if self._recursive:
+            return self._split_recursively(text, start, end, separators or splitter._separators)
+        separator = splitter._separator
+        pieces = self._pieces(text, start, end, separator)
+        return self._merge(text, pieces, '' if splitter._keep_separator else separator)
+
+    def _length(self, text: str, span: Tuple[int, int]) -> int:
+        if self._measure_len:
+            return span[1] - span[0]
+        return self._splitter._length_function(text[span[0]:span[1]])
+
+    def _pattern(self, separator: str) -> Pattern:
+        pattern = self._patterns.get(separator)
+        if pattern is None:
+            regex = separator if self._splitter._is_separator_regex else re.escape(separator)
+            pattern = self._patterns[separator] = re.compile(regex)
+        return pattern
+
+    def _matches(self, text: str, start: int, end: int, separator: str) -> List[Tuple[int, int]]:
+        """
+        Returns the spans of the matches of separator in text[start:end].
+        """
+        pattern = self._pattern(separator)
+        if not self._splitter._is_separator_regex:
+            # A literal separator matches a part of the text like the substring.
+            return [match.span() for match in pattern.finditer(text, start, end)]
+        # Anchors and lookarounds of a regular expression need the substring itself.
+        return [(start + s, start + e) for s, e in (match.span() for match in pattern.finditer(text[start:end]))]
+
+    def _contains(self, text: str, start: int, end: int, separator: str) -> bool:
+        if not self._splitter._is_separator_regex:
+            return self._pattern(separator).search(text, start, end) is not None
+        return self._pattern(separator).search(text[start:end]) is not None
+
+    def _pieces(self, text: str, start: int, end: int, separator: str) -> List[Tuple[int, int]]:
+        """
+        Returns the spans of the non empty pieces _split_text_with_regex() splits
+        text[start:end] into.
+        """
+        if not separator:
+            return [(i, i + 1) for i in range(start, end)]
+        matches = self._matches(text, start, end, separator)
+        if self._splitter._keep_separator:
+            # Every piece but the first starts with the separator that precedes it.
+            bounds = [start] + [s for s, _ in matches] + [end]
+            pieces = zip(bounds, bounds[1:])
+        else:
+            # Pieces are the text between the separators.
+            pieces = zip([start] + [e for _, e in matches], [s for s, _ in matches] + [end])
+        return [(s, e) for s, e in pieces if e > s]
+
+    def _split_recursively(self, text: str, start: int, end: int, separators: List[str]) -> List[Span]:
+        """
+        Span version of RecursiveCharacterTextSplitter._split_text().
+        """
+        splitter = self._splitter
+        separator = separators[-1]
+        new_separators = []
+        for i, _s in enumerate(separators):
+            if _s == '':
+                separator = _s
+                break
+            if self._contains(text, start, end, _s):
+                separator = _s
+                new_separators = separators[i + 1:]
+                break
+
+        final_chunks = []
+        good_pieces = []
+        join_separator = '' if splitter._keep_separator else separator
+        for piece in self._pieces(text, start, end, separator):
+            if self._length(text, piece) < splitter._chunk_size:
+                good_pieces.append(piece)
+                continue
+            if good_pieces:
+                final_chunks.extend(self._merge(text, good_pieces, join_separator))
+                good_pieces = []
+            if not new_separators:
+                final_chunks.append(piece)
+            else:
+                final_chunks.extend(self._split_recursively(text, piece[0], piece[1], new_separators))
+        if good_pieces:
+            final_chunks.extend(self._merge(text, good_pieces, join_separator))
+        return final_chunks
+
+    def _merge(self, text: str, pieces: List[Tuple[int, int]], separator: str) -> List[Span]:
+        """
+        Span version of TextSplitter._merge_splits().
+        """
+        splitter = self._splitter
+        chunk_size, chunk_overlap = splitter._chunk_size, splitter._chunk_overlap
+        separator_len = splitter._length_function(separator)
+        chunks = []
+        current: List[Tuple[int, int]] = []
+        lengths: List[int] = []
+        first = 0
+        total = 0
+        for piece in pieces:
+            _len = self._length(text, piece)
+            in_current = len(current) - first
+            if total + _len + (separator_len if in_current else 0) > chunk_size:
+                if in_current:
+                    chunk = self._join(text, current[first:], separator)
+                    if chunk is not None:
+                        chunks.append(chunk)
+                    while total > chunk_overlap or (
+                        total + _len + (separator_len if len(current) > first else 0) > chunk_size
+                        and total > 0
+                    ):
+                        total -= lengths[first] + (separator_len if len(current) - first > 1 else 0)
+                        first += 1
+            current.append(piece)
+            lengths.append(_len)
+            total += _len + (separator_len if len(current) - first > 1 else 0)
+        chunk = self._join(text, current[first:], separator)
+        if chunk is not None:
+            chunks.append(chunk)
+        return chunks
+
+    def _join(self, text: str, pieces: List[Tuple[int, int]], separator: str) -> Optional[Span]:
+        """
+        Span version of TextSplitter._join_docs(). The pieces are a slice of the text
+        when the text between every two of them is separator.
+        """
+        if not pieces:
+            return None
+        strip = self._splitter._strip_whitespace
+        separator_len = len(separator)
+        for (_, previous_end), (next_start, _) in zip(pieces, pieces[1:]):
+            if next_start - previous_end != separator_len or not text.startswith(separator, previous_end):
+                joined = separator.join(text[s:e] for s, e in pieces)
+                joined = joined.strip() if strip else joined
+                return joined or None
+        start, end = pieces[0][0], pieces[-1][1]
+        if strip:
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+        return (start, end) if end > start else None
@@ -0,0 +1,300 @@
+"""
+Module: streaming
+
+This module contains a streaming front end for the langchain character and
+recursive character text splitters. The source text is read in fixed size windows
+and split incrementally, so memory is bounded by the window size (plus the longest
+run of text without a separator) instead of by the size of the document. The chunks
+produced are identical to the ones the wrapped splitter's split_text() returns for
+the whole text, and can be produced as ChunkView objects carrying their offsets.
+
+Classes:
+    StreamingTextSplitter: Splits a stream of text windows like the wrapped splitter.
+
+Functions:
+    iter_file_windows: Reads a text file in windows of a fixed number of characters.
+"""
+
+import logging
+from collections import deque
+from typing import Any, Callable, Generator, Iterable, List, Optional, Tuple
+from verified_sources.common.doc_splitters.chunks import ChunkView
+from verified_sources.common.doc_splitters.splitters.spans import SpanTextSplitter
+
+logger = logging.getLogger(__name__)
+
+TextWindows = Callable[[], Iterable[str]]
+
+
+def iter_file_windows(file_path: str, window_size: int, encoding: Optional[str] = None) -> Generator[str, Any, Any]:
+    """
+    Reads a text file in windows of at most window_size characters.
+
+    Parameters:
+        file_path (str): Path of the file to read.
+        window_size (int): Number of characters per window.
+        encoding (Optional[str]): Encoding of the file, as accepted by open().
+
+    Yields:
+        Generator[str, Any, Any]: A generator yielding windows of text.
+    """
+    with open(file_path, encoding=encoding) as f:
+        while True:
+            window = f.read(window_size)
+            if not window:
+                break
+            yield window
+
+
+class _SplitMerger:
+    """
+    Incremental version of TextSplitter._merge_splits: splits are pushed one at a
+    time, with their offset in the text, and merged chunks are returned as soon as
+    they are final, as (chunk, offset) pairs. The offset is None for a chunk that
+    is not a slice of the text.
+    """
+
+    def __init__(self, splitter: Any, separator: str) -> None:
+        self._splitter = splitter
+        self._separator = separator
+        self._length_function = splitter._length_function
+        self._separator_len = self._length_function(separator)
+        self._chunk_size = splitter._chunk_size
+        self._chunk_overlap = splitter._chunk_overlap
+        self._current = deque()
+        self._starts = deque()
+        self._lengths = deque()
+        self._total = 0
+
+    def push(self, split: str, start: int) -> List[Tuple[str, Optional[int]]]:
+        docs = []
+        _len = self._length_function(split)
+        current, lengths = self._current, self._lengths
+        separator_len = self._separator_len
+        if self._total + _len + (separator_len if current else 0) > self._chunk_size:
+            if self._total > self._chunk_size:
+                logger.warning(
+                    f"Created a chunk of size {self._total}, "
+                    f"which is longer than the specified {self._chunk_size}"
+                )
+            if current:
+                doc = self._join()
+                if doc is not None:
+                    docs.append(doc)
+                while self._total > self._chunk_overlap or (
+                    self._total + _len + (separator_len if current else 0) > self._chunk_size
+                    and self._total > 0
+                ):
+                    self._total -= lengths[0] + (separator_len if len(current) > 1 else 0)
+                    current.popleft()
+                    self._starts.popleft()
+                    lengths.popleft()
+        current.append(split)
+        self._starts.append(start)
+        lengths.append(_len)
+        self._total += _len + (separator_len if len(current) > 1 else 0)
+        return docs
+
+    def finish(self) -> List[Tuple[str, Optional[int]]]:
+        doc = self._join()
+        self._current.clear()
+        self._starts.clear()
+        self._lengths.clear()
+        self._total = 0
+        return [doc] if doc is not None else []
+
+    def _join(self) -> Optional[Tuple[str, Optional[int]]]:
+        """
+        Joins the current splits like TextSplitter._join_docs() and works out the
+        offset of the result.
+        """
+        separator = self._separator
+        joined = separator.join(self._current)
+        doc = joined.strip() if self._splitter._strip_whitespace else joined
+        if not doc:
+            return None
+        starts, current = self._starts, self._current
+        # The joined splits are a slice of the text when the separator was the only
+        # text between them.
+        contiguous = all(
+            starts[i] + len(current[i]) + len(separator) == starts[i + 1] for i in range(len(current) - 1))
+        if not contiguous:
+            return doc, None
+        return doc, starts[0] + len(joined) - len(joined.lstrip()) if doc is not joined else starts[0]
+
+
+class StreamingTextSplitter:
+    """
+    Splits text read as a stream of windows exactly like the wrapped langchain
+    CharacterTextSplitter or RecursiveCharacterTextSplitter would split the whole text.
+
+    Only literal separators are supported, use from_splitter() to find out whether
+    a splitter can be streamed.
+
+    Methods:
+        from_splitter: Wraps a splitter if it can be streamed.
+        split_stream: Splits a stream of text windows.
+    """
+
+    def __init__(self, splitter: Any) -> None:
+        """
+        Initializes a new StreamingTextSplitter object.
+
+        Parameters:
+            splitter (Any): A langchain CharacterTextSplitter or RecursiveCharacterTextSplitter.
+        """
+        self._splitter = splitter
+        self._recursive = hasattr(splitter, '_separators')
+
+    @classmethod
+    def from_splitter(cls, splitter: Any) -> Optional["StreamingTextSplitter"]:
+        """
+        Returns a StreamingTextSplitter for splitter, or None if splitter is not a
+        character based splitter with literal separators.
+        """
+        from langchain_text_splitters import CharacterTextSplitter, RecursiveCharacterTextSplitter
+        if type(splitter) not in (CharacterTextSplitter, RecursiveCharacterTextSplitter):
+            return None
+        if splitter._is_separator_regex:
+            return None
+        return cls(splitter)
+
+    def split_stream(self, open_windows: TextWindows) -> Generator[str, Any, Any]:
+        """
+        Splits the text produced by open_windows.
+
+        Parameters:
+            open_windows (TextWindows): Callable returning a fresh iterable of text windows.
+                The recursive splitter calls it twice, once to find out which separators
+                occur in the text and once to split it.
+
+        Yields:
+            Generator[str, Any, Any]: A generator yielding split text fragments.
+        """
+        for chunk in self._split_stream(open_windows, with_offsets=False):
+            yield chunk
+
+    def split_stream_views(self, open_windows: TextWindows) -> Generator[ChunkView, Any, Any]:
+        """
+        Splits the text produced by open_windows like split_stream(), yielding every
+        chunk as a ChunkView with its offsets in the whole text. Each view holds its
+        own text, as the whole text is never in memory.
+
+        Parameters:
+            open_windows (TextWindows): Callable returning a fresh iterable of text windows.
+
+        Yields:
+            Generator[ChunkView, Any, Any]: A generator yielding ChunkView objects.
+        """
+        for chunk, start in self._split_stream(open_windows, with_offsets=True):
+            if start is None:
+                yield ChunkView.unlocated(chunk)
+            else:
+                yield ChunkView(chunk, start, start + len(chunk), _base=start)
+
+    def _split_stream(self, open_windows: TextWindows, with_offsets: bool) -> Generator[Any, Any, Any]:
+        """
+        Yields the chunks of the text, as (chunk, offset) pairs if with_offsets is set.
+        """
+        splitter = self._splitter
+        if not self._recursive:
+            separator = splitter._separator
+            merger = _SplitMerger(splitter, '' if splitter._keep_separator else separator)
+            for split, start in self._iter_splits(open_windows(), separator):
+                yield from self._output(merger.push(split, start), with_offsets)
+            yield from self._output(merger.finish(), with_offsets)
+            return
+
+        separators = splitter._separators
+        separator, new_separators = self._choose_separator(open_windows, separators)
+        merger = _SplitMerger(splitter, '' if splitter._keep_separator else separator)
+        for split, start in self._iter_splits(open_windows(), separator):
+            if splitter._length_function(split) < splitter._chunk_size:
+                yield from self._output(merger.push(split, start), with_offsets)
+                continue
+            yield from self._output(merger.finish(), with_offsets)
+            if not new_separators:
+                yield (split, start) if with_offsets else split
+            elif not with_offsets:
+                yield from splitter._split_text(split, new_separators)
+            else:
+                spans = SpanTextSplitter(splitter).split_spans(split, separators=new_separators)
+                for span in spans:
+                    if isinstance(span, str):
+                        yield span, None
+                    else:
+                        yield split[span[0]:span[1]], start + span[0]
+        yield from self._output(merger.finish(), with_offsets)
+
+    @staticmethod
+    def _output(docs: List[Tuple[str, Optional[int]]], with_offsets: bool) -> List[Any]:
+        return docs if with_offsets else [doc for doc, _ in docs]
+
+    def _iter_splits(self, windows: Iterable[str], separator: str) -> Generator[Tuple[str, int], Any, Any]:
+        """
+        Yields the non empty pieces _split_text_with_regex() would produce for the
+        concatenation of windows, with their offsets, holding back only the text
+        after the last separator.
+        """
+        keep_separator = self._splitter._keep_separator
+        if not separator:
+            offset = 0
+            for window in windows:
+                for i, char in enumerate(window, offset):
+                    yield char, i
+                offset += len(window)
+            return
+
+        separator_len = len(separator)
+        carry = ''
+        carry_start = 0
+        at_start = True
+        for window in windows:
+            parts = (carry + window).split(separator)
+            carry = parts.pop()
+            offset = carry_start
+            for part in parts:
+                start = offset
+                offset += len(part) + separator_len
+                if keep_separator and not at_start:
+                    part = separator + part
+                    start -= separator_len
+                at_start = False
+                if part:
+                    yield part, start
+            carry_start = offset
+        if keep_separator and not at_start:
+            carry = separator + carry
+            carry_start -= separator_len
+        if carry:
+            yield carry, carry_start
+
+    @staticmethod
+    def _choose_separator(open_windows: TextWindows, separators: List[str]):
+        """
+        Scans the text once to find the first separator that occurs in it, as
+        RecursiveCharacterTextSplitter._split_text() does for the whole text.
+        """
+        candidates = []
+        for i, _s in enumerate(separators):
+            if _s == '':
+                break
+            candidates.append(i)
+        found = set()
+        tail_len = max((len(separators[i]) for i in candidates), default=1) - 1
+        tail = ''
+        for window in open_windows():
+            buffer = tail + window
+            for i in candidates:
+                if i not in found and separators[i] in buffer:
+                    found.add(i)
+            if candidates and candidates[0] in found:
+                break
+            tail = buffer[-tail_len:] if tail_len else ''
+
+        for i, _s in enumerate(separators):
+            if _s == '':
+                return _s, []
+            if i in found:
+                return _s, separators[i + 1:]
+        return separators[-1], []
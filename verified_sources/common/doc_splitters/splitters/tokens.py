@@ -0,0 +1,193 @@
+"""
+Module: tokens
+
+This module contains a recursive text splitter that sizes chunks in tokens of a
+real tokenizer instead of in characters.
+
+Classes:
+    RecursiveTokenTextSplitter: Recursive character splitter measuring length in tokens.
+
+Functions:
+    load_tokenizer: Loads a tokenizer once per process.
+"""
+
+import re
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Sequence
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_text_splitters.character import _split_text_with_regex
+
+logger = logging.getLogger(__name__)
+
+BatchTokenCounter = Callable[[Sequence[str]], List[int]]
+
+
+def _count_characters(texts: Sequence[str]) -> List[int]:
+    return [len(text) for text in texts]
+
+
+@lru_cache(maxsize=8)
+def load_tokenizer(
+    tokenizer_file: Optional[str] = None,
+    encoding_name: str = 'cl100k_base',
+    model_name: Optional[str] = None
+) -> BatchTokenCounter:
+    """
+    Loads a tokenizer and returns a function counting the tokens of a batch of texts.
+    Tokenizers are cached, so each one is loaded only once per process.
+
+    Parameters:
+        tokenizer_file (Optional[str]): Path of a local HuggingFace tokenizer.json. Needs
+            the tokenizers package and never touches the network.
+        encoding_name (str): tiktoken encoding to use when no tokenizer_file is given. tiktoken
+            downloads it on first use; set TIKTOKEN_CACHE_DIR to a directory holding the
+            encoding to run offline. When tiktoken is not installed or the encoding cannot be
+            loaded, lengths are counted in characters, as SPLIT_BY_TOKENS used to, with a warning.
+        model_name (Optional[str]): tiktoken model whose encoding to use instead of encoding_name.
+
+    Returns:
+        BatchTokenCounter: A function mapping a batch of texts to their token counts.
+    """
+    if tokenizer_file:
+        try:
+            from tokenizers import Tokenizer
+        except ImportError:
+            raise ImportError(
+                'Could not import tokenizers python package. '
+                'Please install it with `pip install tokenizers` or `poetry install -E tokens`.'
+            )
+        tokenizer = Tokenizer.from_file(tokenizer_file)
+
+        def count_tokens(texts: Sequence[str]) -> List[int]:
+            return [len(encoding.ids) for encoding in tokenizer.encode_batch(list(texts), add_special_tokens=False)]
+        return count_tokens
+
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning(
+            'Could not import tiktoken python package, counting chunk lengths in characters. '
+            'Install it with `pip install tiktoken` or `poetry install -E tokens`.'
+        )
+        return _count_characters
+    try:
+        if model_name is not None:
+            encoding = tiktoken.encoding_for_model(model_name)
+        else:
+            encoding = tiktoken.get_encoding(encoding_name)
+    except (KeyError, ValueError):
+        raise
+    except Exception as e:
+        logger.warning(
+            f"Could not load the tiktoken encoding of '{model_name or encoding_name}' ({e}), counting chunk "
+            'lengths in characters. tiktoken downloads encodings on first use; when offline, set '
+            'TIKTOKEN_CACHE_DIR to a directory holding the encoding, or pass a local tokenizer_file.'
+        )
+        return _count_characters
+
+    def count_tokens(texts: Sequence[str]) -> List[int]:
+        return [len(tokens) for tokens in encoding.encode_ordinary_batch(list(texts))]
+    return count_tokens
+
+
+class RecursiveTokenTextSplitter(RecursiveCharacterTextSplitter):
+    """
+    Splits text recursively on separators like RecursiveCharacterTextSplitter, with
+    chunk_size and chunk_overlap measured in tokens.
+
+    Token counts of all candidate segments of a split are computed in one batch call
+    to the tokenizer, instead of one call per segment. The counts are memoized per
+    split_text() call and per thread, so one instance can be shared by concurrent
+    splits, and the memo is bounded by max_memo_entries.
+
+    The default tiktoken encoding is downloaded on first use, and lengths fall back to
+    characters when it is not available, see load_tokenizer().
+    """
+
+    def __init__(self,
+        tokenizer_file: Optional[str] = None,
+        encoding_name: str = 'cl100k_base',
+        model_name: Optional[str] = None,
+        chunk_size: int = 512,
+        chunk_overlap: int = 64,
+        max_memo_entries: int = 100_000,
+        **kwargs: Any
+    ) -> None:
+        """
+        Initializes a new RecursiveTokenTextSplitter object.
+
+        Parameters:
+            tokenizer_file (Optional[str]): Path of a local HuggingFace tokenizer.json.
+            encoding_name (str): tiktoken encoding used when no tokenizer_file is given.
+            model_name (Optional[str]): tiktoken model whose encoding to use instead of encoding_name.
+            chunk_size (int): Maximum number of tokens per chunk.
+            chunk_overlap (int): Number of tokens shared by consecutive chunks.
+            max_memo_entries (int): Number of token counts memoized during a split before
+                the memo is cleared.
+            **kwargs: Passed to RecursiveCharacterTextSplitter, except length_function, as
+                lengths are measured by the tokenizer.
+        """
+        if 'length_function' in kwargs:
+            raise ValueError('RecursiveTokenTextSplitter measures length in tokens and does not take a length_function')
+        super().__init__(chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                         length_function=self._token_length, **kwargs)
+        self._count_tokens = load_tokenizer(tokenizer_file, encoding_name, model_name)
+        self._max_memo_entries = max_memo_entries
+        self._local = threading.local()
+
+    def _memo(self) -> Optional[dict]:
+        """
+        Returns the token count memo of the split running in this thread, if any.
+        """
+        return getattr(self._local, 'token_counts', None)
+
+    def _token_length(self, text: str) -> int:
+        token_counts = self._memo()
+        if token_counts is None:
+            return self._count_tokens([text])[0]
+        count = token_counts.get(text)
+        if count is None:
+            count = self._count_tokens([text])[0]
+            self._remember(token_counts, [(text, count)])
+        return count
+
+    def _count_batch(self, texts: Sequence[str]) -> None:
+        token_counts = self._memo()
+        if token_counts is None:
+            return
+        missing = list({text for text in texts if text not in token_counts})
+        if missing:
+            self._remember(token_counts, zip(missing, self._count_tokens(missing)))
+
+    def _remember(self, token_counts: dict, counts: Any) -> None:
+        if len(token_counts) >= self._max_memo_entries:
+            token_counts.clear()
+        token_counts.update(counts)
+
+    def split_text(self, text: str) -> List[str]:
+        self._local.token_counts = {}
+        try:
+            return super().split_text(text)
+        finally:
+            self._local.token_counts = None
+
+    def _split_text(self, text: str, separators: List[str]) -> List[str]:
+        # Count every candidate segment of this level in one batch; the merge step
+        # and the recursion then only hit the memo.
+        separator = self._pick_separator(text, separators)
+        self._count_batch(self._candidate_splits(text, separator) + [separator, ''])
+        return super()._split_text(text, separators)
+
+    def _pick_separator(self, text: str, separators: List[str]) -> str:
+        for _s in separators:
+            if _s == '':
+                return _s
+            if re.search(_s if self._is_separator_regex else re.escape(_s), text):
+                return _s
+        return separators[-1]
+
+    def _candidate_splits(self, text: str, separator: str) -> List[str]:
+        _separator = separator if self._is_separator_regex else re.escape(separator)
+        return _split_text_with_regex(text, _separator, self._keep_separator)
@@ -0,0 +1,49 @@
+"""
+Micro-benchmark of the per page cost of the document types used between loaders
+and splitters.
+
+Compares converting langchain documents to the pydantic Document, which is what
+every page went through before, with converting them to RawDocument.
+
+Usage:
+    python -m verified_sources.common.doc_splitters.tests.bench_documents [--pages N] [--repeat N]
+"""
+
+import argparse
+import timeit
+from langchain_core.documents import Document as LCDocument
+from verified_sources.common.doc_splitters import Document, RawDocument
+
+
+def make_pages(num_pages: int):
+    return [
+        LCDocument(
+            page_content=f'Page {page_number} ' + 'lorem ipsum dolor sit amet ' * 80,
+            metadata={'source': '/tmp/report.pdf', 'page': page_number, 'total_pages': num_pages},
+        )
+        for page_number in range(num_pages)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages)
+    candidates = {
+        'Document (pydantic)': Document.from_langchain_document,
+        'RawDocument (slots)': RawDocument.from_langchain_document,
+    }
+    results = {}
+    for name, convert in candidates.items():
+        best = min(timeit.repeat(lambda: [convert(page) for page in pages], number=1, repeat=args.repeat))
+        results[name] = best / args.pages * 1e9
+        print(f'{name:<22} {results[name]:8.0f} ns/page')
+    before, after = results.values()
+    print(f'{"speedup":<22} {before / after:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
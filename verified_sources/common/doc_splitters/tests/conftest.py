@@ -0,0 +1,138 @@
+import os
+import sys
+import subprocess
+from pytest import fixture, importorskip
+
+
+# Seconds a `python -c "import <module>"` may spend on the import itself.
+IMPORT_TIME_BUDGET = float(os.getenv('DAT_IMPORT_TIME_BUDGET', '1.5'))
+
+SOURCE_MODULES = (
+    'amazon_s3',
+    'aws_redshift',
+    'google_cloud_storage',
+    'google_drive',
+    'local_file_system',
+    'postgres',
+    'website_crawler',
+    'website_crawler_sitemap',
+    'wikipedia',
+)
+
+
+def measure_import(module_name: str) -> subprocess.CompletedProcess:
+    """
+    Imports module_name in a fresh interpreter and prints the seconds it took,
+    so modules already imported by the test session do not skew the result.
+    """
+    code = (
+        'import time\n'
+        't0 = time.perf_counter()\n'
+        f'import {module_name}\n'
+        'print(time.perf_counter() - t0)\n'
+    )
+    return subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True, text=True,
+        cwd=os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'),
+    )
+
+
+@fixture()
+def text_file(tmp_path):
+    file_path = tmp_path / 'sample.txt'
+    paragraphs = [
+        f'Paragraph {i}. ' + ' '.join(f'word{j}' for j in range(i % 7 + 3))
+        for i in range(40)
+    ]
+    file_path.write_text('\n\n'.join(paragraphs))
+    yield str(file_path)
+
+
+def write_pdf(file_path: str, page_texts) -> str:
+    """
+    Writes a minimal PDF with one line of Helvetica text per page.
+    """
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    page_ids = []
+    for text in page_texts:
+        stream = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET'.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects))
+        page_ids.append(len(objects))
+    kids = b' '.join(b'%d 0 R' % i for i in page_ids)
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (i, body)
+    xref_offset = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+    with open(file_path, 'wb') as f:
+        f.write(out)
+    return file_path
+
+
+@fixture()
+def pdf_file(tmp_path):
+    yield write_pdf(str(tmp_path / 'sample.pdf'), [f'This is page number {i}' for i in range(40)])
+
+
+@fixture()
+def word_tokenizer_file(tmp_path):
+    """
+    A local HuggingFace tokenizer.json that splits on whitespace and punctuation.
+    """
+    tokenizers = importorskip('tokenizers')
+    from tokenizers.models import WordLevel
+    from tokenizers.pre_tokenizers import Whitespace
+
+    tokenizer = tokenizers.Tokenizer(WordLevel({'[UNK]': 0}, unk_token='[UNK]'))
+    tokenizer.pre_tokenizer = Whitespace()
+    file_path = str(tmp_path / 'tokenizer.json')
+    tokenizer.save(file_path)
+    yield file_path
+
+
+@fixture()
+def html_file(tmp_path):
+    """
+    A documentation style page with nested headers and content to skip.
+    """
+    sections = []
+    for i in range(20):
+        sections.append(f'<h2>Chapter {i}</h2><p>Chapter {i} introduction.</p>')
+        for j in range(3):
+            sections.append(f'<h3>Topic {i}.{j}</h3><p>Details of topic {i}.{j} <b>in bold</b>.</p>'
+                            f'<script>track({i}, {j});</script><ul><li>first</li><li>second</li></ul>')
+    html = ('<!DOCTYPE html><html><head><title>Docs</title><style>p { margin: 0 }</style></head>'
+            f'<body><h1>Manual</h1><p>Welcome.</p>{"".join(sections)}</body></html>')
+    file_path = tmp_path / 'docs.html'
+    file_path.write_text(html)
+    yield str(file_path)
+
+
+@fixture()
+def csv_file(tmp_path):
+    """
+    A CSV export with quoted delimiters, embedded newlines, padded and empty values.
+    """
+    import csv
+    file_path = tmp_path / 'export.csv'
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', ' name ', 'note'])
+        for i in range(3000):
+            writer.writerow([f'{i:05d}', ['Ada', ' Grace ', 'Lovelace, Ada', 'multi\nline', ''][i % 5], 'x' * (i % 97)])
+    yield str(file_path)
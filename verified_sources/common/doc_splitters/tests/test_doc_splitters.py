@@ -0,0 +1,963 @@
+import pytest
+from verified_sources.common.doc_splitters.factory import (
+    doc_splitter_factory, DocLoaderType, TextSplitterType
+)
+from conftest import *
+
+
+def test_factory_import_is_lazy():
+    result = measure_import('verified_sources.common.doc_splitters.factory')
+    assert result.returncode == 0, result.stderr
+    assert float(result.stdout) < IMPORT_TIME_BUDGET
+
+
+@pytest.mark.parametrize('source', SOURCE_MODULES)
+def test_source_import_budget(source):
+    result = measure_import(f'verified_sources.{source}.source')
+    if result.returncode != 0:
+        if 'ModuleNotFoundError' in result.stderr:
+            pytest.skip(result.stderr.strip().splitlines()[-1])
+        pytest.fail(result.stderr)
+    assert float(result.stdout) < IMPORT_TIME_BUDGET
+
+
+def test_lazy_registration_resolves_on_create(text_file):
+    doc_splitter = doc_splitter_factory.create(
+        loader_key=DocLoaderType.TEXT,
+        splitter_key=TextSplitterType.SPLIT_BY_CHARACTER,
+        loader_config={'file_path': text_file},
+        splitter_config={'chunk_size': 200, 'chunk_overlap': 0},
+    )
+    assert not isinstance(doc_splitter_factory._loaders[DocLoaderType.TEXT.value], str)
+    assert not isinstance(doc_splitter_factory._splitters[TextSplitterType.SPLIT_BY_CHARACTER.value], str)
+    chunks = list(doc_splitter.load_and_chunk())
+    assert chunks and all(len(chunk) <= 200 for chunk in chunks)
+
+
+def test_splitter_instances_are_reused(text_file):
+    doc_splitter_factory.clear_splitter_cache()
+    splitter_config = {'chunk_size': 100, 'chunk_overlap': 10}
+    splitters = [
+        doc_splitter_factory.create(
+            loader_key=DocLoaderType.TEXT,
+            splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+            loader_config={'file_path': text_file},
+            splitter_config=dict(splitter_config),
+        )
+        for _ in range(4)
+    ]
+    assert len({id(s._default_splitter) for s in splitters}) == 1
+    assert len({id(s._default_loader) for s in splitters}) == 4
+    cache_info = doc_splitter_factory.splitter_cache_info()
+    assert (cache_info.hits, cache_info.misses) == (3, 1)
+    assert cache_info.hit_rate == 0.75
+
+
+def test_loader_protocol_is_resolved_at_registration(text_file):
+    from llama_index.core.readers.base import BaseReader
+    from llama_index.core.schema import Document as LIDocument
+    from verified_sources.common.doc_splitters.factory import DocumentSplitterFactory
+    from verified_sources.common.doc_splitters.loader_adapters import LoaderProtocol
+
+    class EagerReader(BaseReader):
+        def __init__(self, file_path):
+            self.file_path = file_path
+
+        def load_data(self):
+            with open(self.file_path) as f:
+                return [LIDocument(text=f.read(), metadata={'file_path': self.file_path})]
+
+    factory = DocumentSplitterFactory()
+    factory.register_loader(DocLoaderType.TEXT, EagerReader)
+    factory.register_splitter(TextSplitterType.SPLIT_BY_CHARACTER, 'langchain_text_splitters:CharacterTextSplitter')
+    assert factory._loader_protocols[DocLoaderType.TEXT.value] is LoaderProtocol.LLAMA_INDEX
+
+    doc_splitter = factory.create(
+        loader_key=DocLoaderType.TEXT,
+        splitter_key=TextSplitterType.SPLIT_BY_CHARACTER,
+        loader_config={'file_path': text_file},
+    )
+    docs = list(doc_splitter.load())
+    assert len(docs) == 1 and docs[0].filepath == text_file
+
+
+@pytest.mark.parametrize('splitter_key, splitter_config', [
+    (TextSplitterType.SPLIT_BY_CHARACTER, {'separator': '\n\n', 'chunk_size': 120, 'chunk_overlap': 40}),
+    (TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY, {'chunk_size': 50, 'chunk_overlap': 20}),
+])
+def test_streaming_split_matches_split_text(text_file, splitter_key, splitter_config):
+    def chunks(stream_window_size):
+        doc_splitter = doc_splitter_factory.create(
+            loader_key=DocLoaderType.TEXT,
+            splitter_key=splitter_key,
+            loader_config={'file_path': text_file},
+            splitter_config=splitter_config,
+            stream_window_size=stream_window_size,
+        )
+        return list(doc_splitter.load_and_chunk())
+
+    assert chunks(stream_window_size=7) == chunks(stream_window_size=None)
+
+
+@pytest.mark.parametrize('newline', ['\n', '\r\n', '\r'])
+@pytest.mark.parametrize('stream_window_size', [None, 16])
+def test_mmap_text_loader_matches_text_loader(text_file, tmp_path, stream_window_size, newline):
+    file_path = tmp_path / 'newlines.txt'
+    with open(text_file) as f:
+        file_path.write_bytes(f.read().replace('\n', newline).encode())
+
+    def chunks(loader_key):
+        doc_splitter = doc_splitter_factory.create(
+            loader_key=loader_key,
+            splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+            loader_config={'file_path': str(file_path)},
+            splitter_config={'chunk_size': 60, 'chunk_overlap': 15},
+            stream_window_size=stream_window_size,
+        )
+        return list(doc_splitter.load_and_chunk())
+
+    assert chunks(DocLoaderType.MMAP_TEXT) == chunks(DocLoaderType.TEXT)
+
+
+def test_mmap_text_loader_windows(tmp_path):
+    from verified_sources.common.doc_splitters.loaders.text import MmapTextLoader
+
+    file_path = tmp_path / 'unicode.log'
+    text = ''.join(f'línea {i} — ✓\n' for i in range(200))
+    file_path.write_text(text, encoding='utf-8')
+    windows = list(MmapTextLoader(str(file_path)).iter_text_windows(window_size=10))
+    assert ''.join(windows) == text
+    assert list(MmapTextLoader(str(file_path)).lazy_load())[0].page_content == text
+
+    crlf_path = tmp_path / 'crlf.log'
+    crlf_path.write_bytes(text.replace('\n', '\r\n').encode() + b'\r')
+    for window_size in (1, 2, 7):
+        windows = list(MmapTextLoader(str(crlf_path)).iter_text_windows(window_size=window_size))
+        assert ''.join(windows) == text + '\n'
+
+    empty_path = tmp_path / 'empty.txt'
+    empty_path.write_text('')
+    assert list(MmapTextLoader(str(empty_path)).iter_text_windows(window_size=10)) == []
+
+
+def test_parallel_load_and_chunk_keeps_job_order(tmp_path):
+    from verified_sources.common.doc_splitters.parallel import SplitJob, parallel_load_and_chunk
+
+    def jobs():
+        for i in range(6):
+            file_path = tmp_path / f'file_{i}.txt'
+            file_path.write_text('\n\n'.join(f'file {i} paragraph {j}' for j in range(i * 20 + 1)))
+            yield i, SplitJob(
+                loader_key=DocLoaderType.MMAP_TEXT.value,
+                splitter_key=TextSplitterType.SPLIT_BY_CHARACTER.value,
+                loader_config={'file_path': str(file_path)},
+                splitter_config={'chunk_size': 64, 'chunk_overlap': 0},
+            )
+
+    serial = [(tag, list(chunks)) for tag, chunks in parallel_load_and_chunk(jobs())]
+    parallel = [(tag, list(chunks)) for tag, chunks in parallel_load_and_chunk(
+        jobs(), max_workers=3, max_in_flight=2, batch_size=7, max_queued_batches=1)]
+    assert [tag for tag, _ in parallel] == list(range(6))
+    assert parallel == serial
+    # Chunks left unconsumed are drained, so workers blocked on a full queue finish.
+    assert [tag for tag, _ in parallel_load_and_chunk(
+        jobs(), max_workers=2, batch_size=1, max_queued_batches=1)] == list(range(6))
+
+
+def test_parallel_load_and_chunk_stops_workers_on_failure_and_early_exit(tmp_path):
+    import time
+    from verified_sources.common.doc_splitters.parallel import SplitJob, parallel_load_and_chunk
+
+    big_file = tmp_path / 'big.txt'
+    big_file.write_text('\n'.join(f'line {i}' for i in range(20_000)))
+
+    def jobs(first_file):
+        for i, file_path in enumerate([first_file] + [big_file] * 4):
+            yield i, SplitJob(
+                loader_key=DocLoaderType.MMAP_TEXT.value,
+                splitter_key=TextSplitterType.SPLIT_BY_CHARACTER.value,
+                loader_config={'file_path': str(file_path)},
+                splitter_config={'separator': '\n', 'chunk_size': 8, 'chunk_overlap': 0},
+            )
+
+    def run(first_file, consume):
+        results = parallel_load_and_chunk(jobs(first_file), max_workers=2, batch_size=16, max_queued_batches=1)
+        started = time.monotonic()
+        try:
+            consume(results)
+        finally:
+            results.close()
+        return time.monotonic() - started
+
+    def consume_all(results):
+        for _, chunks in results:
+            list(chunks)
+
+    with pytest.raises(FileNotFoundError):
+        run(tmp_path / 'missing.txt', consume_all)
+
+    def stop_early(results):
+        _, chunks = next(results)
+        assert next(iter(chunks)) == 'line 0'
+
+    # Workers of the other jobs are blocked on full queues when the caller stops.
+    assert run(big_file, stop_early) < 30
+
+
+def test_parallel_pdf_loader_matches_pypdf_loader(pdf_file):
+    from langchain_community.document_loaders import PyPDFLoader
+    from verified_sources.common.doc_splitters.loaders.pdf import ParallelPyPDFLoader
+
+    expected = [(doc.page_content, doc.metadata) for doc in PyPDFLoader(pdf_file).lazy_load()]
+    loader = ParallelPyPDFLoader(pdf_file, max_workers=2, pages_per_task=3, min_pages_for_parallel=1)
+    assert [(doc.page_content, doc.metadata) for doc in loader.lazy_load()] == expected
+
+
+def test_pdf_streams_use_the_parallel_loader_only_when_opted_in(monkeypatch):
+    from verified_sources.common.doc_splitters.factory import get_pdf_loader_key
+    from verified_sources.common.doc_splitters.loaders.pdf import DEFAULT_PDF_WORKERS, ParallelPyPDFLoader
+
+    monkeypatch.delenv('DAT_PDF_LOADER', raising=False)
+    assert get_pdf_loader_key() == DocLoaderType.PYPDF
+    monkeypatch.setenv('DAT_PDF_LOADER', 'pypdf_parallel')
+    assert get_pdf_loader_key() == DocLoaderType.PYPDF_PARALLEL
+    monkeypatch.setenv('DAT_PDF_LOADER', 'PDF_LAZY')
+    assert get_pdf_loader_key() == DocLoaderType.PDF_LAZY
+    monkeypatch.setenv('DAT_PDF_LOADER', 'PARALLEL')
+    assert get_pdf_loader_key() == DocLoaderType.PYPDF
+    assert ParallelPyPDFLoader('unused.pdf').max_workers <= DEFAULT_PDF_WORKERS
+
+
+def test_lazy_pdf_loader_yields_pages_one_at_a_time(pdf_file):
+    from langchain_community.document_loaders import PyPDFLoader
+
+    expected = [doc.page_content for doc in PyPDFLoader(pdf_file).lazy_load()]
+    doc_splitter = doc_splitter_factory.create(
+        loader_key=DocLoaderType.PDF_LAZY,
+        splitter_key=TextSplitterType.SPLIT_BY_CHARACTER,
+        loader_config={'file_path': pdf_file},
+    )
+    docs = doc_splitter.load()
+    first = next(docs)
+    assert (first.page_content, first.metadata['page']) == (expected[0], 0)
+    assert [first.page_content] + [doc.page_content for doc in docs] == expected
+
+
+def test_chunk_cache_reuses_chunks_for_identical_content(tmp_path, text_file):
+    from verified_sources.common.doc_splitters.cache import ChunkCache
+
+    cache = ChunkCache(str(tmp_path / 'cache'))
+
+    def chunks(**splitter_config):
+        doc_splitter = doc_splitter_factory.create(
+            loader_key=DocLoaderType.MMAP_TEXT,
+            splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+            loader_config={'file_path': text_file},
+            splitter_config=splitter_config,
+            chunk_cache=cache,
+        )
+        return list(doc_splitter.load_and_chunk())
+
+    first = chunks(chunk_size=80, chunk_overlap=10)
+    assert chunks(chunk_size=80, chunk_overlap=10) == first
+    assert cache.cache_info().hits == 1
+    assert chunks(chunk_size=40, chunk_overlap=0) != first
+    assert cache.cache_info().hits == 2  # the extracted document is reused for the new config
+
+
+def test_chunk_cache_evicts_least_recently_used(tmp_path):
+    from verified_sources.common.doc_splitters.cache import ChunkCache
+
+    cache = ChunkCache(str(tmp_path / 'cache'), max_bytes=250, max_entry_bytes=250)
+    for key in ('a', 'b', 'c'):
+        cache.put_chunks(key, ['x' * 90])
+        cache.get_chunks('a')
+    assert cache.get_chunks('a') is not None
+    assert cache.get_chunks('b') is None
+    assert cache.get_chunks('c') is not None
+    assert cache.cache_info().curr_bytes <= 250
+
+
+def test_split_by_tokens_falls_back_to_characters_without_tiktoken(monkeypatch, caplog):
+    import sys
+    from verified_sources.common.doc_splitters.splitters import tokens
+
+    monkeypatch.setitem(sys.modules, 'tiktoken', None)
+    tokens.load_tokenizer.cache_clear()
+    try:
+        splitter = tokens.RecursiveTokenTextSplitter(chunk_size=10, chunk_overlap=0)
+        assert splitter.split_text('aaaa bbbb cccc dddd') == ['aaaa bbbb', 'cccc dddd']
+        assert 'counting chunk lengths in characters' in caplog.text
+        with pytest.raises(ValueError, match='length_function'):
+            tokens.RecursiveTokenTextSplitter(length_function=len)
+    finally:
+        tokens.load_tokenizer.cache_clear()
+
+
+def test_split_by_tokens_counts_tokens_in_batches(word_tokenizer_file, monkeypatch):
+    from verified_sources.common.doc_splitters.splitters import tokens
+
+    splitter = doc_splitter_factory.get_splitter_cls(TextSplitterType.SPLIT_BY_TOKENS)(
+        tokenizer_file=word_tokenizer_file, chunk_size=12, chunk_overlap=0)
+    assert isinstance(splitter, tokens.RecursiveTokenTextSplitter)
+    count_tokens = splitter._count_tokens
+    calls = []
+    monkeypatch.setattr(splitter, '_count_tokens', lambda texts: calls.append(len(texts)) or count_tokens(texts))
+
+    text = '\n\n'.join(f'Sentence {i} has exactly six words.' for i in range(10))
+    chunks = splitter.split_text(text)
+    assert len(chunks) > 1
+    assert all(len(count_tokens([chunk])) and count_tokens([chunk])[0] <= 12 for chunk in chunks)
+    assert len(calls) == 1 and calls[0] > 1
+
+    # The memo is per split and per thread, so a shared instance can split concurrently.
+    from concurrent.futures import ThreadPoolExecutor
+    texts = [text.replace('Sentence', f'Line {i}') for i in range(16)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(splitter.split_text, texts)) == [splitter.split_text(t) for t in texts]
+    assert splitter._memo() is None
+
+
+def test_documents_are_validated_only_when_loaded(text_file):
+    from verified_sources.common.doc_splitters import Document, RawDocument
+    from verified_sources.common.doc_splitters.loaders.text import MmapTextLoader
+
+    raw = next(MmapTextLoader(text_file).lazy_load())
+    assert type(raw) is RawDocument and not hasattr(raw, '__dict__')
+
+    doc_splitter = doc_splitter_factory.create(
+        loader_key=DocLoaderType.MMAP_TEXT,
+        splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+        loader_config={'file_path': text_file},
+        splitter_config={'chunk_size': 200, 'chunk_overlap': 0},
+    )
+    docs = list(doc_splitter.load())
+    assert [type(doc) for doc in docs] == [Document]
+    assert (docs[0].filepath, docs[0].page_content, docs[0].metadata) == (raw.filepath, raw.page_content, raw.metadata)
+
+
+@pytest.mark.parametrize('chunk_overlap', [0, 30])
+def test_chunk_views_locate_chunks_in_their_document(pdf_file, chunk_overlap):
+    import pickle
+    from verified_sources.common.doc_splitters.chunks import ChunkView, chunk_text_and_metadata
+
+    config = dict(
+        loader_key=DocLoaderType.PDF_LAZY,
+        splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+        loader_config={'file_path': pdf_file},
+        splitter_config={'chunk_size': 60, 'chunk_overlap': chunk_overlap},
+    )
+    expected = list(doc_splitter_factory.create(**config).load_and_chunk())
+    views = list(doc_splitter_factory.create(chunk_views=True, **config).load_and_chunk())
+    pages = [doc.page_content for doc in doc_splitter_factory.create(**config).load()]
+
+    assert all(isinstance(view, ChunkView) for view in views)
+    assert [view.text for view in views] == expected
+    for view in views:
+        assert pages[view.doc_index][view.start:view.end] == view.text
+    assert pickle.loads(pickle.dumps(views[-1])) == views[-1]
+
+    text, metadata = chunk_text_and_metadata(views[1], {'dat_record_id': 'x'})
+    assert text == expected[1]
+    assert metadata == {'dat_record_id': 'x', 'chunk_doc_index': views[1].doc_index,
+                        'chunk_start': views[1].start, 'chunk_end': views[1].end}
+
+
+@pytest.mark.parametrize('stream_window_size', [None, 7])
+def test_chunk_views_are_streamed_and_cached(text_file, tmp_path, stream_window_size):
+    from verified_sources.common.doc_splitters.cache import ChunkCache
+    from verified_sources.common.doc_splitters.chunks import ChunkView
+
+    cache = ChunkCache(str(tmp_path / 'cache'))
+    config = dict(
+        loader_key=DocLoaderType.MMAP_TEXT,
+        splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+        loader_config={'file_path': text_file},
+        splitter_config={'chunk_size': 50, 'chunk_overlap': 20},
+        stream_window_size=stream_window_size,
+    )
+    expected = list(doc_splitter_factory.create(**config).load_and_chunk())
+    with open(text_file) as f:
+        text = f.read()
+
+    for _ in range(2):
+        views = list(doc_splitter_factory.create(chunk_views=True, chunk_cache=cache, **config).load_and_chunk())
+        assert all(isinstance(view, ChunkView) for view in views)
+        assert [view.text for view in views] == expected
+        assert all(text[view.start:view.end] == view.text for view in views)
+    assert cache.cache_info().hits >= 1
+
+
+def test_near_duplicate_filter_suppresses_boilerplate_across_files(tmp_path):
+    from verified_sources.common.doc_splitters.chunks import chunk_text_and_metadata
+    from verified_sources.common.doc_splitters.dedup import NearDuplicateFilter, DuplicateChunk
+
+    footer = (
+        'Copyright 2024 Example Corp. All rights reserved. Licensed under the Apache License, Version 2.0 '
+        '(the "License"); you may not use this file except in compliance with the License. You may obtain '
+        'a copy of the License at the project website. Unless required by applicable law or agreed to in '
+        'writing, software distributed under the License is distributed on an "AS IS" BASIS, WITHOUT '
+        'WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.'
+    )
+    file_paths = []
+    for i in range(3):
+        body = f'Report {i}: ' + ' '.join(f'finding{i}_{j} measured value {j * i}' for j in range(12))
+        # The last copy of the footer differs by one word and must still be caught.
+        text = f'{body}\n\n{footer if i < 2 else footer.replace("implied", "implied here")}'
+        file_paths.append(tmp_path / f'{i}.txt')
+        file_paths[-1].write_text(text)
+
+    def load_and_chunk(near_duplicate_filter):
+        chunks = []
+        for file_path in file_paths:
+            doc_splitter = doc_splitter_factory.create(
+                loader_key=DocLoaderType.MMAP_TEXT,
+                splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+                loader_config={'file_path': str(file_path)},
+                splitter_config={'chunk_size': 500, 'chunk_overlap': 0},
+                near_duplicate_filter=near_duplicate_filter,
+            )
+            chunks += doc_splitter.load_and_chunk()
+        return chunks
+
+    assert len(load_and_chunk(None)) == 6
+    kept = load_and_chunk(NearDuplicateFilter(max_distance=6))
+    assert sum('rights reserved' in chunk for chunk in kept) == 1
+    assert sum(chunk.startswith('Report') for chunk in kept) == 3
+
+    flagged = load_and_chunk(NearDuplicateFilter(max_distance=6, action='flag'))
+    duplicates = [chunk for chunk in flagged if isinstance(chunk, DuplicateChunk)]
+    assert len(flagged) == 6 and len(duplicates) == 2
+    assert chunk_text_and_metadata(duplicates[0])[1] == {'chunk_near_duplicate': True}
+
+
+def test_near_duplicate_filter_index_is_bounded():
+    from verified_sources.common.doc_splitters.dedup import NearDuplicateFilter
+
+    near_duplicate_filter = NearDuplicateFilter(max_entries=10)
+    texts = [f'unique chunk number {i} ' + ' '.join(f'w{i}x{j}' for j in range(20)) for i in range(50)]
+    assert list(near_duplicate_filter.filter(texts)) == texts
+    assert len(near_duplicate_filter._fingerprints) == 10
+    assert sum(len(bucket) for band in near_duplicate_filter._band_index for bucket in band.values()) == 10 * 4
+    # Evicted fingerprints are forgotten, recent ones are still matched.
+    assert list(near_duplicate_filter.filter([texts[0], texts[-1]])) == [texts[0]]
+
+
+def test_near_duplicate_filter_ignores_chunks_without_words():
+    from langchain_core.documents import Document as LangchainDocument
+    from verified_sources.common.doc_splitters.chunks import chunk_text_and_metadata
+    from verified_sources.common.doc_splitters.dedup import NearDuplicateFilter, simhash
+
+    assert simhash('----- * -----') is None
+    near_duplicate_filter = NearDuplicateFilter(action='flag')
+    chunks = ['-----', '* * *', '...', '-----', LangchainDocument(page_content='=====')]
+    assert list(near_duplicate_filter.filter(chunks)) == chunks
+    assert near_duplicate_filter.flagged == 0 and not near_duplicate_filter._fingerprints
+
+    flagged = list(near_duplicate_filter.filter([LangchainDocument(page_content='a b c d')] * 2))
+    assert chunk_text_and_metadata(flagged[1]) == ('a b c d', {'chunk_near_duplicate': True})
+
+
+@pytest.mark.parametrize('splitter_key, splitter_config', [
+    (TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY, {'chunk_size': 40, 'chunk_overlap': 10}),
+    (TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY, {'chunk_size': 40, 'chunk_overlap': 0, 'keep_separator': False}),
+    (TextSplitterType.SPLIT_BY_CHARACTER, {'chunk_size': 40, 'chunk_overlap': 10, 'separator': ' '}),
+])
+def test_split_many_matches_split_text(text_file, splitter_key, splitter_config):
+    doc_splitter = doc_splitter_factory.create(
+        loader_key=DocLoaderType.TEXT,
+        splitter_key=splitter_key,
+        loader_config={'file_path': text_file},
+        splitter_config=splitter_config,
+    )
+    rows = ['', '   ', 'id: 1, name: short row', ' padded row \n', 'x' * 39, 'x' * 40,
+            'a longer row that certainly does not fit into a single forty character chunk',
+            'separators\n\nat\n\n\n\nodd places  ']
+    assert doc_splitter.split_many(rows) == [list(doc_splitter.split_text(row)) for row in rows]
+
+
+def test_html_section_splitter_streams_sections(html_file):
+    doc_splitter = doc_splitter_factory.create(
+        loader_key=DocLoaderType.MMAP_TEXT,
+        splitter_key=TextSplitterType.SPLIT_BY_HTML_SECTION,
+        loader_config={'file_path': html_file},
+        splitter_config={'headers_to_split_on': [('h1', 'Header 1'), ('h2', 'Header 2'), ('h3', 'Header 3')]},
+        stream_window_size=256,
+    )
+    sections = list(doc_splitter.load_and_chunk())
+    assert len(sections) == 1 + 20 * 4
+    assert (sections[0].page_content, sections[0].metadata) == ('Manual\nWelcome.', {'Header 1': 'Manual'})
+    assert sections[-1].page_content == 'Topic 19.2\nDetails of topic 19.2 in bold.\nfirst\nsecond'
+    assert sections[-1].metadata == {'Header 1': 'Manual', 'Header 2': 'Chapter 19', 'Header 3': 'Topic 19.2'}
+    assert sections[4].metadata == {'Header 1': 'Manual', 'Header 2': 'Chapter 0', 'Header 3': 'Topic 0.2'}
+
+    splitter = doc_splitter._default_splitter
+    with open(html_file) as f:
+        html = f.read()
+    windows_read = []
+
+    def open_windows():
+        for start in range(0, len(html), 256):
+            windows_read.append(start)
+            yield html[start:start + 256]
+
+    first = next(splitter.split_stream(open_windows))
+    assert first.page_content == 'Manual\nWelcome.' and len(windows_read) < len(html) // 256
+    assert [(doc.page_content, doc.metadata) for doc in splitter.split_text(html)] == \
+        [(doc.page_content, doc.metadata) for doc in sections]
+
+
+def test_json_splitter_streams_with_flat_memory(tmp_path):
+    import json
+    import tracemalloc
+    pytest.importorskip('ijson')
+
+    rows = [{'id': i, 'name': f'user {i}', 'tags': ['a', 'b'], 'profile': {'bio': 'lorem ipsum ' * 8}}
+            for i in range(8000)]
+    document = {'export': {'rows': rows, 'meta': {'count': len(rows)}}}
+    file_path = tmp_path / 'export.json'
+    file_path.write_text(json.dumps(document))
+
+    doc_splitter = doc_splitter_factory.create(
+        loader_key=DocLoaderType.MMAP_TEXT,
+        splitter_key=TextSplitterType.SPLIT_JSON_RECURSIVELY,
+        loader_config={'file_path': str(file_path)},
+        splitter_config={'max_chunk_size': 1000},
+        stream_window_size=16 * 1024,
+    )
+    chunks = [(chunk.page_content, chunk.metadata['json_paths']) for chunk in doc_splitter.load_and_chunk()]
+    tracemalloc.start()
+    try:
+        for chunk in doc_splitter.load_and_chunk():
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < file_path.stat().st_size / 4
+
+    assert all(len(content) <= 1000 for content, _ in chunks)
+    assert chunks[0][1][0] == '$.export.rows[0]'
+    assert chunks[-1][1][-1] == '$.export.meta'
+    restored = {}
+    for content, paths in chunks:
+        rows_chunk = json.loads(content)['export'].get('rows', {})
+        restored.update({int(index): row for index, row in rows_chunk.items()})
+    assert [restored[i] for i in range(len(rows))] == rows
+    assert [content for content, _ in chunks] == \
+        [chunk.page_content for chunk in doc_splitter._default_splitter.split_text(json.dumps(document))]
+
+    from verified_sources.common.doc_splitters.chunks import chunk_text_and_metadata
+    first = next(doc_splitter.load_and_chunk())
+    assert chunk_text_and_metadata(first, {'dat_record_id': 'export.json'}) == \
+        (chunks[0][0], {'dat_record_id': 'export.json', 'json_paths': chunks[0][1]})
+
+
+def test_json_splitter_accepts_recursive_json_splitter_config(tmp_path):
+    import json
+
+    file_path = tmp_path / 'small.json'
+    file_path.write_text(json.dumps({'a': {'b': 'x' * 50, 'c': 'y' * 50}}))
+    doc_splitter = doc_splitter_factory.create(
+        loader_key=DocLoaderType.TEXT,
+        splitter_key=TextSplitterType.SPLIT_JSON_RECURSIVELY,
+        loader_config={'file_path': str(file_path)},
+        splitter_config={'max_chunk_size': 80, 'min_chunk_size': 60},
+    )
+    chunks = [chunk.metadata['json_paths'] for chunk in doc_splitter.load_and_chunk()]
+    assert chunks == [['$.a.b'], ['$.a.c']]
+
+
+def test_columnar_csv_loader_groups_rows(csv_file):
+    pytest.importorskip('pyarrow')
+    from langchain_community.document_loaders import CSVLoader
+    from verified_sources.common.doc_splitters.loaders.tabular import ColumnarCSVLoader
+
+    rows = [doc.page_content for doc in CSVLoader(csv_file).load()]
+    single_rows = ColumnarCSVLoader(csv_file, rows_per_document=1, block_size=4096).load()
+    assert [doc.page_content for doc in single_rows] == rows
+
+    documents = ColumnarCSVLoader(csv_file, max_document_chars=1000, block_size=4096).load()
+    assert all(len(doc.page_content) <= 1000 for doc in documents)
+    assert [doc.metadata['row'] for doc in documents] == \
+        [sum(doc.metadata['rows'] for doc in documents[:i]) for i in range(len(documents))]
+    assert '\n\n'.join(doc.page_content for doc in documents) == '\n\n'.join(rows)
+
+    table = ColumnarCSVLoader(csv_file, row_format='table', columns=['id', 'note'], rows_per_document=10).load()
+    assert len(table) == 300
+    assert table[1].page_content.splitlines()[:2] == ['id | note', '00010 | ' + 'x' * 10]
+
+    table = ColumnarCSVLoader(csv_file, row_format='table', max_document_chars=300, block_size=4096).load()
+    assert all(len(doc.page_content) <= 300 for doc in table if doc.metadata['rows'] > 1)
+    with pytest.raises(ValueError, match="Unknown columns \\['notes'\\]"):
+        ColumnarCSVLoader(csv_file, columns=['id', 'notes']).load()
+
+
+def test_parquet_loader_reads_row_groups_and_projects_columns(tmp_path, monkeypatch):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+
+    file_path = str(tmp_path / 'events.parquet')
+    table = pa.table({
+        'id': list(range(1000)),
+        'name': [f'user {i}' for i in range(1000)],
+        'tags': [['a', 'b'] if i % 2 else None for i in range(1000)],
+        'payload': ['x' * 500] * 1000,
+    })
+    pq.write_table(table, file_path, row_group_size=100)
+
+    doc_splitter = doc_splitter_factory.create(
+        loader_key=DocLoaderType.PARQUET,
+        splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+        loader_config={'file_path': file_path, 'columns': ['id', 'tags'], 'rows_per_document': 1},
+        splitter_config={'chunk_size': 1000, 'chunk_overlap': 0},
+    )
+    documents = list(doc_splitter.load())
+    assert len(documents) == 1000
+    assert documents[1].page_content == 'id: 1\ntags: [a, b]'
+    assert documents[998].page_content == 'id: 998\ntags: '
+
+    from verified_sources.common.doc_splitters.loaders.tabular import ParquetLoader
+    read_row_groups = []
+    read_row_group = pq.ParquetFile.read_row_group
+
+    def spy(self, i, *args, **kwargs):
+        read_row_groups.append(i)
+        return read_row_group(self, i, *args, **kwargs)
+
+    monkeypatch.setattr(pq.ParquetFile, 'read_row_group', spy)
+    first = next(ParquetLoader(file_path).lazy_load())
+    assert read_row_groups == [0] and first.metadata == {'source': file_path, 'row': 0, 'rows': 7}
+
+
+def test_jsonl_loader_skips_malformed_lines_and_tracks_offsets(tmp_path):
+    import json
+    from verified_sources.common.doc_splitters.loaders.jsonl import JsonLinesLoader
+
+    events = [{'id': i, 'type': 'click', 'user': {'name': f'user {i}', 'plan': 'pro'}} for i in range(50)]
+    lines = [json.dumps(event) for event in events]
+    lines[10:10] = ['{"id": truncated', '']
+    file_path = tmp_path / 'events.jsonl'
+    file_path.write_text('\n'.join(lines) + '\n')
+
+    loader = JsonLinesLoader(str(file_path), content_fields=['type', 'user.name'], metadata_fields=['id', 'user.plan'],
+                             batch_size=256)
+    documents = list(loader.lazy_load())
+    assert len(documents) == 50
+    assert documents[10].page_content == 'type: click\nuser.name: user 10'
+    assert documents[10].metadata == {'source': str(file_path), 'line': 13, 'offset': documents[10].metadata['offset'],
+                                      'id': 10, 'user.plan': 'pro'}
+    with open(file_path, 'rb') as f:
+        for document in documents:
+            f.seek(document.metadata['offset'])
+            assert json.loads(f.readline())['id'] == document.metadata['id']
+
+
+@pytest.mark.parametrize('chunk_views', [False, True])
+def test_jsonl_record_metadata_reaches_emitted_records(tmp_path, chunk_views):
+    import json
+    from verified_sources.common.doc_splitters.cache import ChunkCache
+    from verified_sources.common.doc_splitters.chunks import chunk_text_and_metadata
+
+    file_path = tmp_path / 'events.jsonl'
+    file_path.write_text('\n'.join(json.dumps({'id': i, 'user': {'name': f'user {i}'}}) for i in range(3)) + '\n')
+    chunk_cache = ChunkCache(str(tmp_path / 'cache'))
+    # The second run would be served from the chunks cache, which does not keep record metadata.
+    for _ in range(2):
+        chunks = doc_splitter_factory.create(
+            loader_key=DocLoaderType.JSONL,
+            splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+            loader_config={'file_path': str(file_path), 'content_fields': ['user.name'], 'metadata_fields': ['id']},
+            splitter_config={'chunk_size': 100, 'chunk_overlap': 0},
+            chunk_cache=chunk_cache,
+            chunk_views=chunk_views,
+        ).load_and_chunk()
+        records = [chunk_text_and_metadata(chunk, {'dat_record_id': 'events.jsonl'}) for chunk in chunks]
+        assert [text for text, _ in records] == [f'user.name: user {i}' for i in range(3)]
+        metadata = records[1][1]
+        assert {key: metadata[key] for key in ('dat_record_id', 'line', 'id')} == {
+            'dat_record_id': 'events.jsonl', 'line': 2, 'id': 1}
+        assert metadata['offset'] == len(json.dumps({'id': 0, 'user': {'name': 'user 0'}})) + 1
+        assert ('chunk_start' in metadata) == chunk_views
+
+
+@pytest.mark.parametrize('compression', ['gz', 'bz2', 'zst'])
+def test_compressed_text_streams_into_splitter(text_file, tmp_path, compression):
+    import bz2
+    import gzip
+    import shutil
+    compress = {'gz': gzip.compress, 'bz2': bz2.compress}.get(compression)
+    if compress is None:
+        compress = pytest.importorskip('zstandard').ZstdCompressor().compress
+    with open(text_file, 'rb') as f:
+        data = f.read()
+    compressed_file = tmp_path / f'app.log.{compression}'
+    compressed_file.write_bytes(compress(data))
+    # Downloaded without an extension, compression is detected from the magic bytes.
+    shutil.copy(compressed_file, tmp_path / 'download')
+
+    def chunks(file_path):
+        doc_splitter = doc_splitter_factory.create(
+            loader_key=DocLoaderType.MMAP_TEXT,
+            splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+            loader_config={'file_path': str(file_path)},
+            splitter_config={'chunk_size': 200, 'chunk_overlap': 20},
+            stream_window_size=4096,
+        )
+        return list(doc_splitter.load_and_chunk())
+
+    expected = chunks(text_file)
+    assert chunks(compressed_file) == expected
+    assert chunks(tmp_path / 'download') == expected
+
+
+def test_detect_compression_trusts_the_extension_and_full_magic(tmp_path):
+    import bz2
+    import gzip
+    from verified_sources.common.doc_splitters.loaders.compression import detect_compression
+
+    files = {
+        'notes.txt': gzip.compress(b'text'),
+        'BZh5 notes': b'BZh5 is a plain text note',
+        'bundle.tgz': gzip.compress(b'tar'),
+        'download': bz2.compress(b'data'),
+        'empty': bz2.compress(b''),
+        'gzipped': gzip.compress(b'data'),
+    }
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+    assert {name: detect_compression(str(tmp_path / name)) for name in files} == {
+        'notes.txt': None, 'BZh5 notes': None, 'bundle.tgz': 'gzip',
+        'download': 'bz2', 'empty': 'bz2', 'gzipped': 'gzip',
+    }
+
+
+@pytest.mark.parametrize('archive_name', ['bundle.zip', 'bundle.tar.gz'])
+def test_archive_loader_dispatches_members_by_extension(text_file, csv_file, tmp_path, archive_name):
+    import tarfile
+    import zipfile
+    from verified_sources.common.doc_splitters.chunks import chunk_text_and_metadata
+    pytest.importorskip('pyarrow')
+    members = {'notes/readme.txt': text_file, 'export.csv': csv_file}
+    archive_path = tmp_path / archive_name
+    if archive_name.endswith('.zip'):
+        with zipfile.ZipFile(archive_path, 'w') as archive:
+            for name, file_path in members.items():
+                archive.write(file_path, name)
+            archive.writestr('image.png', b'\x89PNG')
+    else:
+        with tarfile.open(archive_path, 'w:gz') as archive:
+            for name, file_path in members.items():
+                archive.add(file_path, name)
+
+    doc_splitter = doc_splitter_factory.create(
+        loader_key=DocLoaderType.ARCHIVE,
+        splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+        loader_config={'file_path': str(archive_path)},
+        splitter_config={'chunk_size': 500, 'chunk_overlap': 0},
+    )
+    documents = list(doc_splitter.load())
+    with open(text_file) as f:
+        assert documents[0].page_content == f.read()
+    assert documents[0].metadata == {'source': str(archive_path), 'archive_member': 'notes/readme.txt'}
+    csv_documents = documents[1:]
+    assert csv_documents and all(doc.metadata['archive_member'] == 'export.csv' for doc in csv_documents)
+    assert sum(doc.metadata['rows'] for doc in csv_documents) == 3000
+    records = [chunk_text_and_metadata(chunk) for chunk in doc_splitter.load_and_chunk()]
+    assert records[0][1] == {'archive_member': 'notes/readme.txt'}
+    assert {metadata['archive_member'] for _, metadata in records} == set(members)
+
+
+@pytest.mark.parametrize('archive_name', ['app.log.gz', 'bundle.gz'])
+def test_archive_loader_loads_a_compressed_file_as_one_member(text_file, tmp_path, archive_name):
+    import gzip
+    import io
+    import tarfile
+
+    archive_path = tmp_path / archive_name
+    if archive_name == 'bundle.gz':
+        # A tar archive whose name does not say so; its member is over max_member_size.
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode='w') as archive:
+            archive.add(text_file, 'notes/readme.txt')
+        archive_path.write_bytes(gzip.compress(buffer.getvalue()))
+    else:
+        archive_path.write_bytes(gzip.compress(open(text_file, 'rb').read()))
+
+    doc_splitter = doc_splitter_factory.create(
+        loader_key=DocLoaderType.ARCHIVE,
+        splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+        loader_config={'file_path': str(archive_path), 'max_member_size': 10},
+        splitter_config={'chunk_size': 500, 'chunk_overlap': 0},
+    )
+    documents = list(doc_splitter.load())
+    if archive_name == 'bundle.gz':
+        assert documents == []
+        return
+    with open(text_file) as f:
+        assert [doc.page_content for doc in documents] == [f.read()]
+    assert documents[0].metadata == {'source': str(archive_path), 'archive_member': 'app.log'}
+
+
+def test_xlsx_loader_emits_sheet_and_row_range_documents(tmp_path):
+    import datetime
+    openpyxl = pytest.importorskip('openpyxl')
+    pytest.importorskip('pyarrow')
+    from verified_sources.common.doc_splitters.loaders.tabular import XlsxLoader
+
+    file_path = str(tmp_path / 'report.xlsx')
+    workbook = openpyxl.Workbook(write_only=True)
+    orders = workbook.create_sheet('Orders')
+    orders.append(['id', 'customer', 'amount', 'date'])
+    for i in range(2500):
+        orders.append([i, f'customer {i}', i * 1.5, datetime.date(2024, 1, 1)])
+    notes = workbook.create_sheet('Notes')
+    notes.append([])
+    notes.append(['note', None, 'tag'])
+    notes.append(['first', 'unnamed', 'a'])
+    notes.append(['second'])
+    notes.append(['third', None, 'b', 'beyond the header'])
+    workbook.save(file_path)
+
+    documents = XlsxLoader(file_path, rows_per_document=100, max_document_chars=None, batch_size=300).load()
+    assert [doc.metadata['sheet'] for doc in documents] == ['Orders'] * 25 + ['Notes']
+    assert documents[3].metadata == {'source': file_path, 'sheet': 'Orders', 'row': 300, 'rows': 100}
+    assert documents[0].page_content.split('\n\n')[1] == 'id: 1\ncustomer: customer 1\namount: 1.5\ndate: 2024-01-01'
+    assert documents[-1].page_content == \
+        'note: first\ncolumn_2: unnamed\ntag: a\n\nnote: second\ncolumn_2: \ntag: \n\nnote: third\ncolumn_2: \ntag: b'
+    # Rows are cut to the header's width, so batches of ragged rows share its columns.
+    notes = XlsxLoader(file_path, sheets=['Notes'], row_format='table', batch_size=1).load()
+    assert notes[0].page_content == 'note | column_2 | tag\nfirst | unnamed | a\nsecond |  | \nthird |  | b'
+    assert XlsxLoader(file_path, sheets=['Notes'], columns=['note']).load()[0].page_content == \
+        'note: first\n\nnote: second\n\nnote: third'
+
+
+def test_text_encodings_are_detected_from_a_sample(tmp_path):
+    from verified_sources.common.doc_splitters.loaders.text import MmapTextLoader
+    from verified_sources.common.doc_splitters.loaders.encoding import DEFAULT_SAMPLE_SIZE, detect_encoding
+
+    texts = {
+        'cp1252.txt': ('Café crème — “quoted” façade\n' * 500, 'cp1252'),
+        'cp1251.txt': ('Привет мир, это тестовая строка\n' * 500, 'cp1251'),
+        'utf16.txt': ('naïve ünïcode\n' * 500, 'utf-16'),
+    }
+    for name, (text, encoding) in texts.items():
+        (tmp_path / name).write_bytes(text.encode(encoding))
+        assert MmapTextLoader(str(tmp_path / name)).load()[0].page_content == text
+        assert ''.join(MmapTextLoader(str(tmp_path / name)).iter_text_windows(1000)) == text
+
+    # A byte that is not UTF-8 outside the sample is replaced instead of failing the file.
+    lines = b'ascii line\n' * (DEFAULT_SAMPLE_SIZE // 10)
+    file_path = tmp_path / 'mixed.log'
+    file_path.write_bytes(lines + b'stray \xff byte\n' + lines * 3 + 'déjà vu\n'.encode())
+    assert detect_encoding(str(file_path)) == 'utf-8'
+    assert '�' in ''.join(MmapTextLoader(str(file_path)).iter_text_windows(4096))
+
+
+def test_semantic_splitter_cuts_between_topics_and_caches_embeddings():
+    pytest.importorskip('numpy')
+    topics = [
+        'The cat sat on the mat. The cat likes the mat. A cat and a mat.',
+        'Rockets fly to orbit with fuel. Rocket fuel burns in orbit. Orbit rockets need fuel.',
+        'Bread dough needs yeast and flour. Yeast makes bread dough rise. Flour and yeast for bread.',
+    ]
+    text = ' '.join(' '.join([topic] * 3) for topic in topics)
+    calls = []
+    splitter_cls = doc_splitter_factory.get_splitter_cls(TextSplitterType.SPLIT_SEMANTICALLY)
+    embed = splitter_cls()._embed
+
+    def embedder(sentences):
+        calls.append(len(sentences))
+        return embed(sentences)
+
+    splitter = splitter_cls(embedder=embedder, buffer_size=0, breakpoint_threshold_amount=90, batch_size=4)
+    assert splitter.split_text(text) == [' '.join([topic] * 3) for topic in topics]
+    # Repeated sentences are embedded once, in batches of batch_size.
+    assert calls == [4, 4, 1]
+    assert splitter.split_many([text, topics[0]]) == [splitter.split_text(text), splitter.split_text(topics[0])]
+    assert calls == [4, 4, 1]
+    assert splitter.embedding_cache_misses == 9
+
+    buffered = splitter_cls(breakpoint_threshold_type='interquartile').split_text(text)
+    assert ' '.join(buffered) == text
+
+
+def test_semantic_splitter_is_shared_safely_between_threads():
+    pytest.importorskip('numpy')
+    from concurrent.futures import ThreadPoolExecutor
+
+    splitter_cls = doc_splitter_factory.get_splitter_cls(TextSplitterType.SPLIT_SEMANTICALLY)
+    splitter = splitter_cls(embedding_cache_size=50, batch_size=8)
+    texts = [' '.join(f'Sentence {i} of text {j}.' for i in range(40)) for j in range(16)]
+    expected = [splitter_cls().split_text(text) for text in texts]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(splitter.split_text, texts * 4)) == expected * 4
+    assert splitter.embedding_cache_hits + splitter.embedding_cache_misses == 40 * 16 * 4
+    assert len(splitter._embeddings) <= 50
+
+
+def test_instrumentation_reports_time_and_volumes_per_stage(text_file, monkeypatch):
+    import time
+    from verified_sources.common.doc_splitters import base_splitter
+    from verified_sources.common.doc_splitters.instrumentation import StageStatsCollector
+
+    def create(**kwargs):
+        return doc_splitter_factory.create(
+            loader_key=DocLoaderType.MMAP_TEXT,
+            splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+            loader_config={'file_path': text_file},
+            splitter_config={'chunk_size': 200, 'chunk_overlap': 0},
+            **kwargs,
+        )
+
+    runs = []
+    collector = StageStatsCollector()
+    doc_splitter_factory.add_instrumentation(runs.append)
+    doc_splitter_factory.add_instrumentation(collector)
+    try:
+        chunks = []
+        for chunk in create().load_and_chunk():
+            chunks.append(chunk)
+            time.sleep(0.001)
+        list(create(stream_window_size=64).load_and_chunk())
+    finally:
+        doc_splitter_factory.remove_instrumentation(runs.append)
+        doc_splitter_factory.remove_instrumentation(collector)
+
+    stats = {stage_stats.stage: stage_stats for stage_stats in runs[0]}
+    assert [stage_stats.source for stage_stats in runs[0]] == [text_file] * 4
+    assert stats['load'].bytes_in == os.path.getsize(text_file) and stats['load'].documents_out == 1
+    assert stats['split'].chunks_out == stats['emit'].chunks_out == len(chunks)
+    assert stats['emit'].wall_time >= 0.001 * len(chunks) > stats['emit'].cpu_time
+    assert collector.runs == 2 and collector.totals()['split'].chunks_out == 2 * len(chunks)
+
+    # Without callbacks, runs are not instrumented at all.
+    monkeypatch.setattr(base_splitter, 'RunInstrumentation', None)
+    assert list(create().load_and_chunk()) == chunks
+
+
+def test_default_instrumentation_ignores_unknown_modes(monkeypatch, caplog):
+    from verified_sources.common.doc_splitters.instrumentation import (
+        LoggingInstrumentation, get_default_instrumentation
+    )
+
+    monkeypatch.setenv('DAT_SPLITTER_INSTRUMENTATION', 'logs')
+    assert get_default_instrumentation() == []
+    assert "Ignoring unknown DAT_SPLITTER_INSTRUMENTATION 'logs'" in caplog.text
+    monkeypatch.setenv('DAT_SPLITTER_INSTRUMENTATION', 'log')
+    assert [type(callback) for callback in get_default_instrumentation()] == [LoggingInstrumentation]
+
+
+def test_splitters_configured_with_functions_are_not_cached(text_file):
+    doc_splitter_factory.clear_splitter_cache()
+
+    def create(length_function):
+        return doc_splitter_factory.create(
+            loader_key=DocLoaderType.MMAP_TEXT,
+            splitter_key=TextSplitterType.SPLIT_BY_CHARACTER_RECURSIVELY,
+            loader_config={'file_path': text_file},
+            splitter_config={'chunk_size': 100, 'chunk_overlap': 0, 'length_function': length_function},
+        )
+
+    splitters = [create(lambda text: len(text)), create(lambda text: 2 * len(text))]
+    assert splitters[0]._default_splitter is not splitters[1]._default_splitter
+    assert doc_splitter_factory.splitter_cache_info().currsize == 0
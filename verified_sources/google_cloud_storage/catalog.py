@@ -17,6 +17,18 @@ class FileType(Enum):
     html = 'html'
     md = 'md'
     log = 'log'
+    parquet = 'parquet'
+    jsonl = 'jsonl'
+    ndjson = 'ndjson'
+    zip = 'zip'
+    tar = 'tar'
+    xlsx = 'xlsx'
+
+
+class Compression(Enum):
+    gz = 'gz'
+    bz2 = 'bz2'
+    zst = 'zst'
 
 
 class DocumentStream(DatDocumentStream):
@@ -36,6 +48,11 @@ class DocumentStream(DatDocumentStream):
                            description='Name Of The File', title='File Name')
     folder_path: str = Field(..., title='Directory Paths')
     file_type: FileType = Field(..., title='Type of File')
+    compression: Optional[Compression] = Field(
+        None,
+        description='Compression of txt, log, csv, jsonl and tar files, e.g. gz for app.log.gz',
+        title='Compression'
+    )
 
 
 class GoogleCloudStorageCatalog(DatCatalog):
@@ -3,7 +3,12 @@ import tempfile
 from typing import Any, Generator
 from dat_core.connectors.sources.stream import Stream
 from dat_core.pydantic_models import DatCatalog, DatDocumentStream, DatMessage
-from verified_sources.common.doc_splitters.factory import doc_splitter_factory, DocLoaderType, TextSplitterType
+from verified_sources.common.doc_splitters.factory import (
+    doc_splitter_factory, get_pdf_loader_key, DocLoaderType, TextSplitterType, DEFAULT_STREAM_WINDOW_SIZE
+)
+from verified_sources.common.doc_splitters.cache import get_default_chunk_cache
+from verified_sources.common.doc_splitters.chunks import chunk_text_and_metadata, chunk_views_enabled
+from verified_sources.common.doc_splitters.dedup import get_near_duplicate_filter
 from verified_sources.google_cloud_storage.specs import GoogleCloudStorageSpecification
 from google.cloud import storage
 from google.oauth2.credentials import Credentials
@@ -42,6 +47,9 @@ class GoogleCloudStorageStream(Stream):
             credentials=creds,
             project=config.connection_specification.project_id
         )
+        # One filter for all the files read by the stream, so that boilerplate
+        # repeated across them is suppressed.
+        self._near_duplicate_filter = get_near_duplicate_filter()
 
     def read_records(self,
                      catalog: DatCatalog,
@@ -60,12 +68,18 @@ class GoogleCloudStorageStream(Stream):
             Generator[DatMessage, Any, Any]: A generator yielding DatMessage objects.
         """
         map_doc_loader = {
-            'pdf': DocLoaderType.PYPDF,
-            'txt': DocLoaderType.TEXT,
-            'csv': DocLoaderType.TEXT,
-            'log': DocLoaderType.TEXT,
+            'pdf': get_pdf_loader_key(),
+            'txt': DocLoaderType.MMAP_TEXT,
+            'csv': DocLoaderType.CSV_COLUMNAR,
+            'log': DocLoaderType.MMAP_TEXT,
             'html': DocLoaderType.HTML,
             'md': DocLoaderType.MARKDOWN,
+            'parquet': DocLoaderType.PARQUET,
+            'jsonl': DocLoaderType.JSONL,
+            'ndjson': DocLoaderType.JSONL,
+            'zip': DocLoaderType.ARCHIVE,
+            'tar': DocLoaderType.ARCHIVE,
+            'xlsx': DocLoaderType.XLSX,
         }
         bucket_client = self.storage_client.get_bucket(
             self._config.connection_specification.bucket_name)
@@ -74,6 +88,8 @@ class GoogleCloudStorageStream(Stream):
         path_list = [path for path in path_list if path]
         path = os.path.join(*path_list) + '/'
         file_name = f'{configured_stream.file_name}.{configured_stream.file_type.value}'
+        if configured_stream.compression:
+            file_name += f'.{configured_stream.compression.value}'
         blob = bucket_client.blob(path+file_name)
         with tempfile.TemporaryDirectory() as temp_dir:
             file_path = f"{temp_dir}/{blob.name}"
@@ -89,12 +105,18 @@ class GoogleCloudStorageStream(Stream):
                 loader_config=dict(
                     file_path=file_path,
                 ),
-                splitter_config=splitter_settings.get_splitter_config(splitter_settings.model_dump())
+                splitter_config=splitter_settings.get_splitter_config(splitter_settings.model_dump()),
+                stream_window_size=DEFAULT_STREAM_WINDOW_SIZE,
+                chunk_cache=get_default_chunk_cache(),
+                chunk_views=chunk_views_enabled(),
+                near_duplicate_filter=self._near_duplicate_filter
             )
             for _doc_chunk in _doc_loader_and_splitter.load_and_chunk():
+                _doc_chunk, extra_metadata = chunk_text_and_metadata(_doc_chunk)
                 yield self.as_record_message(
                     configured_stream=configured_stream,
                     doc_chunk=_doc_chunk,
                     data_entity=blob.name,
-                    dat_last_modified=blob.updated
+                    dat_last_modified=blob.updated,
+                    extra_metadata=extra_metadata
                 )
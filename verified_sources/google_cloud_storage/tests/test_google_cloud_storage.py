@@ -43,3 +43,57 @@ def test_read(valid_connection_object, valid_catalog_object):
     print(records)
     for record in records:
         assert DatDocumentStream.model_validate(record)
+
+
+def test_near_duplicate_filter_is_shared_across_files(tmp_path, monkeypatch):
+    import os
+    import shutil
+    from verified_sources.google_cloud_storage import streams
+
+    text = '\n\n'.join(f'Paragraph {i} of the license text repeated in every file.' for i in range(5))
+    for name in ('first.txt', 'second.txt'):
+        (tmp_path / name).write_text(text)
+
+    class FakeBlob:
+        def __init__(self, name):
+            self.name = name
+            self.updated = 0
+
+        def download_to_filename(self, file_path):
+            shutil.copy(tmp_path / os.path.basename(self.name), file_path)
+
+    class FakeBucket:
+        def blob(self, name):
+            return FakeBlob(name)
+
+    class FakeClient:
+        def __init__(self, **kwargs):
+            pass
+
+        def get_bucket(self, bucket_name):
+            return FakeBucket()
+
+    monkeypatch.setattr(streams.storage, 'Client', FakeClient)
+    monkeypatch.setattr(streams, 'Credentials', lambda **kwargs: None)
+    monkeypatch.setenv('DAT_CHUNK_DEDUP', 'drop')
+    monkeypatch.delenv('DAT_CHUNK_CACHE_DIR', raising=False)
+    stream = streams.GoogleCloudStorageStream(GoogleCloudStorageSpecification(
+        name='GoogleCloudStorage',
+        connection_specification={},
+        module_name='google_cloud_storage'
+    ))
+
+    def read(file_name):
+        catalog = GoogleCloudStorageCatalog(document_streams=[{
+            'namespace': 'dedup',
+            'read_sync_mode': 'INCREMENTAL',
+            'write_sync_mode': 'APPEND',
+            'advanced': {'splitter_settings': {'splitter_settings': 'SPLIT_BY_CHARACTER'}},
+            'file_name': file_name,
+            'folder_path': 'docs',
+            'file_type': 'txt',
+        }])
+        return list(stream.read_records(catalog, catalog.document_streams[0]))
+
+    assert read('first')
+    assert read('second') == []
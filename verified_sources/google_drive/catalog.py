@@ -43,5 +43,22 @@ class TxtStream(DatDocumentStream):
     )
 
 
+class XlsxStream(DatDocumentStream):
+    name: Optional[str] = Field(
+        'xlsx',
+        description='The name of the document stream.',
+        json_schema_extra={
+            'ui-opts': {
+                'hidden': True,
+            }
+        }
+    )
+    dir_uris: List[str] = Field(
+        ...,
+        description="Google Drive directory URIs",
+        title="Directory URIs"
+    )
+
+
 class GoogleDriveCatalog(DatCatalog):
-    document_streams: Optional[List[Union[PdfStream, TxtStream]]] = None
+    document_streams: Optional[List[Union[PdfStream, TxtStream, XlsxStream]]] = None
@@ -8,7 +8,7 @@ from dat_core.auth.oauth2_authenticator import BaseOauth2Authenticator
 from dat_core.pydantic_models import (
     ConnectorSpecification, DatConnectionStatus, DatMessage, DatLogMessage, Level, Type
 )
-from verified_sources.google_drive.streams import GDrivePdfStream, GDriveTxtStream
+from verified_sources.google_drive.streams import GDrivePdfStream, GDriveTxtStream, GDriveXlsxStream
 from verified_sources.google_drive.specs import GoogleDriveSpecification
 from verified_sources.google_drive.catalog import GoogleDriveCatalog
 from dat_core.loggers import logger
@@ -65,7 +65,8 @@ class GoogleDrive(SourceBase):
     def streams(self, config: ConnectorSpecification) -> List[Stream]:
         return [
             GDrivePdfStream(config),
-            GDriveTxtStream(config)
+            GDriveTxtStream(config),
+            GDriveXlsxStream(config)
         ]
         
 if __name__ == '__main__':
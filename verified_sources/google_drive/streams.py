@@ -15,7 +15,12 @@ from dat_core.pydantic_models import (
     Level
 )
 from dat_core.auth.oauth2_authenticator import BaseOauth2Authenticator
-from verified_sources.common.doc_splitters.factory import doc_splitter_factory, DocLoaderType, TextSplitterType
+from verified_sources.common.doc_splitters.factory import (
+    doc_splitter_factory, get_pdf_loader_key, DocLoaderType, TextSplitterType, DEFAULT_STREAM_WINDOW_SIZE
+)
+from verified_sources.common.doc_splitters.cache import get_default_chunk_cache
+from verified_sources.common.doc_splitters.chunks import chunk_text_and_metadata, chunk_views_enabled
+from verified_sources.common.doc_splitters.dedup import get_near_duplicate_filter
 from dat_core.loggers import logger
 
 
@@ -37,7 +42,7 @@ class GoogleDriveStream(Stream):
         'https://www.googleapis.com/auth/drive.file',
         'https://www.googleapis.com/auth/drive.appdata',
     ]
-    _doc_loader = DocLoaderType.TEXT
+    _doc_loader = DocLoaderType.MMAP_TEXT
     _default_cursor = 'dat_last_modified'
 
     def __init__(self, config: ConnectorSpecification) -> None:
@@ -85,6 +90,7 @@ class GoogleDriveStream(Stream):
         if cursor_value:
             files = self._slice_based_on_attr(
                 files, _attr='modifiedTime', _value=cursor_value)
+        near_duplicate_filter = get_near_duplicate_filter()
         for file in files:
             with self.download_gdrive_file(file_id=file['id']) as temp_file:
                 data_entity = f'{configured_stream.dir_uris[0]}/{file["name"]}'
@@ -98,20 +104,20 @@ class GoogleDriveStream(Stream):
                     loader_key=self._doc_loader.value,
                     splitter_key=splitter_settings.splitter_settings,
                     loader_config={'file_path': temp_file},
-                    splitter_config=splitter_settings.get_splitter_config(splitter_settings.model_dump())
+                    splitter_config=splitter_settings.get_splitter_config(splitter_settings.model_dump()),
+                    stream_window_size=DEFAULT_STREAM_WINDOW_SIZE,
+                    chunk_cache=get_default_chunk_cache(),
+                    chunk_views=chunk_views_enabled(),
+                    near_duplicate_filter=near_duplicate_filter
                 )
                 for doc_chunk in _doc_splitter.load_and_chunk():
-                    try:
-                        # Sometimes load_and_chunk return Document object, sometimes it's string
-                        _doc_chunk = doc_chunk.page_content
-                    except (ValueError, AttributeError):
-                        _doc_chunk = doc_chunk
+                    _doc_chunk, _extra_metadata = chunk_text_and_metadata(doc_chunk, extra_metadata)
                     yield self.as_record_message(
                         configured_stream=configured_stream,
                         doc_chunk=_doc_chunk,
                         data_entity=data_entity,
                         dat_last_modified=file['modifiedTime'],
-                        extra_metadata=extra_metadata
+                        extra_metadata=_extra_metadata
                     )
 
     def _slice_based_on_attr(self, _list: List, _attr: str, _value: Any) -> List:
@@ -233,7 +239,10 @@ class GDrivePdfStream(GoogleDriveStream):
     """
     _name = 'pdf'
     __supported_mimetypes__ = ('application/pdf',)
-    _doc_loader = DocLoaderType.PYPDF
+
+    @property
+    def _doc_loader(self) -> DocLoaderType:
+        return get_pdf_loader_key()
 
 
 class GDriveTxtStream(GoogleDriveStream):
@@ -244,5 +253,20 @@ class GDriveTxtStream(GoogleDriveStream):
         Inherits all attributes from GoogleDriveStream.
     """
     _name = 'txt'
-    __supported_mimetypes__ = ('application/txt', 'text/plain', 'text/x-log')
-    _doc_loader = DocLoaderType.TEXT
+    __supported_mimetypes__ = (
+        'application/txt', 'text/plain', 'text/x-log',
+        'application/gzip', 'application/x-gzip', 'application/x-bzip2', 'application/zstd',
+    )
+    _doc_loader = DocLoaderType.MMAP_TEXT
+
+
+class GDriveXlsxStream(GoogleDriveStream):
+    """
+    A stream for reading XLSX spreadsheets from Google Drive.
+
+    Attributes:
+        Inherits all attributes from GoogleDriveStream.
+    """
+    _name = 'xlsx'
+    __supported_mimetypes__ = ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',)
+    _doc_loader = DocLoaderType.XLSX
@@ -27,7 +27,7 @@ class TxtDatStream(DatDocumentStream):
         json_schema_extra={
             'ui-opts': {
                 'file_upload': True,
-                'allowed_file_types': ['.txt'],
+                'allowed_file_types': ['.txt', '.gz', '.bz2', '.zst'],
             }
         }
     )
@@ -55,7 +55,35 @@ class CsvDatStream(DatDocumentStream):
         json_schema_extra={
             'ui-opts': {
                 'file_upload': True,
-                'allowed_file_types': ['.csv'],
+                'allowed_file_types': ['.csv', '.gz', '.bz2', '.zst'],
+            }
+        }
+    )
+
+    obj_file_paths: List[str] = Field(None,
+        json_schema_extra={'ui-opts': {'hidden': True}}
+    )
+
+
+class ArchiveDatStream(DatDocumentStream):
+    name: Optional[str] = Field(
+        'archive',
+        description='The name of the document stream.',
+        json_schema_extra={
+            'ui-opts': {
+                'hidden': True,
+            }
+        }
+    )
+
+    local_file_paths: List[str] = Field(
+        ...,
+        description='The path of the file to be read.',
+        title='Upload File',
+        json_schema_extra={
+            'ui-opts': {
+                'file_upload': True,
+                'allowed_file_types': ['.zip', '.tar', '.tgz', '.gz', '.bz2', '.zst'],
             }
         }
     )
@@ -65,4 +93,4 @@ class CsvDatStream(DatDocumentStream):
     )
 
 class LocalFileSystemCatalog(DatCatalog):
-    document_streams: List[Union[TxtDatStream, CsvDatStream]]
+    document_streams: List[Union[TxtDatStream, CsvDatStream, ArchiveDatStream]]
@@ -5,7 +5,9 @@ from dat_core.connectors.sources.base import SourceBase
 from dat_core.connectors.sources.stream import Stream
 from verified_sources.local_file_system.specs import LocalFileSystemSpecification
 from verified_sources.local_file_system.catalog import LocalFileSystemCatalog
-from verified_sources.local_file_system.streams import LocalFileSystemTxtStream, LocalFileSystemCsvStream
+from verified_sources.local_file_system.streams import (
+    LocalFileSystemTxtStream, LocalFileSystemCsvStream, LocalFileSystemArchiveStream
+)
 
 
 class LocalFileSystem(SourceBase):
@@ -28,4 +30,5 @@ class LocalFileSystem(SourceBase):
         return [
             LocalFileSystemTxtStream(config),
             LocalFileSystemCsvStream(config),
+            LocalFileSystemArchiveStream(config),
         ]
@@ -4,7 +4,12 @@ from typing import Any, Generator
 from minio import Minio
 from dat_core.connectors.sources.stream import Stream
 from dat_core.pydantic_models import DatCatalog, DatDocumentStream, DatMessage, StreamState
-from verified_sources.common.doc_splitters.factory import doc_splitter_factory, DocLoaderType, TextSplitterType
+from verified_sources.common.doc_splitters.factory import (
+    doc_splitter_factory, DocLoaderType, TextSplitterType, DEFAULT_STREAM_WINDOW_SIZE
+)
+from verified_sources.common.doc_splitters.cache import get_default_chunk_cache
+from verified_sources.common.doc_splitters.chunks import chunk_text_and_metadata, chunk_views_enabled
+from verified_sources.common.doc_splitters.dedup import get_near_duplicate_filter
 from verified_sources.local_file_system.specs import LocalFileSystemSpecification
 
 class LocalFileSystemStream(Stream):
@@ -29,6 +34,9 @@ class LocalFileSystemStream(Stream):
             config (LocalFileSystemSpecification): The configuration object for URL crawling.
         """
         self._config = config
+        # One filter for all the files read by the stream, so that boilerplate
+        # repeated across them is suppressed.
+        self._near_duplicate_filter = get_near_duplicate_filter()
 
     def read_records(self, 
         catalog: DatCatalog,
@@ -66,15 +74,21 @@ class LocalFileSystemStream(Stream):
                 loader_config=dict(
                     file_path=tmp_file
                 ),
-                splitter_config=splitter_settings.get_splitter_config(splitter_settings.model_dump())
+                splitter_config=splitter_settings.get_splitter_config(splitter_settings.model_dump()),
+                stream_window_size=DEFAULT_STREAM_WINDOW_SIZE,
+                chunk_cache=get_default_chunk_cache(),
+                chunk_views=chunk_views_enabled(),
+                near_duplicate_filter=self._near_duplicate_filter
             )
 
             for _doc_chunk in _doc_loader_and_splitter.load_and_chunk():
+                _doc_chunk, extra_metadata = chunk_text_and_metadata(_doc_chunk)
                 yield self.as_record_message(
                     configured_stream=configured_stream,
                     doc_chunk=_doc_chunk,
                     data_entity=file_path,
-                    dat_last_modified=int(os.path.getmtime(tmp_file))
+                    dat_last_modified=int(os.path.getmtime(tmp_file)),
+                    extra_metadata=extra_metadata
                 )
 
 class LocalFileSystemTxtStream(LocalFileSystemStream):
@@ -82,11 +96,18 @@ class LocalFileSystemTxtStream(LocalFileSystemStream):
     A stream for reading text files from the local file system.
     """
     _name = 'txt'
-    _doc_loader = DocLoaderType.TEXT
+    _doc_loader = DocLoaderType.MMAP_TEXT
 
 class LocalFileSystemCsvStream(LocalFileSystemStream):
     """
     A stream for reading CSV files from the local file system.
     """
     _name = 'csv'
-    _doc_loader = DocLoaderType.CSV
+    _doc_loader = DocLoaderType.CSV_COLUMNAR
+
+class LocalFileSystemArchiveStream(LocalFileSystemStream):
+    """
+    A stream for reading zip and tar bundles of documents from the local file system.
+    """
+    _name = 'archive'
+    _doc_loader = DocLoaderType.ARCHIVE
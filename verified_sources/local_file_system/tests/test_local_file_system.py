@@ -43,3 +43,43 @@ def test_read(valid_connection_object, valid_catalog_object):
     for record in records:
         assert DatMessage.model_validate(record)
         print(record.model_dump_json())
+
+
+def test_near_duplicate_filter_is_shared_across_files(tmp_path, monkeypatch):
+    import shutil
+    from verified_sources.local_file_system import streams
+
+    text = '\n\n'.join(f'Paragraph {i} of the license text repeated in every file.' for i in range(5))
+    for name in ('first.txt', 'second.txt'):
+        (tmp_path / name).write_text(text)
+
+    class FakeMinio:
+        def __init__(self, **kwargs):
+            pass
+
+        def fget_object(self, bucket_name, object_name, file_path):
+            shutil.copy(tmp_path / object_name, file_path)
+
+    monkeypatch.setattr(streams, 'Minio', FakeMinio)
+    monkeypatch.setenv('DAT_CHUNK_DEDUP', 'drop')
+    monkeypatch.delenv('DAT_CHUNK_CACHE_DIR', raising=False)
+    stream = streams.LocalFileSystemTxtStream(LocalFileSystemSpecification(
+        name='LocalFileSystem',
+        connection_specification={},
+        module_name='local_file_system'
+    ))
+
+    def read(file_path):
+        catalog = LocalFileSystemCatalog(document_streams=[{
+            'name': 'txt',
+            'namespace': 'dedup',
+            'read_sync_mode': 'INCREMENTAL',
+            'write_sync_mode': 'APPEND',
+            'advanced': {'splitter_settings': {'splitter_settings': 'SPLIT_BY_CHARACTER'}},
+            'local_file_paths': [file_path],
+            'obj_file_path': file_path,
+        }])
+        return list(stream.read_records(catalog, catalog.document_streams[0]))
+
+    assert read('first.txt')
+    assert read('second.txt') == []
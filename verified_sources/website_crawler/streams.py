@@ -21,6 +21,8 @@ from typing import Any, Generator
 from dat_core.connectors.sources.stream import Stream
 from dat_core.pydantic_models import DatCatalog, DatDocumentStream, DatMessage, StreamState
 from verified_sources.common.doc_splitters.factory import doc_splitter_factory, DocLoaderType, TextSplitterType
+from verified_sources.common.doc_splitters.chunks import chunk_text_and_metadata
+from verified_sources.common.doc_splitters.dedup import get_near_duplicate_filter
 from verified_sources.website_crawler.specs import WebsiteCrawlerSpecification
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -94,18 +96,16 @@ class URLCrawler(Stream):
             loader_key=DocLoaderType.WHOLE_SITE_READER,
             splitter_key=splitter_settings.splitter_settings,
             loader_config=_loader_config,
-            splitter_config=splitter_settings.get_splitter_config(splitter_settings.model_dump())
+            splitter_config=splitter_settings.get_splitter_config(splitter_settings.model_dump()),
+            near_duplicate_filter=get_near_duplicate_filter()
             )
         for chunk in doc_splitter.load_and_chunk(**_load_kwargs):
-            try:
-                # Sometimes load_and_chunk return Document object, sometimes it's string
-                _doc_chunk = chunk.page_content
-            except (ValueError, AttributeError):
-                _doc_chunk = chunk
+            _doc_chunk, extra_metadata = chunk_text_and_metadata(
+                chunk, {'site_url': self._config.connection_specification.site_url,
+                        'dat_record_id': self._config.connection_specification.site_url})
             yield self.as_record_message(
                 configured_stream=configured_stream,
                 doc_chunk=_doc_chunk,
                 data_entity=self._config.connection_specification.site_url,
-                extra_metadata={'site_url': self._config.connection_specification.site_url,
-                                'dat_record_id': self._config.connection_specification.site_url}
+                extra_metadata=extra_metadata
             )
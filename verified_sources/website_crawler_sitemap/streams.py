@@ -2,6 +2,8 @@ from typing import Any, Generator, List, Optional
 from dat_core.connectors.sources.stream import Stream
 from dat_core.pydantic_models import DatCatalog, DatDocumentStream, DatMessage, StreamState
 from verified_sources.common.doc_splitters.factory import doc_splitter_factory, DocLoaderType, TextSplitterType
+from verified_sources.common.doc_splitters.chunks import chunk_text_and_metadata
+from verified_sources.common.doc_splitters.dedup import get_near_duplicate_filter
 from verified_sources.website_crawler_sitemap.specs import WebsiteCrawlerSitemapSpecification, Filters
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
@@ -55,20 +57,19 @@ class CrawlerSitemap(Stream):
         doc_splitter = doc_splitter_factory.create(
             loader_key=DocLoaderType.BEAUTIFUL_SOUP,
             splitter_key=splitter_settings.splitter_settings,
-            splitter_config=splitter_settings.get_splitter_config(splitter_settings.model_dump())
+            splitter_config=splitter_settings.get_splitter_config(splitter_settings.model_dump()),
+            near_duplicate_filter=get_near_duplicate_filter()
         )   
 
         for chunk in doc_splitter.load_and_chunk(**_load_kwargs):
-            try:
-                _doc_chunk = chunk.page_content
-            except (ValueError, AttributeError):
-                _doc_chunk = chunk
+            _doc_chunk, extra_metadata = chunk_text_and_metadata(
+                chunk, {'site_url': self._config.connection_specification.site_url,
+                        'dat_record_id': self._config.connection_specification.site_url})
             yield self.as_record_message(
                 configured_stream=configured_stream,
                 doc_chunk=_doc_chunk,
                 data_entity=self._config.connection_specification.site_url,
-                extra_metadata={'site_url': self._config.connection_specification.site_url,
-                                'dat_record_id': self._config.connection_specification.site_url}
+                extra_metadata=extra_metadata
             )
 
         